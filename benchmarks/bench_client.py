@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Client throughput and latency benchmark.
+
+Drives TimesGateDevice against the local emulator so results are
+reproducible without hardware.
+
+Usage:
+    python benchmarks/bench_client.py
+    python benchmarks/bench_client.py --commands 500 --latency 0.005
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from divoom_timesgate import AiohttpTransport, RawHttpTransport, TimesGateFleet
+from divoom_timesgate.codec import JSONCodec, default_codec
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.loopback import LoopbackTransport
+
+
+def report(name, latencies, elapsed):
+    """Print throughput and latency percentiles for one scenario."""
+    latencies = sorted(latencies)
+    count = len(latencies)
+    p50 = latencies[count // 2] * 1000
+    p99 = latencies[min(count - 1, int(count * 0.99))] * 1000
+    print(
+        f"{name:<28} {count:>6} ops  {count / elapsed:>9.1f} ops/s  "
+        f"mean {statistics.mean(latencies) * 1000:>7.2f} ms  "
+        f"p50 {p50:>7.2f} ms  p99 {p99:>7.2f} ms"
+    )
+
+
+async def timed(coro_factory, count):
+    """Run ``coro_factory()`` sequentially ``count`` times, timing each call."""
+    latencies = []
+    start = time.perf_counter()
+    for i in range(count):
+        t0 = time.perf_counter()
+        await coro_factory(i)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - start
+
+
+async def bench_sequential_setters(emulator, count):
+    """One awaited set_brightness per loop iteration."""
+    async with emulator.create_device() as device:
+        latencies, elapsed = await timed(lambda i: device.set_brightness(i % 101), count)
+    report("sequential set_brightness", latencies, elapsed)
+
+
+async def bench_sequential_reads(emulator, count):
+    """One awaited get_settings per loop iteration."""
+    async with emulator.create_device() as device:
+        latencies, elapsed = await timed(lambda i: device.get_settings(), count)
+    report("sequential get_settings", latencies, elapsed)
+
+
+async def bench_panel_timers(emulator, count):
+    """Five set_panel_timer calls per scene update."""
+    async with emulator.create_device() as device:
+        async def scene(i):
+            for panel in range(1, 6):
+                await device.set_panel_timer(panel, 0, i % 60)
+
+        latencies, elapsed = await timed(scene, max(1, count // 5))
+    report("5-panel timer scene", latencies, elapsed)
+
+
+async def bench_panel_timers_batched(emulator, count):
+    """Five set_panel_timer calls per scene update, coalesced by device.batch()."""
+    async with emulator.create_device() as device:
+        async def scene(i):
+            async with device.batch():
+                await asyncio.gather(*(
+                    device.set_panel_timer(panel, 0, i % 60) for panel in range(1, 6)
+                ))
+
+        latencies, elapsed = await timed(scene, max(1, count // 5))
+    report("5-panel timer scene batched", latencies, elapsed)
+
+
+SCENARIOS = [
+    bench_sequential_setters,
+    bench_sequential_reads,
+    bench_panel_timers,
+    bench_panel_timers_batched,
+]
+
+
+async def bench_hot_path(count):
+    """CPU time and transient allocations per set_brightness.
+
+    The loopback rows measure the client alone; the HTTP rows also include
+    the in-process emulator's side of each exchange.
+    """
+    codecs = [JSONCodec()]
+    if default_codec().name != "json":
+        codecs.append(default_codec())
+
+    async with TimesGateEmulator(seed=0) as emulator:
+        configs = [(f"loopback {codec.name}", lambda: LoopbackTransport(emulator), codec) for codec in codecs]
+        configs += [
+            ("aiohttp", AiohttpTransport, default_codec()),
+            ("raw http", RawHttpTransport, default_codec()),
+        ]
+        for label, transport_factory, codec in configs:
+            async with transport_factory() as transport:
+                async with emulator.create_device(transport=transport, codec=codec) as device:
+                    await device.set_brightness(0)
+
+                    start = time.process_time()
+                    for i in range(count):
+                        await device.set_brightness(i % 101)
+                    cpu = time.process_time() - start
+
+                    tracemalloc.start()
+                    peaks = []
+                    for i in range(count):
+                        tracemalloc.reset_peak()
+                        before = tracemalloc.get_traced_memory()[0]
+                        await device.set_brightness(i % 101)
+                        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+                    tracemalloc.stop()
+
+            print(
+                f"{'hot path [' + label + ']':<28} {count:>6} ops  "
+                f"{cpu / count * 1e6:>9.1f} us/cmd  "
+                f"{statistics.mean(peaks) / 1024:>7.1f} KiB/cmd peak allocation"
+            )
+
+
+async def measure_loop_lag(work):
+    """Run ``work()`` while a 1 ms ticker records how late the event loop wakes it."""
+    lags = []
+    done = False
+
+    async def ticker():
+        while not done:
+            t0 = time.perf_counter()
+            await asyncio.sleep(0.001)
+            lags.append(max(0.0, time.perf_counter() - t0 - 0.001))
+
+    task = asyncio.ensure_future(ticker())
+    start = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - start
+    done = True
+    await task
+    return lags, elapsed
+
+
+async def bench_encode_offload(sources):
+    """Event loop lag while decoding/resizing/encoding inline vs. in a pool."""
+    try:
+        import numpy as np
+        from divoom_timesgate.ingest import FrameIngestor, prepare_payload
+    except ImportError:
+        print("encode offload                skipped (numpy not installed)")
+        return
+
+    rng = np.random.default_rng(0)
+    batch = [rng.integers(0, 256, (8, 256, 256, 3), dtype=np.uint8) for _ in range(sources)]
+
+    async def inline():
+        for source in batch:
+            prepare_payload(source)
+            await asyncio.sleep(0)
+
+    async def pooled(processes):
+        async with FrameIngestor(processes=processes) as ingestor:
+            await asyncio.gather(*(ingestor.encode(source) for source in batch))
+
+    for name, work in [
+        ("encode inline", inline),
+        ("encode thread pool", lambda: pooled(False)),
+        ("encode process pool", lambda: pooled(True)),
+    ]:
+        lags, elapsed = await measure_loop_lag(work)
+        lags.sort()
+        print(
+            f"{name:<28} {sources:>6} srcs {elapsed * 1000:>9.1f} ms total  "
+            f"loop lag p50 {lags[len(lags) // 2] * 1000:>6.2f} ms  max {lags[-1] * 1000:>6.2f} ms"
+        )
+
+
+def bench_palette(count):
+    """PicData size and encode time of direct-color vs. quantized frames."""
+    try:
+        import numpy as np
+        from divoom_timesgate.framebuffer import RGB565, RGB888, encode_frames
+        from divoom_timesgate.quantize import DITHER_MODES, Quantizer
+    except ImportError:
+        print("palette quantization          skipped (numpy not installed)")
+        return
+
+    ramp = np.linspace(0, 255, 64)
+    frame = np.stack(np.broadcast_arrays(ramp[None, :], ramp[:, None], 255 - ramp[None, :]), axis=-1)
+    frames = np.repeat(np.rint(frame).astype(np.uint8)[None], count, axis=0)
+
+    cases = [(pixel_format, None) for pixel_format in (RGB888, RGB565)]
+    cases += [
+        (pixel_format, Quantizer(colors=16, dither=dither, pixel_format=pixel_format))
+        for pixel_format in (RGB888, RGB565)
+        for dither in DITHER_MODES
+    ]
+    for pixel_format, quantizer in cases:
+        start = time.perf_counter()
+        encoded = encode_frames(frames, pixel_format, quantizer)
+        elapsed = time.perf_counter() - start
+        name = f"{pixel_format} " + (f"16 colors {quantizer.dither}" if quantizer else "direct")
+        print(
+            f"{name:<36} {len(encoded[0]):>6} B/frame  "
+            f"{elapsed / count * 1000:>7.3f} ms/frame"
+        )
+
+
+def bench_compositor(count):
+    """Recompositing a moving sprite over a tiled 64x64 scene."""
+    try:
+        import numpy as np
+        from divoom_timesgate.sprites import Compositor, SpriteSheet
+    except ImportError:
+        print("sprite compositing            skipped (numpy not installed)")
+        return
+
+    sheet = SpriteSheet(np.random.default_rng(0).integers(0, 256, (8, 80, 4), dtype=np.uint8), 8, 8)
+    compositor = Compositor()
+    compositor.tile_layer(sheet, np.arange(64).reshape(8, 8) % 10)
+    ball = compositor.layer(1).place(sheet[3], 0, 0)
+    compositor.render()
+
+    latencies = []
+    start = time.perf_counter()
+    for step in range(count):
+        t0 = time.perf_counter()
+        compositor.layer(1).move(ball, step % 56, step % 56)
+        compositor.render()
+        latencies.append(time.perf_counter() - t0)
+    report("sprite move + render", latencies, time.perf_counter() - start)
+
+
+async def bench_fleet(size, latency):
+    """One set_brightness fanned out across ``size`` emulated devices."""
+    emulators = [TimesGateEmulator(seed=i) for i in range(size)]
+    for emulator in emulators:
+        await emulator.start()
+        emulator.configure(latency=latency)
+    try:
+        devices = [emulator.create_device() for emulator in emulators]
+        async with TimesGateFleet(devices, concurrency=size) as fleet:
+            start = time.perf_counter()
+            results = await fleet.run("set_brightness", 50)
+            elapsed = time.perf_counter() - start
+        await asyncio.gather(*(device.close() for device in devices))
+        report(f"fleet of {size} set_brightness", [r.elapsed for r in results.values()], elapsed)
+    finally:
+        for emulator in emulators:
+            await emulator.stop()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Times Gate client against the emulator")
+    parser.add_argument("--commands", type=int, default=200, help="Commands per scenario")
+    parser.add_argument("--latency", type=float, default=0.002, help="Emulated device latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform latency jitter in seconds")
+    parser.add_argument("--sources", type=int, default=20, help="Image sources for the encode offload scenario")
+    parser.add_argument("--fleet", type=int, default=100, help="Number of emulated devices for the fleet scenario")
+    args = parser.parse_args()
+
+    latency = args.latency
+    if args.jitter:
+        latency = (max(0.0, args.latency - args.jitter), args.latency + args.jitter)
+
+    print(f"Emulated latency: {args.latency * 1000:.1f} ms (+/- {args.jitter * 1000:.1f} ms)\n")
+    for scenario in SCENARIOS:
+        async with TimesGateEmulator(seed=0) as emulator:
+            emulator.configure(latency=latency)
+            await scenario(emulator, args.commands)
+    await bench_hot_path(args.commands)
+    await bench_encode_offload(args.sources)
+    bench_palette(args.sources)
+    bench_compositor(args.commands)
+    await bench_fleet(args.fleet, latency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
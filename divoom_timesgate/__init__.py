@@ -5,7 +5,17 @@ Modern async Python library for controlling Divoom Times Gate devices.
 """
 
 from .device import TimesGateDevice
-from .exceptions import TimesGateError, TimesGateConnectionError, TimesGateCommandError
+from .dispatch import Priority
+from .fleet import TimesGateFleet, FleetResult, FleetStream
+from .retry import RetryPolicy
+from .transport import Transport, AiohttpTransport
+from .rawhttp import RawHttpTransport
+from .exceptions import (
+    TimesGateError,
+    TimesGateConnectionError,
+    TimesGateCommandError,
+    TimesGateCircuitOpenError
+)
 from .models import (
     DisplayPanel,
     TextAlignment,
@@ -25,10 +35,22 @@ __all__ = [
     # Main device class
     "TimesGateDevice",
     
+    # Fleet control
+    "TimesGateFleet",
+    "FleetResult",
+    "FleetStream",
+    
+    # Transport
+    "Transport",
+    "AiohttpTransport",
+    "RawHttpTransport",
+    "RetryPolicy",
+    
     # Exceptions
     "TimesGateError",
     "TimesGateConnectionError",
     "TimesGateCommandError",
+    "TimesGateCircuitOpenError",
     
     # Enums
     "DisplayPanel",
@@ -37,6 +59,7 @@ __all__ = [
     "TemperatureMode",
     "TimeFormat",
     "DisplayItemType",
+    "Priority",
     
     # Display Items
     "DisplayItem",
@@ -0,0 +1,193 @@
+"""
+Memory-mapped store of pre-rendered animations.
+
+An animation file is a fixed-size header followed by one contiguous uint8
+array of ``(frames, 64, 64 * panels, 3)`` RGB pixels: every frame spans
+the whole panel wall. Files are opened with ``np.memmap``, so frames and
+per-panel strips are zero-copy views and only the pages being encoded are
+ever read in; memory use stays flat however long the animation is.
+
+Requires numpy.
+"""
+
+import os
+import struct
+import tempfile
+from typing import Iterable, Optional, Union
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "divoom_timesgate.animstore requires numpy; install divoom-timesgate[frames]"
+    ) from e
+
+from .framebuffer import PANEL_SIZE, Frame
+
+MAGIC = b"TGANIM01"
+
+# magic, frame count, panel count, frame speed (ms), padded to 32 bytes
+_HEADER = struct.Struct("<8sIHH16x")
+HEADER_SIZE = _HEADER.size
+
+
+class AnimationWriter:
+    """Appends wall frames to a new animation file, published atomically on close."""
+
+    def __init__(self, path: str, panels: int = 5, speed: int = 100):
+        """
+        Initialize the writer.
+
+        Args:
+            path: Destination file; replaced only once writing completes
+            panels: Number of side-by-side 64x64 panels per frame
+            speed: Frame duration in milliseconds
+        """
+        self.path = path
+        self.panels = panels
+        self.speed = speed
+        self.count = 0
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, self._tmp_path = tempfile.mkstemp(dir=directory, prefix=".anim-")
+        self._file = os.fdopen(fd, "wb")
+        self._file.write(_HEADER.pack(MAGIC, 0, panels, speed))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def shape(self):
+        """Shape of one wall frame."""
+        return (PANEL_SIZE, PANEL_SIZE * self.panels, 3)
+
+    def append(self, frame: Union[Frame, "np.ndarray"]):
+        """
+        Append one wall frame.
+
+        Args:
+            frame: Frame or uint8 array of shape ``(64, 64 * panels, 3)``
+        """
+        pixels = frame.pixels if isinstance(frame, Frame) else np.asarray(frame)
+        if pixels.shape != self.shape:
+            raise ValueError(f"Frames must have shape {self.shape}, got {pixels.shape}")
+        self._file.write(np.ascontiguousarray(pixels, dtype=np.uint8).tobytes())
+        self.count += 1
+
+    def extend(self, frames: Iterable[Union[Frame, "np.ndarray"]]):
+        """Append several wall frames."""
+        for frame in frames:
+            self.append(frame)
+
+    def close(self):
+        """Finish the header and move the file into place."""
+        if self._file.closed:
+            return
+        self._file.seek(0)
+        self._file.write(_HEADER.pack(MAGIC, self.count, self.panels, self.speed))
+        self._file.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self):
+        """Discard the partially written file."""
+        if not self._file.closed:
+            self._file.close()
+        try:
+            os.unlink(self._tmp_path)
+        except OSError:
+            pass
+
+
+class AnimationStore:
+    """Read-only, memory-mapped view of an animation file."""
+
+    def __init__(self, path: str):
+        """
+        Open an animation file.
+
+        Args:
+            path: File written by AnimationWriter
+        """
+        with open(path, "rb") as f:
+            header = f.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE:
+            raise ValueError(f"Not an animation file: {path}")
+        magic, count, panels, speed = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"Not an animation file: {path}")
+
+        self.path = path
+        self.panels = panels
+        self.speed = speed
+        shape = (count, PANEL_SIZE, PANEL_SIZE * panels, 3)
+        if count:
+            self.frames = np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER_SIZE, shape=shape)
+        else:
+            self.frames = np.empty(shape, dtype=np.uint8)
+
+    def __len__(self) -> int:
+        return self.frames.shape[0]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def frame(self, index: int) -> "np.ndarray":
+        """Zero-copy view of one wall frame, ``(64, 64 * panels, 3)``."""
+        return self.frames[index]
+
+    def panel_frames(
+        self,
+        panel: int,
+        start: int = 0,
+        stop: Optional[int] = None
+    ) -> "np.ndarray":
+        """
+        Zero-copy view of one panel's strip over a range of frames.
+
+        Args:
+            panel: Panel number (1-based, left to right)
+            start: First frame
+            stop: End frame (exclusive; default: the last frame)
+
+        Returns:
+            Array of shape ``(frames, 64, 64, 3)`` ready for encode_frames()
+        """
+        if not 1 <= panel <= self.panels:
+            raise ValueError(f"Panel must be between 1 and {self.panels}")
+        left = (panel - 1) * PANEL_SIZE
+        return self.frames[start:stop, :, left:left + PANEL_SIZE]
+
+    def close(self):
+        """Drop the memory map (it is unmapped once no view refers to it)."""
+        self.frames = np.empty((0, PANEL_SIZE, PANEL_SIZE * self.panels, 3), dtype=np.uint8)
+
+
+def write_animation(
+    path: str,
+    frames: Iterable[Union[Frame, "np.ndarray"]],
+    panels: int = 5,
+    speed: int = 100
+) -> int:
+    """
+    Write an animation file in one go.
+
+    Args:
+        path: Destination file
+        frames: Wall frames of shape ``(64, 64 * panels, 3)``
+        panels: Number of panels per frame
+        speed: Frame duration in milliseconds
+
+    Returns:
+        Number of frames written
+    """
+    with AnimationWriter(path, panels, speed) as writer:
+        writer.extend(frames)
+    return writer.count
@@ -0,0 +1,191 @@
+"""
+Command coalescing for Times Gate devices.
+
+Commands issued within a short window are collected and flushed as a single
+``Draw/CommandList`` request, saving one device round trip per command.
+"""
+
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# ids of the devices whose batch() is open in the current task (and in the
+# tasks it spawns, which inherit a copy of its context)
+_BATCH_SCOPE: ContextVar[Tuple[int, ...]] = ContextVar("timesgate_batch_scope", default=())
+
+# Commands whose response carries data, or that must not be delayed, are never
+# folded into a Draw/CommandList.
+UNBATCHABLE_COMMANDS = frozenset([
+    "Channel/GetAllConf",
+    "Channel/GetCurChannelInfo",
+    "Channel/GetWholeDial",
+    "Channel/GetIndex",
+    "Device/GetDeviceTime",
+    "Device/GetFontList",
+    "Device/Reboot",
+    "Draw/CommandList",
+])
+
+
+def is_batchable(command: Dict[str, Any]) -> bool:
+    """Return True if a command may be folded into a Draw/CommandList."""
+    name = command.get("Command", "")
+    return name not in UNBATCHABLE_COMMANDS and "/Get" not in name
+
+
+class CommandBatcher:
+    """Collects commands and sends them as one Draw/CommandList request."""
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        window: float = 0.005,
+        max_size: int = 16
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            send: Coroutine function that sends one command to the device
+            window: Seconds to wait for more commands before flushing
+            max_size: Flush immediately once this many commands are pending
+        """
+        self._send = send
+        self.window = window
+        self.max_size = max_size
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._tasks = set()
+        self.flushes = 0
+        self.commands = 0
+
+    @property
+    def pending(self) -> int:
+        """Number of commands waiting to be flushed."""
+        return len(self._pending)
+
+    @property
+    def idle(self) -> bool:
+        """True when nothing is pending or being flushed."""
+        return not self._pending and not (self._lock and self._lock.locked())
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Batching counters."""
+        return {
+            "flushes": self.flushes,
+            "commands": self.commands,
+            "saved_requests": self.commands - self.flushes,
+            "pending": self.pending
+        }
+
+    def submit(
+        self,
+        command: Dict[str, Any],
+        window: Optional[float] = None
+    ) -> "asyncio.Future[Dict[str, Any]]":
+        """
+        Queue a command for the next flush.
+
+        Args:
+            command: Command dictionary
+            window: Override the collection window for this batch (0 flushes
+                on the next event loop iteration)
+
+        Returns:
+            Future resolved with the command's response
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((command, future))
+
+        if len(self._pending) >= self.max_size:
+            self._schedule()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window if window is None else window, self._schedule)
+        return future
+
+    def _schedule(self):
+        """Start a background flush."""
+        self._cancel_timer()
+        task = asyncio.ensure_future(self.flush())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    async def flush(self):
+        """Send every pending command now."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            self._cancel_timer()
+            while self._pending:
+                batch = self._pending[:self.max_size]
+                del self._pending[:self.max_size]
+                await self._flush_batch(batch)
+
+    async def _flush_batch(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        """Send one batch and resolve its futures."""
+        if len(batch) == 1:
+            request = batch[0][0]
+        else:
+            request = {
+                "Command": "Draw/CommandList",
+                "CommandList": [command for command, _ in batch]
+            }
+
+        self.flushes += 1
+        self.commands += len(batch)
+        logger.debug(f"Flushing {len(batch)} batched command(s)")
+
+        try:
+            response = await self._send(request)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for _, future in batch:
+            if not future.done():
+                future.set_result(dict(response))
+
+    async def close(self):
+        """Flush pending commands and wait for background flushes."""
+        await self.flush()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+def in_batch(device) -> bool:
+    """True if the current task is inside ``device.batch()``."""
+    return id(device) in _BATCH_SCOPE.get()
+
+
+class CommandBatch:
+    """Async context manager that batches a device's commands while open.
+
+    Only commands issued from the task that opened the batch (and tasks it
+    starts inside the block) are batched; other tasks are unaffected.
+    """
+
+    def __init__(self, device):
+        self._device = device
+        self._token = None
+
+    async def __aenter__(self):
+        self._token = _BATCH_SCOPE.set(_BATCH_SCOPE.get() + (id(self._device),))
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        _BATCH_SCOPE.reset(self._token)
+        await self._device._batcher.flush()
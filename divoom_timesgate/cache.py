@@ -0,0 +1,196 @@
+"""
+Read-through state cache for Times Gate devices.
+
+Caches the responses of read-only commands and keeps them coherent with the
+device by applying an invalidation matrix after every acknowledged write:
+each setter either patches the affected fields of a cached read in place or
+drops the cached read so the next call re-fetches it.
+"""
+
+import copy
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Read-only commands whose responses may be cached
+CACHEABLE_COMMANDS = frozenset([
+    "Channel/GetAllConf",
+    "Channel/GetCurChannelInfo",
+    "Channel/GetIndex",
+    "Channel/GetWholeDial",
+    "Device/GetFontList",
+])
+
+Patch = Optional[Callable[[Dict[str, Any], Dict[str, Any]], None]]
+
+
+def _copy_field(field: str, param: str) -> Patch:
+    """Build a patch that copies a command parameter into a cached field."""
+    def patch(cached: Dict[str, Any], command: Dict[str, Any]):
+        cached[field] = command[param]
+    return patch
+
+
+# Channel switches made by tools, drawing and dials change what the panels show
+_CHANNEL_READS = {
+    "Channel/GetCurChannelInfo": None,
+    "Channel/GetIndex": None,
+}
+
+# Setter -> {cached read: patch, or None to invalidate}. Commands missing from
+# this table invalidate every cached read.
+INVALIDATION_MATRIX: Dict[str, Dict[str, Patch]] = {
+    "Channel/SetBrightness": {
+        "Channel/GetAllConf": _copy_field("Brightness", "Brightness"),
+    },
+    "Channel/OnOffScreen": {
+        "Channel/GetAllConf": _copy_field("LightSwitch", "OnOff"),
+    },
+    "Device/SetTime24Flag": {
+        "Channel/GetAllConf": _copy_field("Time24Flag", "Mode"),
+    },
+    "Device/SetDisTempMode": {
+        "Channel/GetAllConf": _copy_field("TemperatureMode", "Mode"),
+    },
+    "Device/SetMirrorMode": {
+        "Channel/GetAllConf": _copy_field("MirrorFlag", "Mode"),
+    },
+    "Channel/SetWholeDial": dict(_CHANNEL_READS, **{
+        "Channel/GetAllConf": _copy_field("CurClockId", "ClockId"),
+    }),
+    "Channel/SetIndividualDial": _CHANNEL_READS,
+    "Tools/SetTimer": _CHANNEL_READS,
+    "Tools/SetStopWatch": _CHANNEL_READS,
+    "Tools/SetScoreBoard": _CHANNEL_READS,
+    "Tools/SetNoiseStatus": _CHANNEL_READS,
+    "Draw/SendHttpItemList": _CHANNEL_READS,
+    "Draw/SendHttpText": _CHANNEL_READS,
+    "Draw/ClearHttpText": _CHANNEL_READS,
+    "Draw/SendHttpGif": _CHANNEL_READS,
+    "Device/PlayTFGif": _CHANNEL_READS,
+    "Device/SetUTC": {},
+    "Device/PlayBuzzer": {},
+    "Sys/TimeZone": {},
+    "Sys/LogAndLat": {},
+}
+
+
+class StateCache:
+    """TTL cache of read-only device responses."""
+
+    def __init__(self, ttl: float = 5.0, ttls: Optional[Dict[str, float]] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl: Default time-to-live in seconds for cached reads
+            ttls: Per-command TTL overrides (e.g. longer for font lists)
+        """
+        self.ttl = ttl
+        self.ttls = dict(ttls or {})
+        self._entries: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.hits = 0
+        self.misses = 0
+        self.patches = 0
+        self.invalidations = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache counters for monitoring."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "patches": self.patches,
+            "invalidations": self.invalidations,
+            "entries": len(self._entries)
+        }
+
+    @staticmethod
+    def _key(command: Dict[str, Any]) -> Optional[str]:
+        """Cache key for a command, or None if it is not cacheable."""
+        name = command.get("Command")
+        if name in CACHEABLE_COMMANDS and len(command) == 1:
+            return name
+        return None
+
+    def lookup(self, command: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Return a cached response for a read command.
+
+        Args:
+            command: Command dictionary
+
+        Returns:
+            Copy of the cached response, or None on a miss
+        """
+        key = self._key(command)
+        if key is None:
+            return None
+
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            self.hits += 1
+            # Deep copy: responses hold lists (ClockList, FontList, ...) that
+            # callers may modify
+            return copy.deepcopy(entry[1])
+
+        self.misses += 1
+        return None
+
+    def record(self, command: Dict[str, Any], response: Dict[str, Any]):
+        """
+        Update the cache after a command was acknowledged.
+
+        Args:
+            command: Command that was sent
+            response: Response from the device
+        """
+        name = command.get("Command", "")
+        key = self._key(command)
+        if key is not None:
+            expires = time.monotonic() + self.ttls.get(key, self.ttl)
+            self._entries[key] = (expires, copy.deepcopy(response))
+        elif name == "Draw/CommandList":
+            for sub_command in command.get("CommandList", []):
+                self.record(sub_command, response)
+        elif "/Get" not in name:
+            self._apply(command, patch=True)
+
+    def discard(self, command: Dict[str, Any]):
+        """
+        Drop every read a failed command may have affected.
+
+        Args:
+            command: Command whose outcome is unknown
+        """
+        name = command.get("Command", "")
+        if name == "Draw/CommandList":
+            for sub_command in command.get("CommandList", []):
+                self.discard(sub_command)
+        elif "/Get" not in name:
+            self._apply(command, patch=False)
+
+    def _apply(self, command: Dict[str, Any], patch: bool):
+        """Apply the invalidation matrix row for a setter."""
+        effects = INVALIDATION_MATRIX.get(command.get("Command"))
+        if effects is None:
+            self.clear()
+            return
+
+        for read, patch_fn in effects.items():
+            entry = self._entries.get(read)
+            if entry is None:
+                continue
+            if patch and patch_fn is not None:
+                try:
+                    patch_fn(entry[1], command)
+                    self.patches += 1
+                    continue
+                except KeyError:
+                    pass
+            del self._entries[read]
+            self.invalidations += 1
+
+    def clear(self):
+        """Drop every cached read."""
+        self.invalidations += len(self._entries)
+        self._entries.clear()
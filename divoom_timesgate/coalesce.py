@@ -0,0 +1,112 @@
+"""
+Last-write-wins coalescing of high-frequency updates.
+
+Updates are keyed on (command, LCD panel). While one update for a key is in
+flight, newer ones replace the pending value instead of queueing behind it,
+so the device converges on the latest state at its sustainable rate.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+Key = Tuple[str, Optional[int]]
+
+
+def coalesce_key(command: Dict[str, Any]) -> Key:
+    """Key under which updates of a command replace each other."""
+    lcd_id = command.get("LcdId", command.get("LcdIndex"))
+    return (command.get("Command", ""), lcd_id)
+
+
+class _Slot:
+    """In-flight and pending state of one key."""
+
+    def __init__(self):
+        self.in_flight = False
+        self.pending: Optional[Dict[str, Any]] = None
+        self.waiters: List[asyncio.Future] = []
+
+
+class LatestValueCoalescer:
+    """Sends only the newest value per key, dropping superseded ones."""
+
+    def __init__(self, send: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+        """
+        Initialize the coalescer.
+
+        Args:
+            send: Coroutine function that sends one command to the device
+        """
+        self._send = send
+        self._slots: Dict[Key, _Slot] = {}
+        self._tasks = set()
+        self.submitted = 0
+        self.sent = 0
+        self.dropped = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Coalescing counters."""
+        return {
+            "submitted": self.submitted,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "pending": sum(1 for slot in self._slots.values() if slot.pending is not None)
+        }
+
+    async def submit(self, command: Dict[str, Any]) -> bool:
+        """
+        Apply a command, superseding any older pending value for its key.
+
+        Args:
+            command: Command dictionary
+
+        Returns:
+            True once this value, or a newer one for the same key, has been
+            acknowledged by the device
+        """
+        self.submitted += 1
+        key = coalesce_key(command)
+        slot = self._slots.setdefault(key, _Slot())
+
+        if slot.pending is not None:
+            self.dropped += 1
+        slot.pending = command
+
+        future = asyncio.get_running_loop().create_future()
+        slot.waiters.append(future)
+
+        if not slot.in_flight:
+            slot.in_flight = True
+            task = asyncio.ensure_future(self._drain(key, slot))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        return await future
+
+    async def _drain(self, key: Key, slot: _Slot):
+        """Send the newest value of a key until nothing is pending."""
+        try:
+            while slot.pending is not None:
+                command, slot.pending = slot.pending, None
+                waiters, slot.waiters = slot.waiters, []
+                self.sent += 1
+                try:
+                    await self._send(command)
+                except Exception as e:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                else:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(True)
+        finally:
+            slot.in_flight = False
+            if slot.pending is None and self._slots.get(key) is slot:
+                del self._slots[key]
+
+    async def close(self):
+        """Wait for in-flight and pending updates to be sent."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
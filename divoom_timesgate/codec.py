@@ -0,0 +1,89 @@
+"""
+JSON encoding of commands and decoding of device responses.
+
+orjson is used when it is installed; the standard library is the fallback.
+Bodies are always pure ASCII, with non-ASCII text sent as ``\\uXXXX``
+escapes as the firmware has always received it.
+Most commands are setters whose response is a bare ``{"error_code": 0}``,
+so those bodies are recognized byte-for-byte instead of being parsed.
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+# Response bodies of a successful setter, as sent by the firmware and the emulator
+_OK_BODIES = frozenset([
+    b'{"error_code":0}',
+    b'{"error_code": 0}',
+    b'{ "error_code": 0 }',
+    b'{"error_code":0}\n',
+    b'{"error_code": 0}\n',
+])
+
+
+class JSONCodec:
+    """Standard library JSON codec."""
+
+    name = "json"
+
+    def dumps(self, obj: Dict[str, Any]) -> bytes:
+        """Encode a command as compact, ASCII-only JSON."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    def loads(self, data: bytes) -> Any:
+        """Decode a JSON document."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson-backed codec."""
+
+    name = "orjson"
+
+    def dumps(self, obj: Dict[str, Any]) -> bytes:
+        body = orjson.dumps(obj)
+        # orjson writes raw UTF-8; escape non-ASCII text as the stdlib does
+        if not body.isascii():
+            return super().dumps(obj)
+        return body
+
+    def loads(self, data: bytes) -> Any:
+        return orjson.loads(data)
+
+
+class EncodedCommand(dict):
+    """A command that carries its serialized body, so it is never re-encoded.
+
+    The dict must not be modified after construction.
+    """
+
+    __slots__ = ("body",)
+
+    def __init__(self, command: Dict[str, Any], codec: Optional[JSONCodec] = None):
+        """
+        Serialize a command once.
+
+        Args:
+            command: Command dictionary
+            codec: Codec to encode it with (default: JSONCodec)
+        """
+        super().__init__(command)
+        self.body = (codec or JSONCodec()).dumps(command)
+
+
+def default_codec() -> JSONCodec:
+    """Fastest codec available in this environment."""
+    if orjson is not None:
+        return OrjsonCodec()
+    return JSONCodec()
+
+
+def is_ok_body(body: bytes) -> bool:
+    """True if a response body is exactly a successful, field-less reply."""
+    return body in _OK_BODIES
+
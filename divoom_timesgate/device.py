@@ -6,12 +6,21 @@ Main class for controlling Divoom Times Gate devices.
 
 import asyncio
 import aiohttp
-import json
-from typing import Dict, Any, List, Optional, Union
+import time
+from typing import Dict, Any, AsyncIterable, List, Mapping, Optional, Sequence, Union
 from datetime import datetime
 import logging
 
+from .batching import CommandBatch, CommandBatcher, in_batch, is_batchable
+from .cache import StateCache
+from .codec import EncodedCommand, JSONCodec, default_codec, is_ok_body
+from .coalesce import LatestValueCoalescer
+from .dispatch import CommandDispatcher, Priority, priority_for
+from .shadow import ShadowState
+from .transport import AiohttpTransport, Transport
 from .exceptions import TimesGateError, TimesGateConnectionError, TimesGateCommandError
+from .retry import CircuitBreaker, RetryPolicy
+from .scene import Scene, SceneCompiler
 from .models import DisplayPanel, TextAlignment, FontSize, TemperatureMode, TimeFormat
 
 logger = logging.getLogger(__name__)
@@ -20,18 +29,72 @@ logger = logging.getLogger(__name__)
 class TimesGateDevice:
     """Main class for controlling a Divoom Times Gate device."""
     
-    def __init__(self, ip_address: str, port: int = 80):
+    def __init__(
+        self,
+        ip_address: str,
+        port: int = 80,
+        transport: Optional[Transport] = None,
+        auto_batch: bool = False,
+        batch_window: float = 0.005,
+        max_batch_size: int = 16,
+        cache_ttl: Optional[float] = None,
+        shadow: bool = False,
+        shadow_resync_interval: Optional[float] = None,
+        max_queue: int = 64,
+        retry: Optional[RetryPolicy] = None,
+        breaker_threshold: Optional[int] = None,
+        breaker_reset_timeout: float = 30.0,
+        codec: Optional[JSONCodec] = None
+    ):
         """
         Initialize a Times Gate device connection.
         
         Args:
             ip_address: IP address of the device
             port: HTTP port (default: 80)
+            transport: Shared transport (connection pool); by default the
+                device creates and owns a private AiohttpTransport
+            auto_batch: Coalesce commands issued within ``batch_window``
+                into one Draw/CommandList request
+            batch_window: Seconds to collect commands before flushing a batch
+            max_batch_size: Maximum number of commands per Draw/CommandList
+            cache_ttl: Cache read-only responses (settings, channels, dial
+                and font lists) for this many seconds; None disables caching
+            shadow: Skip setters whose value the device already acknowledged
+            shadow_resync_interval: Seconds between resynchronizations of the
+                shadow against Channel/GetAllConf; None disables resync
+            max_queue: Commands queued per priority lane before callers wait
+            retry: Retry policy for idempotent commands; None disables retries
+            breaker_threshold: Consecutive connection failures after which
+                commands fail fast; None disables the circuit breaker
+            breaker_reset_timeout: Seconds to fail fast before a probe request
+            codec: JSON codec for commands and responses (default: orjson
+                when installed, else the standard library)
         """
         self.ip_address = ip_address
         self.port = port
         self.base_url = f"http://{ip_address}:{port}/post"
-        self._session: Optional[aiohttp.ClientSession] = None
+        self._transport = transport
+        self._owns_transport = transport is None
+        self._warmed = False
+        self.auto_batch = auto_batch
+        self._dispatcher = CommandDispatcher(self._post, max_queue=max_queue)
+        self._coalescer = LatestValueCoalescer(self._send_command)
+        self.retry = retry
+        self.retries = 0
+        self._breaker: Optional[CircuitBreaker] = None
+        if breaker_threshold is not None:
+            self._breaker = CircuitBreaker(breaker_threshold, breaker_reset_timeout)
+        self._batcher = CommandBatcher(self._transmit, window=batch_window, max_size=max_batch_size)
+        self._cache: Optional[StateCache] = StateCache(cache_ttl) if cache_ttl is not None else None
+        self._shadow: Optional[ShadowState] = ShadowState() if shadow else None
+        self.shadow_resync_interval = shadow_resync_interval
+        self._last_resync = time.monotonic()
+        self.codec = codec or default_codec()
+        self._pic_id = 0
+        self._frame_shadow = None
+        self._scene_compiler = None
+        self._display_lists = None
     
     async def __aenter__(self):
         """Async context manager entry."""
@@ -42,23 +105,126 @@ class TimesGateDevice:
         """Async context manager exit."""
         await self.close()
     
+    @property
+    def transport(self) -> Optional[Transport]:
+        """Transport used to reach the device."""
+        return self._transport
+    
+    @property
+    def _session(self) -> Optional[aiohttp.ClientSession]:
+        """HTTP session of the underlying transport."""
+        return getattr(self._transport, "session", None)
+    
     async def connect(self):
         """Initialize the HTTP session."""
-        if not self._session:
-            self._session = aiohttp.ClientSession()
+        if self._transport is None:
+            self._transport = AiohttpTransport()
+        if not self._transport.started:
+            await self._transport.start()
+        if self._transport.prewarm and not self._warmed:
+            self._warmed = True
+            await self._transport.warm(self.base_url)
     
     async def close(self):
         """Close the HTTP session."""
-        if self._session:
-            await self._session.close()
-            self._session = None
+        await self._coalescer.close()
+        await self._batcher.close()
+        await self._dispatcher.close()
+        self._warmed = False
+        if self._transport and self._owns_transport:
+            await self._transport.close()
+            self._transport = None
     
-    async def _send_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
+    def batch(self) -> CommandBatch:
+        """
+        Batch commands issued while the context is open.
+        
+        Setters issued concurrently inside the block are coalesced into one
+        Draw/CommandList request, flushed on the next event loop iteration;
+        each caller's awaitable resolves when its batch has been acknowledged.
+        Anything still pending is flushed on exit.
+        
+        Example:
+            async with device.batch():
+                await asyncio.gather(*(
+                    device.set_panel_timer(panel, 0, 30) for panel in range(1, 6)
+                ))
+        """
+        return CommandBatch(self)
+    
+    @property
+    def batch_stats(self) -> Dict[str, int]:
+        """Counters for coalesced Draw/CommandList requests."""
+        return self._batcher.stats
+    
+    @property
+    def queue_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and wait-time metrics per priority lane."""
+        return self._dispatcher.stats
+    
+    @property
+    def coalesce_stats(self) -> Dict[str, int]:
+        """Counters of updates sent and dropped by send_latest()."""
+        return self._coalescer.stats
+    
+    @property
+    def retry_stats(self) -> Dict[str, Any]:
+        """Retry count and circuit breaker state."""
+        stats: Dict[str, Any] = {"retries": self.retries}
+        if self._breaker is not None:
+            stats.update(
+                circuit=self._breaker.state,
+                circuit_opened=self._breaker.opened,
+                circuit_rejected=self._breaker.rejected
+            )
+        return stats
+    
+    @property
+    def cache_stats(self) -> Dict[str, int]:
+        """Hit/miss counters of the read cache (empty if caching is disabled)."""
+        return self._cache.stats if self._cache is not None else {}
+    
+    def invalidate_cache(self):
+        """Drop every cached read so the next call re-fetches from the device."""
+        if self._cache is not None:
+            self._cache.clear()
+    
+    @property
+    def shadow_stats(self) -> Dict[str, int]:
+        """Counters of suppressed no-op writes (empty if the shadow is disabled)."""
+        return self._shadow.stats if self._shadow is not None else {}
+    
+    @property
+    def frame_stats(self) -> Dict[str, int]:
+        """Counters of panel frame uploads sent and skipped as unchanged."""
+        return self._frame_shadow.stats if self._frame_shadow is not None else {}
+    
+    async def resync_shadow(self) -> Dict[str, Any]:
+        """
+        Reconcile the shadow state with the device's Channel/GetAllConf.
+        
+        Returns:
+            Dictionary of device settings
+        """
+        self._last_resync = time.monotonic()
+        settings = await self._send_command({"Command": "Channel/GetAllConf"}, force=True)
+        if self._shadow is not None:
+            self._shadow.reconcile(settings)
+        return settings
+    
+    async def _send_command(
+        self,
+        command: Dict[str, Any],
+        force: bool = False,
+        priority: Optional[Priority] = None
+    ) -> Dict[str, Any]:
         """
         Send a command to the device.
         
         Args:
             command: Command dictionary to send
+            force: Bypass the read cache and no-op suppression
+            priority: Dispatch lane (default depends on the command)
             
         Returns:
             Response from the device
@@ -67,46 +233,169 @@ class TimesGateDevice:
             TimesGateConnectionError: If connection fails
             TimesGateCommandError: If command fails
         """
-        if not self._session:
+        if self._shadow is not None:
+            if not force:
+                if (self.shadow_resync_interval is not None and
+                        time.monotonic() - self._last_resync >= self.shadow_resync_interval):
+                    # A failed resync must not fail the caller's unrelated command
+                    try:
+                        await self.resync_shadow()
+                    except TimesGateError as e:
+                        logger.warning(f"Shadow resync with {self.ip_address} failed: {e}")
+                if self._shadow.is_noop(command):
+                    return {"error_code": 0}
+            self._shadow.begin(command)
+        
+        if priority is None:
+            priority = priority_for(command)
+        
+        batching = in_batch(self)
+        if ((self.auto_batch or batching) and is_batchable(command) and
+                priority != Priority.INTERACTIVE):
+            # An explicit batch flushes as soon as its concurrent callers have
+            # all queued; auto-batching waits for the configured window.
+            return await self._batcher.submit(command, 0 if batching else None)
+        
+        # Keep ordering with commands that are still waiting in a batch
+        if not self._batcher.idle:
+            await self._batcher.flush()
+        
+        if self._cache is not None and not force:
+            cached = self._cache.lookup(command)
+            if cached is not None:
+                return cached
+        
+        return await self._transmit(command, priority)
+    
+    async def _transmit(
+        self,
+        command: Dict[str, Any],
+        priority: Optional[Priority] = None
+    ) -> Dict[str, Any]:
+        """
+        Send a command and keep the read cache and shadow coherent with its outcome.
+        
+        Args:
+            command: Command dictionary to send
+            priority: Dispatch lane (default depends on the command)
+            
+        Returns:
+            Response from the device
+        """
+        try:
+            response = await self._submit_with_retry(command, priority)
+        except Exception:
+            if self._cache is not None:
+                self._cache.discard(command)
+            if self._shadow is not None:
+                self._shadow.discard(command)
+            if self._frame_shadow is not None:
+                self._frame_shadow.observe(command)
+            if self._display_lists is not None:
+                self._display_lists.observe(command)
+            raise
+        
+        if self._cache is not None:
+            self._cache.record(command, response)
+        if self._shadow is not None:
+            self._shadow.acknowledge(command)
+        if self._frame_shadow is not None:
+            self._frame_shadow.observe(command)
+        if self._display_lists is not None:
+            self._display_lists.observe(command)
+        return response
+    
+    async def _submit_with_retry(
+        self,
+        command: Dict[str, Any],
+        priority: Optional[Priority] = None
+    ) -> Dict[str, Any]:
+        """
+        Dispatch a command, retrying idempotent commands per the retry policy.
+        
+        Backoff happens outside the dispatcher so other lanes keep flowing.
+        """
+        attempt = 1
+        while True:
+            try:
+                return await self._dispatcher.submit(command, priority)
+            except Exception as e:
+                if self.retry is None or not self.retry.should_retry(command, e, attempt):
+                    raise
+                delay = self.retry.delay(attempt)
+                logger.debug(f"Retrying {command.get('Command')} in {delay:.3f}s after: {e}")
+                attempt += 1
+                self.retries += 1
+                await asyncio.sleep(delay)
+    
+    async def _post(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a single command to the device.
+        
+        Args:
+            command: Command dictionary to send
+            
+        Returns:
+            Response from the device
+        """
+        if self._transport is None or not self._transport.started:
             await self.connect()
         
+        debug = logger.isEnabledFor(logging.DEBUG)
+        body = command.body if isinstance(command, EncodedCommand) else self.codec.dumps(command)
+        if debug:
+            logger.debug(f"Sending command to {self.ip_address}: {body.decode()}")
+        
+        if self._breaker is not None:
+            self._breaker.before_request()
+        
+        # Device returns JSON with a text/html content type, so decode the raw body
+        try:
+            body = await self._transport.post(self.base_url, body)
+        except TimesGateConnectionError:
+            if self._breaker is not None:
+                self._breaker.record_failure()
+            raise
+        except BaseException:
+            # Cancelled or failed locally: free the half-open probe slot
+            if self._breaker is not None:
+                self._breaker.release()
+            raise
+        if self._breaker is not None:
+            self._breaker.record_success()
+        
+        if debug:
+            logger.debug(f"Response from {self.ip_address}: {body.decode(errors='replace')}")
+        
+        # Setters answer with a bare success reply; skip parsing it
+        if is_ok_body(body):
+            return {"error_code": 0}
+        
         try:
-            logger.debug(f"Sending command to {self.ip_address}: {json.dumps(command)}")
-            
-            async with self._session.post(
-                self.base_url,
-                json=command,
-                timeout=aiohttp.ClientTimeout(total=10)
-            ) as response:
-                # Get response as text first (device returns text/html content type)
-                response_text = await response.text()
-                
-                try:
-                    response_data = json.loads(response_text)
-                except json.JSONDecodeError:
-                    logger.error(f"Invalid JSON response: {response_text}")
-                    raise TimesGateCommandError(f"Invalid JSON response from device")
-                
-                logger.debug(f"Response from {self.ip_address}: {json.dumps(response_data)}")
-                
-                if response_data.get("error_code", 0) != 0:
-                    raise TimesGateCommandError(
-                        f"Command failed with error code: {response_data.get('error_code')}"
-                    )
-                
-                return response_data
-                
-        except aiohttp.ClientError as e:
-            raise TimesGateConnectionError(f"Failed to connect to device: {str(e)}")
+            response_data = self.codec.loads(body)
+        except ValueError:
+            logger.error(f"Invalid JSON response: {body.decode(errors='replace')}")
+            raise TimesGateCommandError(f"Invalid JSON response from device")
+        
+        if not isinstance(response_data, dict):
+            raise TimesGateCommandError(f"Invalid JSON response from device")
+        
+        if response_data.get("error_code", 0) != 0:
+            raise TimesGateCommandError(
+                f"Command failed with error code: {response_data.get('error_code')}"
+            )
+        
+        return response_data
     
     # System Settings
     
-    async def set_brightness(self, brightness: int) -> bool:
+    async def set_brightness(self, brightness: int, force: bool = False) -> bool:
         """
         Set the display brightness.
         
         Args:
             brightness: Brightness level (0-100)
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -117,7 +406,7 @@ class TimesGateDevice:
         await self._send_command({
             "Command": "Channel/SetBrightness",
             "Brightness": brightness
-        })
+        }, force=force)
         return True
     
     async def get_settings(self) -> Dict[str, Any]:
@@ -163,12 +452,13 @@ class TimesGateDevice:
         })
         return response
     
-    async def set_timezone(self, timezone: str) -> bool:
+    async def set_timezone(self, timezone: str, force: bool = False) -> bool:
         """
         Set the device timezone.
         
         Args:
             timezone: Timezone string (e.g., "GMT-5", "GMT+8")
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -176,15 +466,16 @@ class TimesGateDevice:
         await self._send_command({
             "Command": "Sys/TimeZone",
             "TimeZoneValue": timezone
-        })
+        }, force=force)
         return True
     
-    async def set_temperature_mode(self, mode: TemperatureMode) -> bool:
+    async def set_temperature_mode(self, mode: TemperatureMode, force: bool = False) -> bool:
         """
         Set temperature display mode.
         
         Args:
             mode: Temperature mode (Celsius or Fahrenheit)
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -192,15 +483,16 @@ class TimesGateDevice:
         await self._send_command({
             "Command": "Device/SetDisTempMode",
             "Mode": mode.value
-        })
+        }, force=force)
         return True
     
-    async def set_mirror_mode(self, enabled: bool) -> bool:
+    async def set_mirror_mode(self, enabled: bool, force: bool = False) -> bool:
         """
         Set display mirror mode.
         
         Args:
             enabled: True to enable mirroring
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -208,15 +500,16 @@ class TimesGateDevice:
         await self._send_command({
             "Command": "Device/SetMirrorMode",
             "Mode": 1 if enabled else 0
-        })
+        }, force=force)
         return True
     
-    async def set_time_format(self, format: TimeFormat) -> bool:
+    async def set_time_format(self, format: TimeFormat, force: bool = False) -> bool:
         """
         Set time display format.
         
         Args:
             format: Time format (12-hour or 24-hour)
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -224,15 +517,16 @@ class TimesGateDevice:
         await self._send_command({
             "Command": "Device/SetTime24Flag",
             "Mode": format.value
-        })
+        }, force=force)
         return True
     
-    async def set_screen_power(self, on: bool) -> bool:
+    async def set_screen_power(self, on: bool, force: bool = False) -> bool:
         """
         Turn the display on or off.
         
         Args:
             on: True to turn on, False to turn off
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -240,16 +534,17 @@ class TimesGateDevice:
         await self._send_command({
             "Command": "Channel/OnOffScreen",
             "OnOff": 1 if on else 0
-        })
+        }, force=force)
         return True
     
-    async def set_weather_location(self, latitude: float, longitude: float) -> bool:
+    async def set_weather_location(self, latitude: float, longitude: float, force: bool = False) -> bool:
         """
         Set the weather location.
         
         Args:
             latitude: Latitude coordinate
             longitude: Longitude coordinate
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -258,7 +553,7 @@ class TimesGateDevice:
             "Command": "Sys/LogAndLat",
             "Latitude": str(latitude),
             "Longitude": str(longitude)
-        })
+        }, force=force)
         return True
     
     async def reboot(self) -> bool:
@@ -287,12 +582,13 @@ class TimesGateDevice:
         })
         return response
     
-    async def set_whole_dial(self, clock_id: int) -> bool:
+    async def set_whole_dial(self, clock_id: int, force: bool = False) -> bool:
         """
         Set clock face for all displays.
         
         Args:
             clock_id: ID of the clock face
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -300,16 +596,17 @@ class TimesGateDevice:
         await self._send_command({
             "Command": "Channel/SetWholeDial",
             "ClockId": clock_id
-        })
+        }, force=force)
         return True
     
-    async def set_individual_dial(self, panel: DisplayPanel, clock_id: int) -> bool:
+    async def set_individual_dial(self, panel: DisplayPanel, clock_id: int, force: bool = False) -> bool:
         """
         Set clock face for individual LCD panel.
         
         Args:
             panel: Display panel
             clock_id: ID of the clock face
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -318,7 +615,7 @@ class TimesGateDevice:
             "Command": "Channel/SetIndividualDial",
             "LcdId": panel.value,
             "ClockId": clock_id
-        })
+        }, force=force)
         return True
     
     async def get_dial_list(self) -> List[Dict[str, Any]]:
@@ -414,6 +711,333 @@ class TimesGateDevice:
         })
         return True
     
+    async def send_frames(
+        self,
+        panel: Union[int, Sequence[int]],
+        frames: Sequence[Any],
+        speed: int = 100,
+        pixel_format: str = "rgb888",
+        quantizer: Optional[Any] = None
+    ) -> bool:
+        """
+        Upload an animation to one or more panels via Draw/SendHttpGif.
+        
+        The whole batch is encoded at once with vectorized packing, then sent
+        one frame per request (``PicOffset``) under a fresh ``PicID``.
+        Requires numpy.
+        
+        Args:
+            panel: Panel number (1-5), or several panels showing the same frames
+            frames: 64x64 framebuffer.Frame objects or RGB uint8 arrays
+            speed: Frame duration in milliseconds
+            pixel_format: "rgb888" or "rgb565"
+            quantizer: Optional quantize.Quantizer reducing the frames to a
+                dithered adaptive palette before encoding
+            
+        Returns:
+            True if successful
+        """
+        from .framebuffer import encode_frames
+        
+        panels = [panel] if isinstance(panel, int) else list(panel)
+        if not panels or not all(1 <= p <= 5 for p in panels):
+            raise ValueError("Panel must be between 1 and 5")
+        
+        pic_data = encode_frames(frames, pixel_format, quantizer)
+        if not pic_data:
+            raise ValueError("At least one frame is required")
+        await self._upload_frames(panels, pic_data, speed)
+        return True
+    
+    async def send_encoded_frames(
+        self,
+        panel: Union[int, Sequence[int]],
+        pic_data: Sequence[str],
+        speed: int = 100
+    ) -> bool:
+        """
+        Upload an animation that is already encoded to PicData strings.
+        
+        Use with a payloadcache.PayloadCache to skip re-encoding content
+        that is shown repeatedly.
+        
+        Args:
+            panel: Panel number (1-5), or several panels showing the same frames
+            pic_data: One base64 PicData string per frame
+            speed: Frame duration in milliseconds
+            
+        Returns:
+            True if successful
+        """
+        panels = [panel] if isinstance(panel, int) else list(panel)
+        if not panels or not all(1 <= p <= 5 for p in panels):
+            raise ValueError("Panel must be between 1 and 5")
+        if not pic_data:
+            raise ValueError("At least one frame is required")
+        
+        await self._upload_frames(panels, list(pic_data), speed)
+        return True
+    
+    async def _upload_frames(self, panels: Sequence[int], pic_data: List[str], speed: int):
+        """Send encoded frames as one animation, one PicOffset per request."""
+        from .framebuffer import PANEL_SIZE
+        
+        lcd_array = [1 if lcd_id in panels else 0 for lcd_id in range(1, 6)]
+        self._pic_id += 1
+        pic_id = self._pic_id
+        for offset, data in enumerate(pic_data):
+            await self._send_command({
+                "Command": "Draw/SendHttpGif",
+                "LcdArray": lcd_array,
+                "PicNum": len(pic_data),
+                "PicWidth": PANEL_SIZE,
+                "PicOffset": offset,
+                "PicID": pic_id,
+                "PicSpeed": speed,
+                "PicData": data
+            })
+    
+    async def stream(
+        self,
+        panel: Union[int, Sequence[int]],
+        frames: AsyncIterable[Any],
+        fps: float = 10.0,
+        chunk_size: int = 1,
+        pixel_format: str = "rgb888",
+        quantizer: Optional[Any] = None
+    ) -> Dict[str, int]:
+        """
+        Stream live-generated frames to one or more panels.
+        
+        Frames are consumed at most ``fps`` times per second and uploaded
+        in chunks of ``chunk_size`` frames via Draw/SendHttpGif. The next
+        chunk is encoded while the previous one is in flight; if the device
+        falls behind, stale chunks are dropped rather than queued.
+        Requires numpy.
+        
+        Example:
+            async def ticker():
+                frame = Frame()
+                for x in range(64):
+                    yield frame.clear().line(x, 0, x, 63, "#00FF00")
+            
+            await device.stream(3, ticker(), fps=10)
+        
+        Args:
+            panel: Panel number (1-5), or several panels showing the same stream
+            frames: Async iterator of 64x64 Frame objects or RGB uint8 arrays
+            fps: Maximum frames per second
+            chunk_size: Frames per uploaded animation
+            pixel_format: "rgb888" or "rgb565"
+            quantizer: Optional quantize.Quantizer applied to each chunk
+            
+        Returns:
+            Counters of frames received, sent and dropped
+        """
+        from .stream import FrameStream
+        
+        panels = [panel] if isinstance(panel, int) else list(panel)
+        if not panels or not all(1 <= p <= 5 for p in panels):
+            raise ValueError("Panel must be between 1 and 5")
+        
+        speed = max(1, int(round(1000 / fps)))
+        
+        async def send_chunk(pic_data: List[str]):
+            await self._upload_frames(panels, pic_data, speed)
+        
+        return await FrameStream(send_chunk, fps, chunk_size, pixel_format, quantizer).run(frames)
+    
+    async def send_panel_frames(
+        self,
+        frames: Mapping[int, Any],
+        speed: int = 100,
+        force: bool = False,
+        pixel_format: str = "rgb888"
+    ) -> List[int]:
+        """
+        Show a still frame on each of several panels, skipping unchanged ones.
+        
+        Each panel's last acknowledged frame is remembered. Panels whose new
+        frame is identical are skipped; panels sharing the same new frame
+        share one Draw/SendHttpGif through its ``LcdArray``; the remaining
+        uploads go out as one Draw/CommandList. Requires numpy.
+        
+        Args:
+            frames: Panel number (1-5) -> 64x64 Frame or RGB uint8 array
+            speed: Frame duration in milliseconds
+            force: Upload every panel even if it already shows the frame
+            pixel_format: "rgb888" or "rgb565"
+            
+        Returns:
+            Panels that were uploaded
+        """
+        import numpy as np
+        from .framebuffer import PANEL_SIZE, FrameShadow, as_pixels, encode_frames, encoded_size
+        
+        if self._frame_shadow is None:
+            self._frame_shadow = FrameShadow()
+        shadow = self._frame_shadow
+        
+        groups: Dict[bytes, List[int]] = {}
+        contents: Dict[bytes, Any] = {}
+        skipped = 0
+        for panel, frame in frames.items():
+            if not 1 <= panel <= 5:
+                raise ValueError("Panel must be between 1 and 5")
+            pixels = as_pixels(frame)
+            if not force and shadow.matches(panel, pixels):
+                skipped += 1
+                continue
+            key = pixels.tobytes()
+            groups.setdefault(key, []).append(panel)
+            if key not in contents:
+                # Snapshot: frames may be views the caller keeps drawing into
+                contents[key] = np.frombuffer(key, dtype=np.uint8).reshape(pixels.shape)
+        
+        encoded = encode_frames(list(contents.values()), pixel_format)
+        
+        uploads = []
+        for (key, panels), data in zip(groups.items(), encoded):
+            self._pic_id += 1
+            shadow.own(self._pic_id)
+            tokens = {panel: shadow.begin(panel) for panel in panels}
+            uploads.append((key, tokens, {
+                "Command": "Draw/SendHttpGif",
+                "LcdArray": [1 if lcd_id in panels else 0 for lcd_id in range(1, 6)],
+                "PicNum": 1,
+                "PicWidth": PANEL_SIZE,
+                "PicOffset": 0,
+                "PicID": self._pic_id,
+                "PicSpeed": speed,
+                "PicData": data
+            }))
+        
+        try:
+            async with self.batch():
+                results = await asyncio.gather(
+                    *(self._send_command(command) for _, _, command in uploads),
+                    return_exceptions=True
+                )
+        finally:
+            for _, _, command in uploads:
+                shadow.disown(command["PicID"])
+        
+        sent = []
+        error = None
+        # Skipped panels, plus every panel but one of each delivered group
+        saved = skipped
+        for (key, tokens, _), result in zip(uploads, results):
+            if isinstance(result, BaseException):
+                error = error or result
+                continue
+            for panel, token in tokens.items():
+                shadow.acknowledge(panel, contents[key], token)
+                sent.append(panel)
+            saved += len(tokens) - 1
+        shadow.record(len(sent), skipped, saved, saved * encoded_size(pixel_format))
+        if error is not None:
+            raise error
+        return sorted(sent)
+    
+    async def send_canvas(
+        self,
+        canvas: Any,
+        speed: int = 100,
+        force: bool = False,
+        pixel_format: str = "rgb888"
+    ) -> List[int]:
+        """
+        Show a five-panel canvas, uploading only the panels whose slice changed.
+        
+        The changed panels go out together in one Draw/CommandList (see
+        send_panel_frames). Requires numpy.
+        
+        Args:
+            canvas: framebuffer.Canvas spanning panels 1-5
+            speed: Frame duration in milliseconds
+            force: Upload every panel even if it already shows its slice
+            pixel_format: "rgb888" or "rgb565"
+            
+        Returns:
+            Panels that were uploaded
+        """
+        return await self.send_panel_frames(canvas.panel_frames(), speed, force, pixel_format)
+    
+    async def send_text_frame(
+        self,
+        panel: int,
+        text: str,
+        color: str = "#FFFFFF",
+        background: str = "#000000",
+        font: FontSize = FontSize.SMALL,
+        alignment: TextAlignment = TextAlignment.CENTER
+    ) -> bool:
+        """
+        Show a line of text on a panel, rasterized locally.
+        
+        Unlike send_text(), this works over HTTP and needs no app-side mode:
+        the text is drawn with a bundled bitmap font and uploaded as a
+        frame. Re-sending text the panel already shows is skipped.
+        Requires numpy.
+        
+        Args:
+            panel: Panel number (1-5)
+            text: Single line of ASCII text (clipped to the panel)
+            color: Hex text color (#RRGGBB)
+            background: Hex background color (#RRGGBB)
+            font: Font size tier
+            alignment: Horizontal alignment
+            
+        Returns:
+            True if the panel was uploaded, False if it already showed the text
+        """
+        from .text import render_text
+        
+        frame = render_text(text, color, background, font, alignment)
+        return bool(await self.send_panel_frames({panel: frame}))
+    
+    async def scroll_text(
+        self,
+        panel: Union[int, Sequence[int]],
+        text: str,
+        color: str = "#FFFFFF",
+        background: str = "#000000",
+        font: FontSize = FontSize.SMALL,
+        fps: float = 20.0,
+        step: int = 1,
+        direction: int = 0,
+        loops: Optional[int] = 1,
+        chunk_size: int = 1,
+        pixel_format: str = "rgb888"
+    ) -> Dict[str, int]:
+        """
+        Scroll a message across a panel, rendered client-side.
+        
+        The message is rasterized once (see marquee.Marquee) and each
+        scroll step is streamed as a view into it, so the timing is set
+        here rather than by the device's text ``speed``. Requires numpy.
+        
+        Args:
+            panel: Panel number (1-5), or several panels showing the same text
+            text: Single line of ASCII text
+            color: Hex text color (#RRGGBB)
+            background: Hex background color (#RRGGBB)
+            font: Font size tier
+            fps: Scroll steps per second
+            step: Pixels scrolled per step
+            direction: Scroll direction (0=left, 1=right)
+            loops: Passes through the message; None scrolls until cancelled
+            chunk_size: Steps per uploaded animation (see stream())
+            pixel_format: "rgb888" or "rgb565"
+            
+        Returns:
+            Counters of frames received, sent and dropped
+        """
+        from .marquee import Marquee
+        
+        marquee = Marquee(text, color, background, font, step, direction)
+        return await self.stream(panel, marquee.frames(loops), fps, chunk_size, pixel_format)
+    
     async def get_font_list(self) -> List[Dict[str, Any]]:
         """
         Get available fonts.
@@ -489,13 +1113,14 @@ class TimesGateDevice:
         })
         return True
     
-    async def set_scoreboard(self, red_score: int, blue_score: int) -> bool:
+    async def set_scoreboard(self, red_score: int, blue_score: int, force: bool = False) -> bool:
         """
         Display a scoreboard.
         
         Args:
             red_score: Red team score (0-999)
             blue_score: Blue team score (0-999)
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -504,10 +1129,10 @@ class TimesGateDevice:
             "Command": "Tools/SetScoreBoard",
             "RedScore": red_score,
             "BlueScore": blue_score
-        })
+        }, force=force)
         return True
     
-    async def set_panel_scoreboard(self, panel: int, red_score: int, blue_score: int) -> bool:
+    async def set_panel_scoreboard(self, panel: int, red_score: int, blue_score: int, force: bool = False) -> bool:
         """
         Display a scoreboard on a specific panel.
         
@@ -515,6 +1140,7 @@ class TimesGateDevice:
             panel: Panel number (1-5)
             red_score: Red team score (0-999)
             blue_score: Blue team score (0-999)
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -527,7 +1153,7 @@ class TimesGateDevice:
             "RedScore": red_score,
             "BlueScore": blue_score,
             "LcdId": panel
-        })
+        }, force=force)
         return True
     
     async def get_panel_channels(self) -> List[int]:
@@ -542,12 +1168,13 @@ class TimesGateDevice:
         })
         return response.get("SelectIndex", [])
     
-    async def set_noise_meter(self, enabled: bool) -> bool:
+    async def set_noise_meter(self, enabled: bool, force: bool = False) -> bool:
         """
         Enable or disable noise meter.
         
         Args:
             enabled: True to enable
+            force: Send even if the device already has this value
             
         Returns:
             True if successful
@@ -555,7 +1182,7 @@ class TimesGateDevice:
         await self._send_command({
             "Command": "Tools/SetNoiseStatus",
             "Status": 1 if enabled else 0
-        })
+        }, force=force)
         return True
     
     async def play_buzzer(
@@ -601,17 +1228,45 @@ class TimesGateDevice:
         })
         return True
     
-    async def send_raw_command(self, command: Dict[str, Any]) -> Dict[str, Any]:
+    async def send_raw_command(
+        self,
+        command: Dict[str, Any],
+        priority: Optional[Priority] = None
+    ) -> Dict[str, Any]:
         """
         Send a raw command to the device.
         
         Args:
             command: Command dictionary
+            priority: Dispatch lane (default depends on the command)
             
         Returns:
             Response from the device
         """
-        return await self._send_command(command)
+        return await self._send_command(command, priority=priority)
+    
+    async def send_latest(self, command: Dict[str, Any]) -> bool:
+        """
+        Send a high-frequency update, keeping only the newest value.
+        
+        Updates are keyed on (command, LcdId). While one is in flight, newer
+        updates for the same key replace the pending one instead of queueing,
+        so the device always converges on the latest state.
+        
+        Args:
+            command: Command dictionary
+            
+        Returns:
+            True once this value, or a newer one for the same key, was applied
+            
+        Example:
+            for red, blue in score_feed:
+                asyncio.ensure_future(device.send_latest({
+                    "Command": "Tools/SetScoreBoard",
+                    "RedScore": red, "BlueScore": blue, "LcdId": 2
+                }))
+        """
+        return await self._coalescer.submit(command)
     
     async def send_display_list(
         self,
@@ -644,6 +1299,83 @@ class TimesGateDevice:
             "ItemList": item_list
         })
     
+    async def apply_scene(self, scene: "Scene") -> int:
+        """
+        Put a five-panel scene on the device.
+        
+        The scene is compiled once into the fewest Draw/SendHttpItemList or
+        Draw/CommandList requests (see scene.SceneCompiler); applying it
+        again reuses the serialized payloads and only sends them.
+        
+        Args:
+            scene: scene.Scene to show
+            
+        Returns:
+            Number of requests sent
+        """
+        if self._scene_compiler is None:
+            self._scene_compiler = SceneCompiler(self.codec, max_commands=self._batcher.max_size)
+        compiled = self._scene_compiler.compile(scene)
+        for request in compiled.requests:
+            await self._send_command(request, force=True)
+        return len(compiled.requests)
+    
+    @property
+    def display_list_stats(self) -> Dict[str, int]:
+        """Counters of full, partial and skipped display-list pushes."""
+        return self._display_lists.stats if self._display_lists is not None else {}
+    
+    async def update_display_list(
+        self,
+        panel: int,
+        items: Mapping[str, Any],
+        background_gif: str = "http://f.divoom-gz.com/64_64.gif",
+        force: bool = False
+    ) -> int:
+        """
+        Bring a panel's display list up to date, sending only what changed.
+        
+        Items are named; each name keeps its TextId slot (0-19) across
+        updates. Changed items are merged with ``NewFlag=0``; removed items,
+        a new background or a mostly changed list trigger a full
+        ``NewFlag=1`` push (see displaylist.DisplayListManager).
+        
+        Example:
+            await device.update_display_list(1, {
+                "title": TextDisplayItem(0, "Departures", y=0),
+                "next": TextDisplayItem(0, "Bus 12 in 3 min", y=24),
+            })
+        
+        Args:
+            panel: Panel number (1-5)
+            items: Item name -> DisplayItem or item dict (its TextId is
+                replaced by the name's slot)
+            background_gif: Background GIF URL
+            force: Push the full list even if the panel is up to date
+            
+        Returns:
+            Number of items sent (0 if nothing changed)
+        """
+        from .displaylist import DisplayListManager
+        
+        if self._display_lists is None:
+            self._display_lists = DisplayListManager()
+        manager = self._display_lists
+        
+        plan = manager.plan(panel, items, background_gif, force)
+        if plan is None:
+            return 0
+        command, wanted = plan
+        
+        token = manager.begin(panel)
+        manager.own(command)
+        try:
+            await self._send_command(command)
+        finally:
+            manager.disown(command)
+        manager.acknowledge(panel, wanted, background_gif, token)
+        return len(command["ItemList"])
+    
     async def create_text_display(
         self,
         text: str,
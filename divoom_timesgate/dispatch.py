@@ -0,0 +1,224 @@
+"""
+Per-device serialized command dispatch with priority lanes.
+
+The firmware handles one request at a time, so commands for a device are
+sent one after another by a single worker. Urgent commands (alerts, screen
+power) jump ahead of queued bulk uploads such as display lists.
+"""
+
+import asyncio
+import time
+from collections import deque
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+import logging
+
+from .exceptions import TimesGateConnectionError
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Dispatch lanes, most urgent first."""
+    INTERACTIVE = 0
+    NORMAL = 1
+    BULK = 2
+
+
+# Lane used when the caller does not choose one
+COMMAND_PRIORITIES = {
+    "Device/PlayBuzzer": Priority.INTERACTIVE,
+    "Channel/OnOffScreen": Priority.INTERACTIVE,
+    "Draw/SendHttpItemList": Priority.BULK,
+    "Draw/SendHttpGif": Priority.BULK,
+    "Draw/SendHttpText": Priority.BULK,
+}
+
+
+def priority_for(command: Dict[str, Any]) -> Priority:
+    """Default lane of a command (the most urgent member of a CommandList)."""
+    name = command.get("Command")
+    if name == "Draw/CommandList":
+        return min(
+            (priority_for(sub_command) for sub_command in command.get("CommandList", [])),
+            default=Priority.NORMAL
+        )
+    return COMMAND_PRIORITIES.get(name, Priority.NORMAL)
+
+
+class LaneStats:
+    """Queue wait-time counters of one lane."""
+
+    def __init__(self):
+        self.sent = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record(self, wait: float):
+        self.sent += 1
+        self.total_wait += wait
+        self.max_wait = max(self.max_wait, wait)
+
+    def to_dict(self, depth: int) -> Dict[str, Any]:
+        return {
+            "depth": depth,
+            "sent": self.sent,
+            "avg_wait_ms": self.total_wait / self.sent * 1000 if self.sent else 0.0,
+            "max_wait_ms": self.max_wait * 1000
+        }
+
+
+_Item = Tuple[Dict[str, Any], asyncio.Future, float]
+
+
+class CommandDispatcher:
+    """Serializes a device's commands through prioritized, bounded lanes."""
+
+    def __init__(
+        self,
+        send: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+        max_queue: int = 64
+    ):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            send: Coroutine function that sends one command to the device
+            max_queue: Commands queued per lane before submitters must wait
+        """
+        self._send = send
+        self.max_queue = max_queue
+        self._lanes: Dict[Priority, Deque[_Item]] = {priority: deque() for priority in Priority}
+        self._lane_stats = {priority: LaneStats() for priority in Priority}
+        self._space: Optional[Dict[Priority, asyncio.Semaphore]] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._drained: Optional[asyncio.Event] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def depth(self) -> int:
+        """Number of queued commands across all lanes."""
+        return sum(len(lane) for lane in self._lanes.values())
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Queue depth and wait-time metrics per lane."""
+        return {
+            priority.name.lower(): self._lane_stats[priority].to_dict(len(self._lanes[priority]))
+            for priority in Priority
+        }
+
+    def _start(self):
+        """Create the synchronization primitives and the worker task."""
+        if self._space is None:
+            self._space = {priority: asyncio.Semaphore(self.max_queue) for priority in Priority}
+            self._ready = asyncio.Event()
+            self._drained = asyncio.Event()
+            self._drained.set()
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.ensure_future(self._run())
+
+    async def submit(
+        self,
+        command: Dict[str, Any],
+        priority: Optional[Priority] = None
+    ) -> Dict[str, Any]:
+        """
+        Queue a command and wait for its response.
+
+        Waits for room first if the command's lane is full.
+
+        Args:
+            command: Command dictionary
+            priority: Lane to use (default depends on the command)
+
+        Returns:
+            Response from the device
+        """
+        self._start()
+        if priority is None:
+            priority = priority_for(command)
+
+        await self._space[priority].acquire()
+        future = asyncio.get_running_loop().create_future()
+        self._lanes[priority].append((command, future, time.monotonic()))
+        self._drained.clear()
+        self._ready.set()
+        return await future
+
+    def _next(self) -> Optional[Tuple[Priority, _Item]]:
+        """Pop the oldest command of the most urgent non-empty lane."""
+        for priority in Priority:
+            lane = self._lanes[priority]
+            if lane:
+                self._space[priority].release()
+                return priority, lane.popleft()
+        return None
+
+    async def _run(self):
+        """Worker loop: send queued commands one at a time."""
+        while True:
+            entry = self._next()
+            if entry is None:
+                self._drained.set()
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            priority, (command, future, queued_at) = entry
+            if future.done():
+                # Caller gave up while the command was queued
+                continue
+
+            self._lane_stats[priority].record(time.monotonic() - queued_at)
+            # Run the send as its own task so a caller that gives up (e.g. on
+            # a timeout) cancels its request instead of leaving it hanging
+            send = asyncio.ensure_future(self._send(command))
+            future.add_done_callback(lambda done, send=send: done.cancelled() and send.cancel())
+            try:
+                await asyncio.wait([send])
+            except asyncio.CancelledError:
+                # Stopped by close(): abandon the in-flight request too
+                send.cancel()
+                if not future.done():
+                    future.set_exception(TimesGateConnectionError("Device connection closed"))
+                raise
+
+            if future.done():
+                continue
+            if send.cancelled():
+                future.set_exception(TimesGateConnectionError("Request cancelled"))
+            elif send.exception() is not None:
+                future.set_exception(send.exception())
+            else:
+                future.set_result(send.result())
+
+    async def close(self, timeout: Optional[float] = 5.0):
+        """
+        Send everything still queued, then stop the worker.
+
+        Args:
+            timeout: Seconds to wait for the queue to drain; the in-flight
+                request is then cancelled and queued commands fail (None
+                waits indefinitely)
+        """
+        if self._worker is None:
+            return
+
+        if not self._worker.done():
+            try:
+                await asyncio.wait_for(self._drained.wait(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning(f"Commands still pending after {timeout}s; cancelling them")
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        for lane in self._lanes.values():
+            while lane:
+                _, future, _ = lane.popleft()
+                if not future.done():
+                    future.set_exception(TimesGateConnectionError("Device connection closed"))
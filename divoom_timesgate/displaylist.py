@@ -0,0 +1,205 @@
+"""
+Incremental display-list updates.
+
+Draw/SendHttpItemList with ``NewFlag=1`` replaces a panel's whole item
+list; with ``NewFlag=0`` the items sent are merged into it by TextId. The
+DisplayListManager remembers the list last acknowledged on each panel and
+the TextId slot (0-19) given to each named item, so an update sends only
+the items that changed. Removing items, changing the background or
+changing most of the list falls back to a full push.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+from .models import DisplayItem
+from .shadow import DEVICE_SETTINGS, NEUTRAL_COMMANDS
+
+# TextId range accepted by the firmware
+MAX_SLOTS = 20
+
+Item = Union[DisplayItem, Dict[str, Any]]
+
+
+class PanelList:
+    """Acknowledged display list and slot assignments of one panel."""
+
+    def __init__(self):
+        self.slots: Dict[str, int] = {}
+        self.items: Dict[int, Dict[str, Any]] = {}
+        self.background_gif: Optional[str] = None
+        self.generation = 0
+
+
+class DisplayListManager:
+    """Tracks every panel's display list and computes minimal updates."""
+
+    def __init__(self, full_push_ratio: float = 0.5):
+        """
+        Initialize the manager.
+
+        Args:
+            full_push_ratio: Send the whole list instead of a diff once more
+                than this fraction of its items changed
+        """
+        self.full_push_ratio = full_push_ratio
+        self._panels: Dict[int, PanelList] = {}
+        self._owned: Set[int] = set()
+        self.full_pushes = 0
+        self.partial_pushes = 0
+        self.skipped = 0
+        self.items_sent = 0
+        self.items_saved = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Push and item counters."""
+        return {
+            "full_pushes": self.full_pushes,
+            "partial_pushes": self.partial_pushes,
+            "skipped": self.skipped,
+            "items_sent": self.items_sent,
+            "items_saved": self.items_saved
+        }
+
+    def _panel(self, panel: int) -> PanelList:
+        state = self._panels.get(panel)
+        if state is None:
+            state = self._panels[panel] = PanelList()
+        return state
+
+    def _assign(self, state: PanelList, items: Mapping[str, Item]) -> Dict[int, Dict[str, Any]]:
+        """TextId -> item dict, keeping the slots of items that stay."""
+        if len(items) > MAX_SLOTS:
+            raise ValueError(f"A display list holds at most {MAX_SLOTS} items")
+
+        slots = {key: slot for key, slot in state.slots.items() if key in items}
+        free = sorted(set(range(MAX_SLOTS)) - set(slots.values()))
+        wanted = {}
+        for key, item in items.items():
+            if key not in slots:
+                slots[key] = free.pop(0)
+            item = item.to_dict() if isinstance(item, DisplayItem) else dict(item)
+            item["TextId"] = slots[key]
+            wanted[slots[key]] = item
+        state.slots = slots
+        return wanted
+
+    def plan(
+        self,
+        panel: int,
+        items: Mapping[str, Item],
+        background_gif: str,
+        force: bool = False
+    ) -> Optional[Tuple[Dict[str, Any], Dict[int, Dict[str, Any]]]]:
+        """
+        Work out the smallest command bringing a panel to a display list.
+
+        Args:
+            panel: Panel number (1-5)
+            items: Item name -> DisplayItem or item dict; names keep their
+                TextId slot across updates
+            background_gif: Background GIF URL
+            force: Always push the full list
+
+        Returns:
+            The Draw/SendHttpItemList command and the full list (TextId ->
+            item) to acknowledge once it succeeds, or None if the panel is
+            up to date
+        """
+        if not 1 <= panel <= 5:
+            raise ValueError("Panel must be between 1 and 5")
+        state = self._panel(panel)
+        wanted = self._assign(state, items)
+
+        known = state.background_gif is not None
+        changed = [item for slot, item in wanted.items() if state.items.get(slot) != item]
+        removed = set(state.items) - set(wanted)
+        full = (
+            force or not known or bool(removed) or
+            background_gif != state.background_gif or
+            len(changed) > self.full_push_ratio * len(wanted)
+        )
+        if not full and not changed:
+            self.skipped += 1
+            return None
+
+        send = list(wanted.values()) if full else changed
+        if full:
+            self.full_pushes += 1
+        else:
+            self.partial_pushes += 1
+        self.items_sent += len(send)
+        self.items_saved += len(wanted) - len(send)
+
+        # NOTE: The API requires "BackgroudGif" with the typo
+        command = {
+            "Command": "Draw/SendHttpItemList",
+            "LcdIndex": panel,
+            "NewFlag": 1 if full else 0,
+            "BackgroudGif": background_gif,
+            "ItemList": send
+        }
+        return command, wanted
+
+    def begin(self, panel: int) -> int:
+        """
+        Forget a panel's list while an update to it is in flight.
+
+        Returns:
+            Token to pass to acknowledge()
+        """
+        state = self._panel(panel)
+        state.items = {}
+        state.background_gif = None
+        state.generation += 1
+        return state.generation
+
+    def acknowledge(
+        self,
+        panel: int,
+        items: Dict[int, Dict[str, Any]],
+        background_gif: str,
+        generation: int
+    ):
+        """Record an acknowledged list unless the panel was redrawn meanwhile."""
+        state = self._panel(panel)
+        if state.generation == generation:
+            state.items = items
+            state.background_gif = background_gif
+
+    def own(self, command: Dict[str, Any]):
+        """Mark a command as issued by this manager, so observe() ignores it."""
+        self._owned.add(id(command))
+
+    def disown(self, command: Dict[str, Any]):
+        self._owned.discard(id(command))
+
+    def invalidate(self, panels: Optional[List[int]] = None):
+        """Forget the lists of some panels, or of all of them."""
+        for panel in list(self._panels) if panels is None else panels:
+            self.begin(panel)
+
+    def observe(self, command: Dict[str, Any]):
+        """
+        Forget panels a sent command may have redrawn.
+
+        Args:
+            command: Command sent to the device, successfully or not
+        """
+        name = command.get("Command", "")
+        if name == "Draw/CommandList":
+            for sub_command in command.get("CommandList", []):
+                self.observe(sub_command)
+            return
+        if name in NEUTRAL_COMMANDS or name in DEVICE_SETTINGS or "/Get" in name:
+            return
+        if id(command) in self._owned:
+            return
+        lcd_id = command.get("LcdId", command.get("LcdIndex"))
+        lcd_array = command.get("LcdArray")
+        if lcd_array is not None:
+            self.invalidate([index + 1 for index, flag in enumerate(lcd_array) if flag])
+        elif lcd_id is not None:
+            self.invalidate([int(lcd_id)])
+        else:
+            self.invalidate()
@@ -0,0 +1,593 @@
+"""
+Local Times Gate device emulator.
+
+Serves the device's ``/post`` endpoint over HTTP using aiohttp so the client
+can be exercised, benchmarked and regression-tested without real hardware.
+Per-command latency, packet drops, ``error_code`` failures and garbage
+(non-JSON) responses can be injected to reproduce misbehaving firmware.
+"""
+
+import asyncio
+import json
+import random
+import time
+from collections import Counter, deque
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+import logging
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+PANEL_COUNT = 5
+
+# Error code returned for commands the emulator does not know about
+UNKNOWN_COMMAND_ERROR = 1
+
+# Error code returned for request bodies that are not valid JSON
+ILLEGAL_JSON_ERROR = 2
+
+# Error code returned for commands with missing or malformed parameters
+ILLEGAL_PARAMETER_ERROR = 3
+
+Latency = Union[None, float, Tuple[float, float], Callable[[random.Random], float]]
+
+
+class EmulatedHttpError(Exception):
+    """Raised by TimesGateEmulator.respond() to answer with an HTTP error status."""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class FaultProfile:
+    """Latency and fault injection settings for one command."""
+
+    def __init__(
+        self,
+        latency: Latency = None,
+        drop_rate: float = 0.0,
+        drop_mode: str = "reset",
+        error_rate: float = 0.0,
+        error_code: int = 1,
+        garbage_rate: float = 0.0,
+        http_error_rate: float = 0.0,
+        http_status: int = 500
+    ):
+        """
+        Create a fault profile.
+
+        Args:
+            latency: Response delay in seconds. Either a constant, a
+                ``(low, high)`` tuple for a uniform distribution or a
+                callable taking a ``random.Random`` and returning seconds.
+            drop_rate: Probability (0-1) that the request is dropped
+            drop_mode: "reset" closes the connection, "hang" never answers
+            error_rate: Probability (0-1) of answering with ``error_code``
+            error_code: Error code used for injected failures
+            garbage_rate: Probability (0-1) of answering with a non-JSON body
+            http_error_rate: Probability (0-1) of answering with an HTTP error
+            http_status: HTTP status used for injected HTTP errors
+        """
+        if drop_mode not in ("reset", "hang"):
+            raise ValueError("drop_mode must be 'reset' or 'hang'")
+
+        self.latency = latency
+        self.drop_rate = drop_rate
+        self.drop_mode = drop_mode
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.garbage_rate = garbage_rate
+        self.http_error_rate = http_error_rate
+        self.http_status = http_status
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Draw a latency value in seconds."""
+        if self.latency is None:
+            return 0.0
+        if callable(self.latency):
+            return max(0.0, float(self.latency(rng)))
+        if isinstance(self.latency, tuple):
+            low, high = self.latency
+            return rng.uniform(low, high)
+        return float(self.latency)
+
+
+class PanelState:
+    """State of a single emulated LCD panel."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.clock_id = 0
+        self.channel_index = 0
+        self.timer: Optional[Dict[str, int]] = None
+        self.stopwatch = 0
+        self.scoreboard: Optional[Dict[str, int]] = None
+        self.noise_meter = 0
+        self.item_list: List[Dict[str, Any]] = []
+        self.background_gif = ""
+        self.texts: Dict[int, Dict[str, Any]] = {}
+        self.gif: Optional[Dict[str, Any]] = None
+
+
+class EmulatorState:
+    """Whole-device state of the emulator."""
+
+    def __init__(self):
+        self.brightness = 100
+        self.light_switch = 1
+        self.time24_flag = 1
+        self.temperature_mode = 0
+        self.mirror_flag = 0
+        self.timezone = "GMT+0"
+        self.latitude = "0"
+        self.longitude = "0"
+        self.utc_offset = 0
+        self.whole_clock_id = 0
+        self.reboots = 0
+        self.buzzer_plays = 0
+        self.gif_file = ""
+        self.panels = [PanelState(i) for i in range(1, PANEL_COUNT + 1)]
+
+    def panel(self, lcd_id: int) -> PanelState:
+        """Return the state of panel ``lcd_id`` (1-5)."""
+        if not 1 <= lcd_id <= PANEL_COUNT:
+            raise ValueError(f"LCD id must be between 1 and {PANEL_COUNT}, got {lcd_id}")
+        return self.panels[lcd_id - 1]
+
+    def to_config(self) -> Dict[str, Any]:
+        """Build the ``Channel/GetAllConf`` response body."""
+        return {
+            "error_code": 0,
+            "Brightness": self.brightness,
+            "RotationFlag": 0,
+            "ClockTime": 60,
+            "GalleryTime": 60,
+            "SingleGalleyTime": 5,
+            "PowerOnChannelId": 0,
+            "GalleryShowTimeFlag": 0,
+            "CurClockId": self.whole_clock_id,
+            "Time24Flag": self.time24_flag,
+            "TemperatureMode": self.temperature_mode,
+            "GyrateAngle": 0,
+            "MirrorFlag": self.mirror_flag,
+            "LightSwitch": self.light_switch
+        }
+
+
+class EmulatorStats:
+    """Counters collected while the emulator runs."""
+
+    def __init__(self, history_size: int = 1000):
+        self.requests = 0
+        self.commands: Counter = Counter()
+        self.dropped = 0
+        self.errors = 0
+        self.garbage = 0
+        self.http_errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.bytes_received = 0
+        self.history: deque = deque(maxlen=history_size)
+
+    def reset(self):
+        """Clear all counters."""
+        self.__init__(self.history.maxlen)
+
+
+class TimesGateEmulator:
+    """In-process HTTP stand-in for a Times Gate device."""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        serialize: bool = True,
+        seed: Optional[int] = None,
+        default_profile: Optional[FaultProfile] = None
+    ):
+        """
+        Initialize the emulator.
+
+        Args:
+            host: Interface to listen on
+            port: TCP port (0 picks a free port)
+            serialize: Handle one request at a time like the real firmware
+            seed: Seed for the fault injection random generator
+            default_profile: Fault profile for commands without their own
+        """
+        self.host = host
+        self.port = port
+        self.serialize = serialize
+        self.state = EmulatorState()
+        self.stats = EmulatorStats()
+        self._rng = random.Random(seed)
+        self._default_profile = default_profile or FaultProfile()
+        self._profiles: Dict[str, FaultProfile] = {}
+        # Created on first use, inside the loop that serves the requests
+        self._lock: Optional[asyncio.Lock] = None
+        self._runner: Optional[web.AppRunner] = None
+        self._stopping: Optional[asyncio.Event] = None
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+            "Channel/SetBrightness": self._set_brightness,
+            "Channel/GetAllConf": self._get_all_conf,
+            "Channel/OnOffScreen": self._on_off_screen,
+            "Channel/GetCurChannelInfo": self._get_channel_info,
+            "Channel/SetWholeDial": self._set_whole_dial,
+            "Channel/SetIndividualDial": self._set_individual_dial,
+            "Channel/GetWholeDial": self._get_whole_dial,
+            "Channel/GetIndex": self._get_index,
+            "Device/SetUTC": self._set_utc,
+            "Device/GetDeviceTime": self._get_device_time,
+            "Device/SetDisTempMode": self._set_temp_mode,
+            "Device/SetMirrorMode": self._set_mirror_mode,
+            "Device/SetTime24Flag": self._set_time24_flag,
+            "Device/Reboot": self._reboot,
+            "Device/PlayTFGif": self._play_tf_gif,
+            "Device/GetFontList": self._get_font_list,
+            "Device/PlayBuzzer": self._play_buzzer,
+            "Sys/TimeZone": self._set_timezone,
+            "Sys/LogAndLat": self._set_location,
+            "Draw/SendHttpText": self._send_http_text,
+            "Draw/ClearHttpText": self._clear_http_text,
+            "Draw/SendHttpItemList": self._send_item_list,
+            "Draw/SendHttpGif": self._send_http_gif,
+            "Draw/CommandList": self._command_list,
+            "Tools/SetTimer": self._set_timer,
+            "Tools/SetStopWatch": self._set_stopwatch,
+            "Tools/SetScoreBoard": self._set_scoreboard,
+            "Tools/SetNoiseStatus": self._set_noise_status,
+        }
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.stop()
+
+    @property
+    def ip_address(self) -> str:
+        """Address clients should connect to."""
+        return self.host
+
+    @property
+    def base_url(self) -> str:
+        """Full URL of the emulated ``/post`` endpoint."""
+        return f"http://{self.host}:{self.port}/post"
+
+    def configure(self, command: Optional[str] = None, **kwargs) -> FaultProfile:
+        """
+        Set the fault profile for a command.
+
+        Args:
+            command: Command name (e.g. "Channel/SetBrightness"), or None to
+                change the default profile used by all other commands
+            **kwargs: FaultProfile arguments
+
+        Returns:
+            The installed profile
+        """
+        profile = FaultProfile(**kwargs)
+        if command is None:
+            self._default_profile = profile
+        else:
+            self._profiles[command] = profile
+        return profile
+
+    def profile_for(self, command: str) -> FaultProfile:
+        """Return the fault profile in effect for a command."""
+        return self._profiles.get(command, self._default_profile)
+
+    def create_device(self, **kwargs):
+        """
+        Create a TimesGateDevice pointed at this emulator.
+
+        Args:
+            **kwargs: Extra TimesGateDevice arguments
+        """
+        from .device import TimesGateDevice
+
+        return TimesGateDevice(self.host, self.port, **kwargs)
+
+    async def start(self):
+        """Start serving requests."""
+        if self._runner:
+            return
+
+        self._stopping = asyncio.Event()
+        app = web.Application()
+        app.router.add_post("/post", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        logger.debug(f"Emulator listening on {self.base_url}")
+
+    async def stop(self):
+        """Stop serving requests."""
+        if self._runner:
+            self._stopping.set()
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        """Handle one HTTP request to ``/post``."""
+        try:
+            data = await self.respond(await request.read())
+        except EmulatedHttpError as e:
+            return web.Response(status=e.status, text=str(e), content_type="text/html")
+        if data is None:
+            if request.transport is not None:
+                request.transport.close()
+            raise asyncio.CancelledError()
+        return web.Response(body=data, content_type="text/html")
+
+    async def respond(self, body: bytes) -> Optional[bytes]:
+        """
+        Answer one raw request body the way the firmware would.
+
+        Used by the HTTP server and by in-process loopback transports.
+
+        Args:
+            body: Request body
+
+        Returns:
+            Response body, or None if the request was dropped
+
+        Raises:
+            EmulatedHttpError: When an HTTP error is injected
+        """
+        self.stats.requests += 1
+        self.stats.bytes_received += len(body)
+
+        if self.serialize:
+            if self._lock is None:
+                self._lock = asyncio.Lock()
+            async with self._lock:
+                return await self._process(body)
+        return await self._process(body)
+
+    async def _process(self, body: bytes) -> Optional[bytes]:
+        """Apply latency and faults, then execute the command."""
+        self.stats.in_flight += 1
+        self.stats.max_in_flight = max(self.stats.max_in_flight, self.stats.in_flight)
+        try:
+            try:
+                command = json.loads(body)
+            except ValueError:
+                return self._reply({"error_code": ILLEGAL_JSON_ERROR})
+            if not isinstance(command, dict):
+                return self._reply({"error_code": ILLEGAL_JSON_ERROR})
+
+            name = command.get("Command", "")
+            profile = self.profile_for(name)
+            self.stats.history.append((time.monotonic(), name))
+
+            delay = profile.sample_latency(self._rng)
+            if delay:
+                await asyncio.sleep(delay)
+
+            if profile.drop_rate and self._rng.random() < profile.drop_rate:
+                self.stats.dropped += 1
+                if profile.drop_mode == "hang":
+                    if self._stopping is None:
+                        self._stopping = asyncio.Event()
+                    await self._stopping.wait()
+                return None
+
+            if profile.http_error_rate and self._rng.random() < profile.http_error_rate:
+                self.stats.http_errors += 1
+                raise EmulatedHttpError(profile.http_status)
+
+            if profile.garbage_rate and self._rng.random() < profile.garbage_rate:
+                self.stats.garbage += 1
+                return b"<html><body>busy</body></html>"
+
+            if profile.error_rate and self._rng.random() < profile.error_rate:
+                self.stats.errors += 1
+                return self._reply({"error_code": profile.error_code})
+
+            return self._reply(self.execute(command))
+        finally:
+            self.stats.in_flight -= 1
+
+    def _reply(self, data: Dict[str, Any]) -> bytes:
+        """Encode a response the way the firmware does."""
+        return json.dumps(data).encode()
+
+    def execute(self, command: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Apply a command to the emulated state.
+
+        Args:
+            command: Command dictionary
+
+        Returns:
+            Response body
+        """
+        if not isinstance(command, dict):
+            return {"error_code": ILLEGAL_JSON_ERROR}
+        name = command.get("Command", "")
+        self.stats.commands[name] += 1
+
+        handler = self._handlers.get(name)
+        if handler is None:
+            return {"error_code": UNKNOWN_COMMAND_ERROR}
+
+        try:
+            response = handler(command)
+        except (KeyError, TypeError, ValueError) as e:
+            logger.debug(f"Rejecting {name} with bad parameters: {e!r}")
+            return {"error_code": ILLEGAL_PARAMETER_ERROR}
+        if response is None:
+            response = {"error_code": 0}
+        return response
+
+    def _target_panels(self, command: Dict[str, Any], key: str = "LcdId") -> List[PanelState]:
+        """Panels addressed by a command (all panels without an LCD id)."""
+        lcd_id = command.get(key)
+        if lcd_id is None:
+            return self.state.panels
+        return [self.state.panel(int(lcd_id))]
+
+    # Command handlers
+
+    def _set_brightness(self, command):
+        self.state.brightness = int(command["Brightness"])
+
+    def _get_all_conf(self, command):
+        return self.state.to_config()
+
+    def _on_off_screen(self, command):
+        self.state.light_switch = int(command["OnOff"])
+
+    def _get_channel_info(self, command):
+        return {
+            "error_code": 0,
+            "ClockId": self.state.whole_clock_id,
+            "LcdClockId": [panel.clock_id for panel in self.state.panels]
+        }
+
+    def _set_whole_dial(self, command):
+        self.state.whole_clock_id = int(command["ClockId"])
+        for panel in self.state.panels:
+            panel.clock_id = self.state.whole_clock_id
+
+    def _set_individual_dial(self, command):
+        self.state.panel(int(command["LcdId"])).clock_id = int(command["ClockId"])
+
+    def _get_whole_dial(self, command):
+        return {
+            "error_code": 0,
+            "ClockList": [
+                {"ClockId": clock_id, "Name": f"Dial {clock_id}"}
+                for clock_id in range(10)
+            ]
+        }
+
+    def _get_index(self, command):
+        return {
+            "error_code": 0,
+            "SelectIndex": [panel.channel_index for panel in self.state.panels]
+        }
+
+    def _set_utc(self, command):
+        self.state.utc_offset = int(command["Utc"]) - int(time.time())
+
+    def _get_device_time(self, command):
+        utc = int(time.time()) + self.state.utc_offset
+        return {
+            "error_code": 0,
+            "UTCTime": utc,
+            "LocalTime": datetime.fromtimestamp(utc).strftime("%Y-%m-%d %H:%M:%S")
+        }
+
+    def _set_temp_mode(self, command):
+        self.state.temperature_mode = int(command["Mode"])
+
+    def _set_mirror_mode(self, command):
+        self.state.mirror_flag = int(command["Mode"])
+
+    def _set_time24_flag(self, command):
+        self.state.time24_flag = int(command["Mode"])
+
+    def _reboot(self, command):
+        self.state.reboots += 1
+
+    def _play_tf_gif(self, command):
+        self.state.gif_file = command.get("FileName", "")
+
+    def _get_font_list(self, command):
+        return {
+            "error_code": 0,
+            "FontList": [
+                {"id": font_id, "name": name, "height": height}
+                for font_id, (name, height) in enumerate(
+                    [("tiny", 5), ("small", 8), ("medium", 11), ("large", 14), ("huge", 16)]
+                )
+            ]
+        }
+
+    def _play_buzzer(self, command):
+        self.state.buzzer_plays += 1
+
+    def _set_timezone(self, command):
+        self.state.timezone = command["TimeZoneValue"]
+
+    def _set_location(self, command):
+        self.state.latitude = command["Latitude"]
+        self.state.longitude = command["Longitude"]
+
+    def _send_http_text(self, command):
+        for panel in self._target_panels(command, "LcdIndex"):
+            panel.texts[int(command.get("TextId", 0))] = dict(command)
+
+    def _clear_http_text(self, command):
+        text_id = int(command.get("TextId", -1))
+        for panel in self._target_panels(command, "LcdIndex"):
+            if text_id == -1:
+                panel.texts.clear()
+            else:
+                panel.texts.pop(text_id, None)
+
+    def _send_item_list(self, command):
+        panel = self.state.panel(int(command.get("LcdIndex", 1)))
+        panel.background_gif = command.get("BackgroudGif", "")
+        items = list(command.get("ItemList", []))
+        if int(command.get("NewFlag", 1)):
+            panel.item_list = items
+        else:
+            by_id = {item.get("TextId"): item for item in panel.item_list}
+            for item in items:
+                by_id[item.get("TextId")] = item
+            panel.item_list = list(by_id.values())
+
+    def _send_http_gif(self, command):
+        lcd_array = command.get("LcdArray", [1] * PANEL_COUNT)
+        for flag, panel in zip(lcd_array, self.state.panels):
+            if not flag:
+                continue
+            gif = panel.gif
+            if gif is None or gif["PicID"] != command["PicID"]:
+                gif = panel.gif = {
+                    "PicID": command["PicID"],
+                    "PicNum": command["PicNum"],
+                    "PicSpeed": command.get("PicSpeed", 100),
+                    "Frames": {}
+                }
+            gif["Frames"][int(command["PicOffset"])] = command["PicData"]
+
+    def _command_list(self, command):
+        for sub_command in command.get("CommandList", []):
+            response = self.execute(sub_command)
+            if response.get("error_code", 0) != 0:
+                return {"error_code": response["error_code"]}
+
+    def _set_timer(self, command):
+        for panel in self._target_panels(command):
+            panel.timer = {
+                "Minute": int(command["Minute"]),
+                "Second": int(command["Second"]),
+                "Status": int(command["Status"])
+            }
+
+    def _set_stopwatch(self, command):
+        for panel in self._target_panels(command):
+            panel.stopwatch = int(command["Status"])
+
+    def _set_scoreboard(self, command):
+        for panel in self._target_panels(command):
+            panel.scoreboard = {
+                "RedScore": int(command["RedScore"]),
+                "BlueScore": int(command["BlueScore"])
+            }
+
+    def _set_noise_status(self, command):
+        for panel in self._target_panels(command):
+            panel.noise_meter = int(command["Status"])
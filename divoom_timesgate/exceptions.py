@@ -15,4 +15,9 @@ class TimesGateConnectionError(TimesGateError):
 
 class TimesGateCommandError(TimesGateError):
     """Raised when a command fails."""
-    pass 
\ No newline at end of file
+    pass
+
+
+class TimesGateCircuitOpenError(TimesGateConnectionError):
+    """Raised without contacting the device while its circuit breaker is open."""
+    pass
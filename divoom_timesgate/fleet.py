@@ -0,0 +1,243 @@
+"""
+Concurrent control of many Times Gate devices.
+"""
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+import logging
+
+from .device import TimesGateDevice
+from .exceptions import TimesGateConnectionError
+from .transport import AiohttpTransport
+
+logger = logging.getLogger(__name__)
+
+FleetAction = Union[str, Callable[[TimesGateDevice], Awaitable[Any]]]
+
+
+def device_address(device: TimesGateDevice) -> str:
+    """Address used to identify a device in fleet results."""
+    if device.port == 80:
+        return device.ip_address
+    return f"{device.ip_address}:{device.port}"
+
+
+class FleetResult:
+    """Outcome of one fleet operation on one device."""
+
+    def __init__(
+        self,
+        device: TimesGateDevice,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+        elapsed: float = 0.0
+    ):
+        self.device = device
+        self.result = result
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def address(self) -> str:
+        """Address of the device."""
+        return device_address(self.device)
+
+    @property
+    def ok(self) -> bool:
+        """True if the operation succeeded."""
+        return self.error is None
+
+    def __repr__(self) -> str:
+        outcome = f"error={self.error!r}" if self.error else f"result={self.result!r}"
+        return f"<FleetResult {self.address} {outcome} {self.elapsed * 1000:.1f}ms>"
+
+
+class FleetStream:
+    """
+    Results of a fleet operation, yielded as devices complete.
+
+    Leaving the stream early (e.g. with ``break``) does not stop the
+    remaining devices by itself; use it as an async context manager, or
+    call aclose(), to cancel and reap them:
+
+        async with fleet.stream("set_brightness", 30) as results:
+            async for result in results:
+                if not result.ok:
+                    break
+    """
+
+    def __init__(self, tasks: List["asyncio.Future"]):
+        self._tasks = tasks
+        self._completed = iter(asyncio.as_completed(tasks))
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> FleetResult:
+        try:
+            next_done = next(self._completed)
+        except StopIteration:
+            raise StopAsyncIteration
+        return await next_done
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.aclose()
+
+    async def aclose(self):
+        """Cancel the devices that have not finished and wait for them."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
+class TimesGateFleet:
+    """Run TimesGateDevice operations against many devices concurrently."""
+
+    def __init__(
+        self,
+        devices: Iterable[Union[str, TimesGateDevice]],
+        concurrency: Optional[int] = None,
+        timeout: Optional[float] = 10.0,
+        **device_kwargs
+    ):
+        """
+        Initialize a fleet.
+
+        Args:
+            devices: IP addresses or TimesGateDevice instances; instances
+                passed in stay open when the fleet closes
+            concurrency: Maximum number of devices driven at the same time.
+                None drives every device at once, so a fleet-wide command
+                takes about one round trip; set a bound to cap open sockets
+                on very large fleets, at one extra round trip per batch
+            timeout: Per-device timeout in seconds (None for no timeout)
+            **device_kwargs: Extra arguments for devices created from addresses.
+                Unless a ``transport`` is given, those devices share one
+                connection pool owned by the fleet.
+        """
+        if concurrency is not None and concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+
+        self._transport: Optional[AiohttpTransport] = None
+        if "transport" not in device_kwargs:
+            self._transport = AiohttpTransport()
+            device_kwargs["transport"] = self._transport
+
+        self.devices: List[TimesGateDevice] = []
+        self._owned: List[TimesGateDevice] = []
+        addresses = set()
+        for device in devices:
+            if not isinstance(device, TimesGateDevice):
+                device = TimesGateDevice(device, **device_kwargs)
+                self._owned.append(device)
+            address = device_address(device)
+            if address in addresses:
+                raise ValueError(f"Device {address} is in the fleet more than once")
+            addresses.add(address)
+            self.devices.append(device)
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    def __len__(self) -> int:
+        return len(self.devices)
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    async def connect(self):
+        """Initialize every device's HTTP session."""
+        await asyncio.gather(*(device.connect() for device in self.devices))
+
+    async def close(self):
+        """Close the devices the fleet created from addresses."""
+        await asyncio.gather(
+            *(device.close() for device in self._owned),
+            return_exceptions=True
+        )
+        if self._transport is not None:
+            await self._transport.close()
+
+    async def _run_one(
+        self,
+        device: TimesGateDevice,
+        action: FleetAction,
+        args: tuple,
+        kwargs: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> FleetResult:
+        """Run an action on one device, capturing its result or error."""
+        async with semaphore:
+            start = time.perf_counter()
+            if isinstance(action, str):
+                coro = getattr(device, action)(*args, **kwargs)
+            else:
+                coro = action(device, *args, **kwargs)
+
+            try:
+                result = await asyncio.wait_for(coro, self.timeout)
+            except asyncio.TimeoutError:
+                error = TimesGateConnectionError(
+                    f"Device {device_address(device)} timed out after {self.timeout}s"
+                )
+                return FleetResult(device, error=error, elapsed=time.perf_counter() - start)
+            except Exception as e:
+                return FleetResult(device, error=e, elapsed=time.perf_counter() - start)
+            return FleetResult(device, result=result, elapsed=time.perf_counter() - start)
+
+    def stream(self, action: FleetAction, *args, **kwargs) -> FleetStream:
+        """
+        Start an action on every device and return its results as they complete.
+
+        Iterate the stream with ``async for``. To stop early, leave it
+        inside ``async with`` (or call ``aclose()``), which cancels the
+        devices still running; see FleetStream.
+
+        Args:
+            action: Name of a TimesGateDevice method (e.g. "set_brightness")
+                or a coroutine function taking the device as first argument
+            *args: Positional arguments for the action
+            **kwargs: Keyword arguments for the action
+
+        Returns:
+            FleetStream of one FleetResult per device, fastest first
+        """
+        if isinstance(action, str) and not callable(getattr(TimesGateDevice, action, None)):
+            raise AttributeError(f"TimesGateDevice has no method {action!r}")
+
+        semaphore = asyncio.Semaphore(self.concurrency or max(1, len(self.devices)))
+        return FleetStream([
+            asyncio.ensure_future(self._run_one(device, action, args, kwargs, semaphore))
+            for device in self.devices
+        ])
+
+    async def run(self, action: FleetAction, *args, **kwargs) -> Dict[str, FleetResult]:
+        """
+        Run an action on every device and collect all results.
+
+        Args:
+            action: Name of a TimesGateDevice method or a coroutine function
+            *args: Positional arguments for the action
+            **kwargs: Keyword arguments for the action
+
+        Returns:
+            Dictionary mapping device address to FleetResult
+        """
+        results = {}
+        async with self.stream(action, *args, **kwargs) as stream:
+            async for result in stream:
+                results[result.address] = result
+
+        failed = sum(1 for result in results.values() if not result.ok)
+        if failed:
+            logger.warning(f"{failed} of {len(results)} devices failed")
+        return results
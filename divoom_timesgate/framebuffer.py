@@ -0,0 +1,444 @@
+"""
+NumPy-backed frames for the Times Gate's 64x64 LCD panels.
+
+Frames wrap an ``(height, width, 3)`` uint8 RGB array and draw with
+vectorized slicing instead of per-pixel loops. ``encode_frames`` packs a
+whole batch into the base64 ``PicData`` strings used by Draw/SendHttpGif.
+
+Requires numpy (``pip install divoom-timesgate[frames]``).
+"""
+
+import base64
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "divoom_timesgate.framebuffer requires numpy; install divoom-timesgate[frames]"
+    ) from e
+
+from .shadow import DEVICE_SETTINGS, NEUTRAL_COMMANDS
+
+# Width and height of one LCD panel in pixels
+PANEL_SIZE = 64
+
+# PicData pixel formats
+RGB888 = "rgb888"
+RGB565 = "rgb565"
+
+Color = Union[str, Sequence[int]]
+
+
+def parse_color(color: Color) -> Tuple[int, int, int]:
+    """
+    Convert a color to an RGB tuple.
+
+    Args:
+        color: Hex string ("#RRGGBB") or (r, g, b) sequence
+
+    Returns:
+        (r, g, b) tuple of 0-255 ints
+    """
+    if isinstance(color, str):
+        value = color.lstrip("#")
+        if len(value) != 6:
+            raise ValueError(f"Invalid color: {color!r}")
+        return (int(value[0:2], 16), int(value[2:4], 16), int(value[4:6], 16))
+
+    r, g, b = color
+    if not all(0 <= c <= 255 for c in (r, g, b)):
+        raise ValueError(f"Invalid color: {color!r}")
+    return (int(r), int(g), int(b))
+
+
+class Frame:
+    """An RGB image, by default the size of one panel."""
+
+    def __init__(self, width: int = PANEL_SIZE, height: int = PANEL_SIZE, pixels=None):
+        """
+        Initialize a frame.
+
+        Args:
+            width: Width in pixels (ignored if ``pixels`` is given)
+            height: Height in pixels (ignored if ``pixels`` is given)
+            pixels: Existing ``(height, width, 3)`` uint8 array to draw into;
+                it is used as-is, so views of a larger buffer stay shared
+        """
+        if pixels is None:
+            pixels = np.zeros((height, width, 3), dtype=np.uint8)
+        elif pixels.ndim != 3 or pixels.shape[2] != 3 or pixels.dtype != np.uint8:
+            raise ValueError("Pixels must be a (height, width, 3) uint8 array")
+        self.pixels = pixels
+
+    @classmethod
+    def from_array(cls, array) -> "Frame":
+        """
+        Create a frame from any RGB array-like, copying and converting it.
+
+        Args:
+            array: ``(height, width, 3)`` array of 0-255 values
+        """
+        return cls(pixels=np.array(array, dtype=np.uint8, copy=True))
+
+    @property
+    def width(self) -> int:
+        return self.pixels.shape[1]
+
+    @property
+    def height(self) -> int:
+        return self.pixels.shape[0]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Frame):
+            return NotImplemented
+        return self.pixels.shape == other.pixels.shape and np.array_equal(self.pixels, other.pixels)
+
+    def __repr__(self) -> str:
+        return f"Frame({self.width}x{self.height})"
+
+    def copy(self) -> "Frame":
+        """Independent copy of the frame."""
+        return Frame(pixels=self.pixels.copy())
+
+    def clear(self) -> "Frame":
+        """Fill the frame with black."""
+        self.pixels[...] = 0
+        return self
+
+    def fill(self, color: Color) -> "Frame":
+        """Fill the whole frame with one color."""
+        self.pixels[...] = parse_color(color)
+        return self
+
+    def rect(self, x: int, y: int, width: int, height: int, color: Color, fill: bool = True) -> "Frame":
+        """
+        Draw a rectangle, clipped to the frame.
+
+        Args:
+            x: Left edge
+            y: Top edge
+            width: Width in pixels
+            height: Height in pixels
+            color: Rectangle color
+            fill: Fill the rectangle; otherwise draw a one-pixel outline
+        """
+        if width <= 0 or height <= 0:
+            return self
+
+        rgb = parse_color(color)
+        if fill:
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + width, self.width), min(y + height, self.height)
+            if x0 < x1 and y0 < y1:
+                self.pixels[y0:y1, x0:x1] = rgb
+            return self
+
+        right, bottom = x + width - 1, y + height - 1
+        self.line(x, y, right, y, rgb)
+        self.line(x, bottom, right, bottom, rgb)
+        self.line(x, y, x, bottom, rgb)
+        self.line(right, y, right, bottom, rgb)
+        return self
+
+    def line(self, x0: int, y0: int, x1: int, y1: int, color: Color) -> "Frame":
+        """
+        Draw a one-pixel line between two points (inclusive), clipped to the frame.
+
+        Args:
+            x0: Start column
+            y0: Start row
+            x1: End column
+            y1: End row
+            color: Line color
+        """
+        steps = max(abs(x1 - x0), abs(y1 - y0)) + 1
+        xs = np.rint(np.linspace(x0, x1, steps)).astype(np.intp)
+        ys = np.rint(np.linspace(y0, y1, steps)).astype(np.intp)
+        inside = (xs >= 0) & (xs < self.width) & (ys >= 0) & (ys < self.height)
+        self.pixels[ys[inside], xs[inside]] = parse_color(color)
+        return self
+
+    def text(self, text: str, x: int, y: int, color: Color, size: int = 1) -> "Frame":
+        """
+        Draw a line of text with a bundled bitmap font (see text.draw_text).
+
+        Args:
+            text: Single line of ASCII text
+            x: Left edge
+            y: Top edge of the line
+            color: Text color
+            size: FontSize tier (default SMALL)
+        """
+        from .text import draw_text
+        return draw_text(self, text, x, y, color, size)
+
+    def blit(self, source: Union["Frame", "np.ndarray"], x: int = 0, y: int = 0) -> "Frame":
+        """
+        Copy another image onto this frame, clipped to the frame.
+
+        Args:
+            source: Frame or ``(height, width, 3)`` uint8 array
+            x: Destination column of the source's left edge
+            y: Destination row of the source's top edge
+        """
+        pixels = source.pixels if isinstance(source, Frame) else source
+        height, width = pixels.shape[:2]
+
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + width, self.width), min(y + height, self.height)
+        if x0 < x1 and y0 < y1:
+            self.pixels[y0:y1, x0:x1] = pixels[y0 - y:y1 - y, x0 - x:x1 - x]
+        return self
+
+
+class Canvas(Frame):
+    """A row of panels drawn as one wide frame.
+
+    The canvas owns a single ``(64, 64 * panels, 3)`` array; ``panel()``
+    returns 64x64 frames that are views into it, so drawing across panel
+    borders and uploading per panel never copies pixels.
+    """
+
+    def __init__(self, panels: int = 5, pixels=None):
+        """
+        Initialize a canvas.
+
+        Args:
+            panels: Number of side-by-side panels, panel 1 on the left
+            pixels: Existing ``(64, 64 * panels, 3)`` uint8 array to draw into
+        """
+        if pixels is not None:
+            panels = pixels.shape[1] // PANEL_SIZE
+        super().__init__(PANEL_SIZE * panels, PANEL_SIZE, pixels)
+        if self.pixels.shape[:2] != (PANEL_SIZE, PANEL_SIZE * panels):
+            raise ValueError(f"Canvas pixels must be {PANEL_SIZE * panels}x{PANEL_SIZE} RGB")
+        self._panels = tuple(
+            Frame(pixels=self.pixels[:, i * PANEL_SIZE:(i + 1) * PANEL_SIZE])
+            for i in range(panels)
+        )
+
+    def __repr__(self) -> str:
+        return f"Canvas({len(self._panels)} panels)"
+
+    def copy(self) -> "Canvas":
+        """Independent copy of the canvas."""
+        return Canvas(pixels=self.pixels.copy())
+
+    def panel(self, panel: int) -> Frame:
+        """
+        Frame viewing one panel's slice of the canvas.
+
+        Args:
+            panel: Panel number (1-based, left to right)
+        """
+        if not 1 <= panel <= len(self._panels):
+            raise ValueError(f"Panel must be between 1 and {len(self._panels)}")
+        return self._panels[panel - 1]
+
+    def panel_frames(self) -> Dict[int, Frame]:
+        """Panel number -> view of its slice, as taken by send_panel_frames()."""
+        return {index + 1: frame for index, frame in enumerate(self._panels)}
+
+
+def as_pixels(frame: Union[Frame, "np.ndarray"]) -> "np.ndarray":
+    """
+    uint8 pixel array of a 64x64 panel frame, validating its shape.
+
+    Arrays of other numeric types are rounded and clipped to 0-255.
+    """
+    pixels = frame.pixels if isinstance(frame, Frame) else np.asarray(frame)
+    if pixels.shape != (PANEL_SIZE, PANEL_SIZE, 3):
+        raise ValueError(f"Frames must be {PANEL_SIZE}x{PANEL_SIZE} RGB, got {pixels.shape}")
+    if pixels.dtype != np.uint8:
+        if pixels.dtype.kind not in "biuf":
+            raise ValueError(f"Frames must hold numeric pixel values, got {pixels.dtype}")
+        if pixels.dtype.kind == "f":
+            pixels = np.rint(pixels)
+        pixels = np.clip(pixels, 0, 255).astype(np.uint8)
+    return pixels
+
+
+def _stack(frames: Iterable[Union[Frame, "np.ndarray"]]) -> "np.ndarray":
+    """Stack frames into one contiguous ``(count, 64, 64, 3)`` array."""
+    if isinstance(frames, np.ndarray) and frames.ndim == 4:
+        # Already a batch (e.g. a memory-mapped panel strip): one gather copy
+        if frames.shape[1:] != (PANEL_SIZE, PANEL_SIZE, 3):
+            raise ValueError(f"Frames must be {PANEL_SIZE}x{PANEL_SIZE} RGB, got {frames.shape[1:]}")
+        return np.ascontiguousarray(frames, dtype=np.uint8)
+    arrays = [as_pixels(frame) for frame in frames]
+    if not arrays:
+        return np.empty((0, PANEL_SIZE, PANEL_SIZE, 3), dtype=np.uint8)
+    return np.ascontiguousarray(np.stack(arrays), dtype=np.uint8)
+
+
+def encoded_size(pixel_format: str = RGB888) -> int:
+    """Length of one frame's base64 ``PicData`` string."""
+    bytes_per_pixel = {RGB888: 3, RGB565: 2}.get(pixel_format)
+    if bytes_per_pixel is None:
+        raise ValueError(f"Unknown pixel format: {pixel_format!r}")
+    return (PANEL_SIZE * PANEL_SIZE * bytes_per_pixel + 2) // 3 * 4
+
+
+def encode_frames(
+    frames: Iterable[Union[Frame, "np.ndarray"]],
+    pixel_format: str = RGB888,
+    quantizer: Any = None
+) -> List[str]:
+    """
+    Encode panel frames to Draw/SendHttpGif ``PicData`` strings.
+
+    Args:
+        frames: 64x64 frames or RGB arrays
+        pixel_format: RGB888 (3 bytes per pixel) or RGB565 (2 bytes per
+            pixel, little-endian)
+        quantizer: Optional quantize.Quantizer applied to the batch first
+
+    Returns:
+        One base64 string per frame
+    """
+    stack = _stack(frames)
+    count = len(stack)
+    if count == 0:
+        return []
+    if quantizer is not None:
+        stack = quantizer.apply(stack)
+
+    if pixel_format == RGB888:
+        # A frame is 12288 bytes, a multiple of 3, so encoding the whole
+        # batch at once splits cleanly into per-frame base64 strings
+        encoded = base64.b64encode(stack.tobytes()).decode("ascii")
+        size = len(encoded) // count
+        return [encoded[i * size:(i + 1) * size] for i in range(count)]
+
+    if pixel_format == RGB565:
+        channels = stack.astype(np.uint16)
+        packed = ((channels[..., 0] >> 3) << 11) | ((channels[..., 1] >> 2) << 5) | (channels[..., 2] >> 3)
+        data = packed.astype("<u2")
+        return [base64.b64encode(frame.tobytes()).decode("ascii") for frame in data]
+
+    raise ValueError(f"Unknown pixel format: {pixel_format!r}")
+
+
+def decode_frame(data: str, pixel_format: str = RGB888) -> Frame:
+    """
+    Decode one ``PicData`` string back into a frame.
+
+    Args:
+        data: Base64 frame data
+        pixel_format: Format the data was encoded with
+
+    Returns:
+        The decoded frame (RGB565 data loses its low bits)
+    """
+    raw = base64.b64decode(data)
+    if pixel_format == RGB888:
+        pixels = np.frombuffer(raw, dtype=np.uint8).reshape(PANEL_SIZE, PANEL_SIZE, 3)
+        return Frame(pixels=pixels.copy())
+
+    if pixel_format == RGB565:
+        packed = np.frombuffer(raw, dtype="<u2").reshape(PANEL_SIZE, PANEL_SIZE)
+        pixels = np.empty((PANEL_SIZE, PANEL_SIZE, 3), dtype=np.uint8)
+        pixels[..., 0] = (packed >> 11) << 3
+        pixels[..., 1] = ((packed >> 5) & 0x3F) << 2
+        pixels[..., 2] = (packed & 0x1F) << 3
+        return Frame(pixels=pixels)
+
+    raise ValueError(f"Unknown pixel format: {pixel_format!r}")
+
+
+def _panels_of(command: Dict[str, Any]) -> Optional[List[int]]:
+    """Panels a command draws on, or None for all of them."""
+    lcd_array = command.get("LcdArray")
+    if lcd_array is not None:
+        return [index + 1 for index, flag in enumerate(lcd_array) if flag]
+    lcd_id = command.get("LcdId", command.get("LcdIndex"))
+    return [int(lcd_id)] if lcd_id is not None else None
+
+
+class FrameShadow:
+    """Last acknowledged static frame of every panel.
+
+    Frames are compared with a vectorized equality check, so an unchanged
+    panel is never re-encoded or re-uploaded. Any other command that draws
+    on a panel makes its shadow unknown again.
+    """
+
+    def __init__(self):
+        self._frames: Dict[int, "np.ndarray"] = {}
+        self._generations: Dict[int, int] = {}
+        self._owned: Set[int] = set()
+        self.sent = 0
+        self.skipped = 0
+        self.requests_saved = 0
+        self.bytes_saved = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Upload and savings counters."""
+        return {
+            "sent": self.sent,
+            "skipped": self.skipped,
+            "requests_saved": self.requests_saved,
+            "bytes_saved": self.bytes_saved,
+            "entries": len(self._frames)
+        }
+
+    def record(self, sent: int, skipped: int, requests_saved: int, bytes_saved: int):
+        """Add the outcome of one multi-panel refresh to the counters."""
+        self.sent += sent
+        self.skipped += skipped
+        self.requests_saved += requests_saved
+        self.bytes_saved += bytes_saved
+
+    def matches(self, panel: int, pixels: "np.ndarray") -> bool:
+        """True if the panel is known to show exactly these pixels."""
+        current = self._frames.get(panel)
+        return current is not None and np.array_equal(current, pixels)
+
+    def begin(self, panel: int) -> int:
+        """
+        Forget a panel's frame while an upload to it is in flight.
+
+        Returns:
+            Token to pass to acknowledge()
+        """
+        self._frames.pop(panel, None)
+        generation = self._generations[panel] = self._generations.get(panel, 0) + 1
+        return generation
+
+    def acknowledge(self, panel: int, pixels: "np.ndarray", generation: int):
+        """Record an acknowledged frame unless the panel was redrawn meanwhile."""
+        if self._generations.get(panel) == generation:
+            self._frames[panel] = pixels.copy()
+
+    def own(self, pic_id: int):
+        """Mark an upload as issued by this shadow, so observe() ignores it."""
+        self._owned.add(pic_id)
+
+    def disown(self, pic_id: int):
+        self._owned.discard(pic_id)
+
+    def invalidate(self, panels: Optional[Iterable[int]] = None):
+        """Forget the frames of some panels, or of all of them."""
+        for panel in list(self._generations) if panels is None else panels:
+            self._frames.pop(panel, None)
+            self._generations[panel] = self._generations.get(panel, 0) + 1
+
+    def observe(self, command: Dict[str, Any]):
+        """
+        Forget panels a sent command may have redrawn.
+
+        Args:
+            command: Command sent to the device, successfully or not
+        """
+        name = command.get("Command", "")
+        if name == "Draw/CommandList":
+            for sub_command in command.get("CommandList", []):
+                self.observe(sub_command)
+            return
+        if name in NEUTRAL_COMMANDS or name in DEVICE_SETTINGS or "/Get" in name:
+            return
+        if name == "Draw/SendHttpGif" and command.get("PicID") in self._owned:
+            return
+        self.invalidate(_panels_of(command))
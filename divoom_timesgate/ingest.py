@@ -0,0 +1,199 @@
+"""
+Off-loop frame ingestion: decode, resize and encode.
+
+Decoding GIF/PNG sources, resampling them to 64x64 and base64-encoding
+them is CPU-bound and would stall every device sharing the event loop.
+FrameIngestor runs these stages in a process pool (or a thread pool) and
+ships the result back as one compact bytes object.
+
+Requires numpy; decoding image files additionally requires Pillow.
+"""
+
+import asyncio
+import io
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, List, Optional, Union
+import logging
+
+try:
+    import numpy as np
+except ImportError as e:  # pragma: no cover - depends on the environment
+    raise ImportError(
+        "divoom_timesgate.ingest requires numpy; install divoom-timesgate[frames]"
+    ) from e
+
+from .framebuffer import PANEL_SIZE, RGB888, encode_frames
+from .payloadcache import PayloadCache, payload_key
+
+logger = logging.getLogger(__name__)
+
+Source = Union[bytes, "np.ndarray"]
+
+
+def decode_image(data: bytes) -> "np.ndarray":
+    """
+    Decode every frame of a GIF, PNG or other Pillow-readable image.
+
+    Args:
+        data: Image file content
+
+    Returns:
+        ``(frames, height, width, 3)`` uint8 RGB array
+    """
+    try:
+        from PIL import Image, ImageSequence
+    except ImportError as e:
+        raise ImportError("Decoding images requires Pillow; pip install pillow") from e
+
+    with Image.open(io.BytesIO(data)) as image:
+        frames = [np.asarray(frame.convert("RGB")) for frame in ImageSequence.Iterator(image)]
+    return np.stack(frames)
+
+
+def resize_frames(frames: "np.ndarray", size: int = PANEL_SIZE) -> "np.ndarray":
+    """
+    Resample frames to ``size`` x ``size`` (aspect ratio is not preserved).
+
+    Downscaling averages each source block through an integral image;
+    upscaling uses nearest-neighbour sampling. Both are fully vectorized.
+
+    Args:
+        frames: ``(frames, height, width, 3)`` uint8 array
+
+    Returns:
+        ``(frames, size, size, 3)`` uint8 array
+    """
+    _, height, width, _ = frames.shape
+    if (height, width) == (size, size):
+        return frames
+
+    ys = np.arange(size + 1) * height // size
+    xs = np.arange(size + 1) * width // size
+    if height < size or width < size:
+        return frames[:, ys[:-1]][:, :, xs[:-1]]
+
+    integral = np.zeros((frames.shape[0], height + 1, width + 1, 3), dtype=np.float64)
+    integral[:, 1:, 1:] = frames.cumsum(axis=1, dtype=np.float64).cumsum(axis=2)
+    bottom, top = integral[:, ys[1:]], integral[:, ys[:-1]]
+    sums = (
+        bottom[:, :, xs[1:]] - top[:, :, xs[1:]] -
+        bottom[:, :, xs[:-1]] + top[:, :, xs[:-1]]
+    )
+    area = np.outer(np.diff(ys), np.diff(xs))[None, :, :, None]
+    return np.rint(sums / area).astype(np.uint8)
+
+
+def prepare_payload(
+    source: Source,
+    pixel_format: str = RGB888,
+    quantizer: Any = None
+) -> bytes:
+    """
+    Decode, resize to 64x64 and encode a source into newline-separated PicData.
+
+    Runs in worker processes, so it only takes and returns picklable,
+    compact values.
+
+    Args:
+        source: Image file content, or a ``(frames, height, width, 3)`` array
+        pixel_format: PicData pixel format
+        quantizer: Optional quantize.Quantizer applied before encoding
+
+    Returns:
+        ASCII bytes of the PicData strings joined by newlines
+    """
+    frames = decode_image(source) if isinstance(source, (bytes, bytearray)) else np.asarray(source)
+    if frames.ndim == 3:
+        frames = frames[None]
+    frames = resize_frames(frames.astype(np.uint8, copy=False), PANEL_SIZE)
+    return "\n".join(encode_frames(frames, pixel_format, quantizer)).encode("ascii")
+
+
+class FrameIngestor:
+    """Prepares Draw/SendHttpGif payloads without blocking the event loop."""
+
+    def __init__(
+        self,
+        executor: Optional[Executor] = None,
+        processes: bool = True,
+        max_workers: Optional[int] = None,
+        cache: Optional[PayloadCache] = None
+    ):
+        """
+        Initialize the ingestor.
+
+        Args:
+            executor: Executor to run stages in; by default one is created
+                (and shut down on close)
+            processes: Create a ProcessPoolExecutor rather than a
+                ThreadPoolExecutor
+            max_workers: Workers of the created executor
+            cache: Payload cache consulted before encoding image sources
+        """
+        self._executor = executor
+        self._owns_executor = executor is None
+        self.processes = processes
+        self.max_workers = max_workers
+        self.cache = cache
+        self.encoded = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def executor(self) -> Executor:
+        """Executor running the CPU-bound stages, created on first use."""
+        if self._executor is None:
+            if self.processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    async def encode(
+        self,
+        source: Source,
+        pixel_format: str = RGB888,
+        quantizer: Any = None
+    ) -> List[str]:
+        """
+        Turn an image file or frame array into PicData strings off the loop.
+
+        Args:
+            source: Image file content, or a ``(frames, height, width, 3)`` array
+            pixel_format: PicData pixel format
+            quantizer: Optional quantize.Quantizer applied before encoding
+
+        Returns:
+            One base64 PicData string per frame
+        """
+        key = None
+        if self.cache is not None and isinstance(source, (bytes, bytearray)):
+            key = payload_key(
+                bytes(source),
+                pixel_format=pixel_format,
+                quantizer=quantizer.cache_key() if quantizer is not None else None
+            )
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_running_loop()
+        data = await loop.run_in_executor(
+            self.executor, prepare_payload, source, pixel_format, quantizer
+        )
+        pic_data = data.decode("ascii").split("\n")
+        self.encoded += 1
+
+        if key is not None:
+            self.cache.put(key, pic_data)
+        return pic_data
+
+    async def close(self):
+        """Shut down the executor if the ingestor created it."""
+        if self._executor is not None and self._owns_executor:
+            executor, self._executor = self._executor, None
+            await asyncio.get_running_loop().run_in_executor(None, executor.shutdown)
@@ -0,0 +1,56 @@
+"""
+In-process loopback transport.
+
+Hands request bodies straight to a TimesGateEmulator without sockets or
+HTTP, so tests and benchmarks exercise the full client pipeline (codec,
+batching, dispatch, retries) at memory speed. The emulator's fault profiles
+still apply: dropped requests and HTTP errors surface as connection errors.
+"""
+
+import asyncio
+from typing import TYPE_CHECKING
+import logging
+
+from .emulator import EmulatedHttpError
+from .exceptions import TimesGateConnectionError
+from .transport import Transport
+
+if TYPE_CHECKING:
+    from .emulator import TimesGateEmulator
+
+logger = logging.getLogger(__name__)
+
+
+class LoopbackTransport(Transport):
+    """Transport that answers every request from an in-process emulator."""
+
+    def __init__(self, emulator: "TimesGateEmulator", timeout: float = 10.0, **kwargs):
+        """
+        Initialize the transport.
+
+        Args:
+            emulator: Emulator answering all requests, whatever their URL
+                (it does not need to be started)
+            timeout: Seconds before a request counts as lost
+            **kwargs: Transport arguments (prewarm, adaptive_rate, ...)
+        """
+        super().__init__(**kwargs)
+        self.emulator = emulator
+        self.timeout = timeout
+
+    async def _open(self):
+        pass
+
+    async def _close(self):
+        pass
+
+    async def _request(self, url: str, body: bytes) -> bytes:
+        try:
+            data = await asyncio.wait_for(self.emulator.respond(body), self.timeout)
+        except asyncio.TimeoutError:
+            raise TimesGateConnectionError("Failed to connect to device: request timed out")
+        except EmulatedHttpError as e:
+            raise TimesGateConnectionError(f"Device answered with HTTP status {e.status}")
+        if data is None:
+            raise TimesGateConnectionError("Failed to connect to device: connection reset")
+        return data
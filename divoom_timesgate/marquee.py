@@ -0,0 +1,129 @@
+"""
+Scrolling text rendered client-side.
+
+A Marquee rasterizes its message once into a strip padded with one window
+of background on each side. Every scroll step is then a strided view into
+that strip: nothing is re-rendered or copied per frame, so the per-frame
+cost is the same for a word and for a paragraph.
+
+Requires numpy.
+"""
+
+from typing import AsyncIterator, Optional
+
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from .framebuffer import PANEL_SIZE, Color, Frame, parse_color
+from .models import FontSize
+from .text import draw_text, text_size
+
+# Scroll directions, as in the TextDisplayItem ``dir`` field
+LEFT = 0
+RIGHT = 1
+
+
+class Marquee:
+    """A message scrolling through a fixed-size window."""
+
+    def __init__(
+        self,
+        text: str,
+        color: Color = "#FFFFFF",
+        background: Color = "#000000",
+        size: FontSize = FontSize.SMALL,
+        step: int = 1,
+        direction: int = LEFT,
+        width: int = PANEL_SIZE,
+        height: int = PANEL_SIZE,
+        y: Optional[int] = None
+    ):
+        """
+        Render the message strip.
+
+        Args:
+            text: Single line of ASCII text
+            color: Text color
+            background: Background color
+            size: Font size tier
+            step: Pixels scrolled per frame
+            direction: LEFT (text moves right to left) or RIGHT
+            width: Window width (64 for one panel, 320 for the whole gate)
+            height: Window height
+            y: Top edge of the text (default: vertically centered)
+        """
+        if step < 1:
+            raise ValueError("Step must be at least 1")
+        if direction not in (LEFT, RIGHT):
+            raise ValueError("Direction must be LEFT (0) or RIGHT (1)")
+
+        text_width, text_height = text_size(text, size)
+        if y is None:
+            y = (height - text_height) // 2
+        strip = Frame(text_width + 2 * width, height).fill(parse_color(background))
+        draw_text(strip, text, width, y, color, size)
+
+        self.text = text
+        self.step = step
+        self.direction = direction
+        self.width = width
+        self.strip = strip.pixels
+        self.strip.flags.writeable = False
+        # Window offsets cover the text entering on one side and leaving on
+        # the other; the strip's padding makes the loop seamless
+        self._count = -(-(text_width + width) // step)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"Marquee({self.text!r}, {self._count} steps)"
+
+    def _offset(self, index: int) -> int:
+        offset = (index % self._count) * self.step
+        return offset if self.direction == LEFT else self.strip.shape[1] - self.width - offset
+
+    def window(self, index: int) -> "np.ndarray":
+        """
+        Zero-copy view of one scroll step.
+
+        Args:
+            index: Step number (wraps around)
+
+        Returns:
+            Read-only ``(height, width, 3)`` view into the strip
+        """
+        offset = self._offset(index)
+        return self.strip[:, offset:offset + self.width]
+
+    @property
+    def windows(self) -> "np.ndarray":
+        """
+        Every scroll step as one read-only ``(steps, height, width, 3)`` view.
+
+        Short messages can be uploaded whole with send_frames() and looped by
+        the device itself.
+        """
+        height, _, channels = self.strip.shape
+        row, column, channel = self.strip.strides
+        step = column * self.step * (1 if self.direction == LEFT else -1)
+        first = self.strip[:, self._offset(0):]
+        return as_strided(
+            first,
+            shape=(self._count, height, self.width, channels),
+            strides=(step, row, column, channel),
+            writeable=False
+        )
+
+    async def frames(self, loops: Optional[int] = 1) -> AsyncIterator["np.ndarray"]:
+        """
+        Yield scroll steps for streaming.
+
+        Args:
+            loops: Passes through the message; None scrolls forever
+        """
+        index = 0
+        total = None if loops is None else loops * self._count
+        while total is None or index < total:
+            yield self.window(index)
+            index += 1
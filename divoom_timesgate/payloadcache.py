@@ -0,0 +1,258 @@
+"""
+Content-addressed cache of encoded Draw/SendHttpGif payloads.
+
+Signage loops push the same images over and over. Decoding, resizing,
+quantizing and base64-encoding them again on every push is wasted CPU, so
+ready-to-send ``PicData`` chunks are cached under a key derived from the
+source content and the encode parameters. Entries live in a size-bounded
+in-memory LRU backed by an optional, size-bounded directory that several
+processes can share: files are written atomically and evicted oldest-first.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+_SUFFIX = ".picdata"
+
+
+def payload_key(source: bytes, **params: Any) -> str:
+    """
+    Cache key of an encoded payload.
+
+    Args:
+        source: Source content (e.g. the raw GIF or PNG file)
+        **params: Encode parameters that change the output (size, speed,
+            palette, pixel format, ...)
+
+    Returns:
+        Hex digest identifying the content and parameters
+    """
+    digest = hashlib.blake2b(source, digest_size=20)
+    digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+class PayloadCache:
+    """Two-level LRU of encoded frame payloads."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        memory_budget: int = 32 * 1024 * 1024,
+        disk_budget: int = 512 * 1024 * 1024
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Directory for the on-disk level; None keeps the cache
+                in memory only
+            memory_budget: Bytes of PicData kept in memory
+            disk_budget: Bytes of PicData kept on disk
+        """
+        self.directory = directory
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self._entries: "OrderedDict[str, Tuple[str, ...]]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.memory_evictions = 0
+        self.disk_evictions = 0
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Hit, miss, eviction and size counters."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_evictions": self.memory_evictions,
+            "disk_evictions": self.disk_evictions,
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes or 0,
+            "entries": len(self._entries)
+        }
+
+    def get(self, key: str) -> Optional[List[str]]:
+        """
+        Look up a payload.
+
+        Args:
+            key: Key from payload_key()
+
+        Returns:
+            The cached PicData chunks, or None on a miss
+        """
+        chunks = self._entries.get(key)
+        if chunks is not None:
+            self._entries.move_to_end(key)
+            self.memory_hits += 1
+            return list(chunks)
+
+        if self.directory is not None:
+            chunks = self._read(key)
+            if chunks is not None:
+                self.disk_hits += 1
+                self._remember(key, chunks)
+                return list(chunks)
+
+        self.misses += 1
+        return None
+
+    def put(self, key: str, pic_data: List[str]):
+        """
+        Store a payload in memory and, if configured, on disk.
+
+        Args:
+            key: Key from payload_key()
+            pic_data: Encoded frames, one base64 string per frame
+        """
+        chunks = tuple(pic_data)
+        self._remember(key, chunks)
+        if self.directory is not None:
+            self._write(key, chunks)
+
+    def get_or_encode(
+        self,
+        source: bytes,
+        encode: Callable[[], List[str]],
+        **params: Any
+    ) -> List[str]:
+        """
+        Return the cached payload of a source, encoding it on a miss.
+
+        Args:
+            source: Source content
+            encode: Function producing the PicData chunks
+            **params: Encode parameters (part of the key)
+        """
+        key = payload_key(source, **params)
+        pic_data = self.get(key)
+        if pic_data is None:
+            pic_data = encode()
+            self.put(key, pic_data)
+        return pic_data
+
+    def clear(self):
+        """Drop the in-memory level (the disk level is shared and kept)."""
+        self._entries.clear()
+        self._memory_bytes = 0
+
+    # Memory level
+
+    def _remember(self, key: str, chunks: Tuple[str, ...]):
+        size = sum(len(chunk) for chunk in chunks)
+        if size > self.memory_budget:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= sum(len(chunk) for chunk in old)
+        self._entries[key] = chunks
+        self._memory_bytes += size
+        while self._memory_bytes > self.memory_budget:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= sum(len(chunk) for chunk in evicted)
+            self.memory_evictions += 1
+
+    # Disk level
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def _read(self, key: str) -> Optional[Tuple[str, ...]]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            # Refresh the modification time so eviction treats it as recently used
+            os.utime(path)
+        except OSError:
+            return None
+        try:
+            text = data.decode("ascii")
+        except UnicodeDecodeError:
+            # Corrupt file: drop it and treat the lookup as a miss
+            logger.warning(f"Discarding corrupt cached payload {key}")
+            self._unlink(path, len(data))
+            return None
+        # An empty payload is stored as an empty file
+        return tuple(text.split("\n")) if text else ()
+
+    def _write(self, key: str, chunks: Tuple[str, ...]):
+        data = "\n".join(chunks).encode("ascii")
+        if len(data) > self.disk_budget:
+            return
+        path = self._path(key)
+        try:
+            replaced = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".payload-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write cached payload {key}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+            return
+
+        if self._disk_bytes is None:
+            self._disk_bytes = self._scan()[1]
+        else:
+            self._disk_bytes += len(data) - replaced
+        if self._disk_bytes > self.disk_budget:
+            self._evict_disk()
+
+    def _unlink(self, path: str, size: int):
+        try:
+            os.unlink(path)
+        except OSError:
+            return
+        if self._disk_bytes is not None:
+            self._disk_bytes -= size
+
+    def _scan(self) -> Tuple[List[Tuple[float, int, str]], int]:
+        """Cached files as (mtime, size, path), and their total size."""
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        return files, sum(size for _, size, _ in files)
+
+    def _evict_disk(self):
+        """Delete least recently used files until the directory fits its budget."""
+        # Other processes write here too, so recount instead of trusting the tally
+        files, total = self._scan()
+        for _, size, path in sorted(files):
+            if total <= self.disk_budget:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            self.disk_evictions += 1
+        self._disk_bytes = total
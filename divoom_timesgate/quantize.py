@@ -0,0 +1,218 @@
+"""
+Adaptive palette quantization with ordered or Floyd-Steinberg dithering.
+
+A Quantizer maps a batch of frames onto one shared palette (shared so that
+animations do not flicker between per-frame palettes). The firmware only
+accepts direct-color PicData, so quantized frames are expanded back to RGB
+before encoding. Combined with the RGB565 pixel format, palette colors are
+snapped to the 565 grid so dithering absorbs the precision loss instead of
+leaving banding.
+
+Requires numpy.
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from .framebuffer import RGB565, RGB888
+
+NONE = "none"
+ORDERED = "ordered"
+FLOYD_STEINBERG = "floyd-steinberg"
+DITHER_MODES = (NONE, ORDERED, FLOYD_STEINBERG)
+
+# Normalized 8x8 Bayer threshold matrix, centered on zero
+_BAYER = np.array([
+    [0, 32, 8, 40, 2, 34, 10, 42],
+    [48, 16, 56, 24, 50, 18, 58, 26],
+    [12, 44, 4, 36, 14, 46, 6, 38],
+    [60, 28, 52, 20, 62, 30, 54, 22],
+    [3, 35, 11, 43, 1, 33, 9, 41],
+    [51, 19, 59, 27, 49, 17, 57, 25],
+    [15, 47, 7, 39, 13, 45, 5, 37],
+    [63, 31, 55, 23, 61, 29, 53, 21],
+], dtype=np.float32) / 64.0 - 0.5
+
+# Pixels sampled from a batch to build its palette
+_SAMPLE_SIZE = 16384
+
+
+def median_cut(pixels: "np.ndarray", colors: int) -> "np.ndarray":
+    """
+    Build a palette by repeatedly splitting the widest color box at its median.
+
+    Args:
+        pixels: ``(count, 3)`` uint8 colors
+        colors: Maximum palette size
+
+    Returns:
+        ``(n, 3)`` uint8 palette with ``n <= colors``
+    """
+    boxes = [pixels]
+    while len(boxes) < colors:
+        # Split the box with the largest channel range
+        ranges = [
+            int(np.ptp(box, axis=0).max()) if len(box) > 1 else -1
+            for box in boxes
+        ]
+        index = int(np.argmax(ranges))
+        if ranges[index] <= 0:
+            break
+        box = boxes.pop(index)
+        channel = int(np.argmax(np.ptp(box, axis=0)))
+        order = np.argsort(box[:, channel], kind="stable")
+        half = len(box) // 2
+        boxes += [box[order[:half]], box[order[half:]]]
+
+    return np.array([np.rint(box.mean(axis=0)) for box in boxes], dtype=np.uint8)
+
+
+def nearest_indices(pixels: "np.ndarray", palette: "np.ndarray") -> "np.ndarray":
+    """
+    Index of the nearest palette color (squared RGB distance) of each pixel.
+
+    Args:
+        pixels: ``(..., 3)`` array
+        palette: ``(n, 3)`` array
+    """
+    flat = pixels.reshape(-1, 3).astype(np.float32)
+    table = palette.astype(np.float32)
+    # |p - c|^2 = |p|^2 - 2 p.c + |c|^2; |p|^2 does not change the argmin
+    distances = (table * table).sum(axis=1) - 2.0 * flat @ table.T
+    return distances.argmin(axis=1).reshape(pixels.shape[:-1])
+
+
+class Quantizer:
+    """Maps frames onto a small adaptive palette, optionally dithered."""
+
+    def __init__(
+        self,
+        colors: int = 16,
+        dither: str = FLOYD_STEINBERG,
+        pixel_format: str = RGB888,
+        seed: int = 0
+    ):
+        """
+        Initialize the quantizer.
+
+        Args:
+            colors: Palette size (2-256)
+            dither: "none", "ordered" (8x8 Bayer) or "floyd-steinberg"
+            pixel_format: Wire format the frames will be encoded in; with
+                RGB565 the palette is snapped to representable colors
+            seed: Seed for sampling palette pixels
+        """
+        if not 2 <= colors <= 256:
+            raise ValueError("Colors must be between 2 and 256")
+        if dither not in DITHER_MODES:
+            raise ValueError(f"Dither must be one of {', '.join(DITHER_MODES)}")
+
+        self.colors = colors
+        self.dither = dither
+        self.pixel_format = pixel_format
+        self.seed = seed
+
+    def __repr__(self) -> str:
+        return f"Quantizer(colors={self.colors}, dither={self.dither!r})"
+
+    def cache_key(self) -> Tuple[int, str, str, int]:
+        """Every parameter that changes the output, for payload cache keys."""
+        return (self.colors, self.dither, self.pixel_format, self.seed)
+
+    def fit(self, frames: "np.ndarray") -> "np.ndarray":
+        """
+        Build the palette of a batch of frames.
+
+        Args:
+            frames: ``(..., 3)`` uint8 pixels
+
+        Returns:
+            The palette
+        """
+        pixels = frames.reshape(-1, 3)
+        if len(pixels) > _SAMPLE_SIZE:
+            rng = np.random.default_rng(self.seed)
+            pixels = pixels[rng.choice(len(pixels), _SAMPLE_SIZE, replace=False)]
+        palette = median_cut(pixels, self.colors)
+        if self.pixel_format == RGB565:
+            palette = palette & np.array([0xF8, 0xFC, 0xF8], dtype=np.uint8)
+        return np.unique(palette, axis=0)
+
+    def indices(self, frames: "np.ndarray", palette: Optional["np.ndarray"] = None) -> "np.ndarray":
+        """
+        Palette index of every pixel.
+
+        Args:
+            frames: ``(frames, height, width, 3)`` uint8 array
+            palette: Palette from fit(); fitted to the batch if omitted
+
+        Returns:
+            ``(frames, height, width)`` index array
+        """
+        if palette is None:
+            palette = self.fit(frames)
+        if self.dither == ORDERED:
+            return self._ordered(frames, palette)
+        if self.dither == FLOYD_STEINBERG:
+            return self._floyd_steinberg(frames, palette)
+        return nearest_indices(frames, palette)
+
+    def apply(self, frames: "np.ndarray") -> "np.ndarray":
+        """
+        Quantize frames, returning them as direct-color RGB again.
+
+        Args:
+            frames: ``(frames, height, width, 3)`` uint8 array
+
+        Returns:
+            Array of the same shape using only palette colors
+        """
+        palette = self.fit(frames)
+        return self.palette_of(self.indices(frames, palette), palette)
+
+    @staticmethod
+    def palette_of(indices: "np.ndarray", palette: "np.ndarray") -> "np.ndarray":
+        """Expand palette indices to RGB."""
+        return palette[indices]
+
+    def _ordered(self, frames: "np.ndarray", palette: "np.ndarray") -> "np.ndarray":
+        height, width = frames.shape[1:3]
+        # Threshold amplitude: typical distance between neighbouring palette colors
+        spread = 255.0 / max(1.0, round(len(palette) ** (1 / 3)))
+        tiles = np.tile(_BAYER, (height // 8 + 1, width // 8 + 1))[:height, :width]
+        biased = frames.astype(np.float32) + (tiles * spread)[None, :, :, None]
+        return nearest_indices(np.clip(biased, 0, 255), palette)
+
+    def _floyd_steinberg(self, frames: "np.ndarray", palette: "np.ndarray") -> "np.ndarray":
+        # A pixel depends on its left neighbour and the three pixels above it.
+        # Pixels with equal x + 2y are therefore independent and are processed
+        # together (a wavefront), across all frames at once.
+        count, height, width = frames.shape[:3]
+        work = frames.astype(np.float32)
+        table = palette.astype(np.float32)
+        result = np.empty((count, height, width), dtype=np.intp)
+
+        for wave in range(width + 2 * (height - 1)):
+            ys = np.arange(max(0, (wave - width + 2) // 2), min(height - 1, wave // 2) + 1)
+            xs = wave - 2 * ys
+            keep = (xs >= 0) & (xs < width)
+            ys, xs = ys[keep], xs[keep]
+            if not len(ys):
+                continue
+
+            old = np.clip(work[:, ys, xs], 0, 255)
+            chosen = nearest_indices(old, palette)
+            result[:, ys, xs] = chosen
+            error = old - table[chosen]
+
+            right = xs + 1 < width
+            work[:, ys[right], xs[right] + 1] += error[:, right] * (7 / 16)
+            below = ys + 1 < height
+            left = below & (xs > 0)
+            work[:, ys[left] + 1, xs[left] - 1] += error[:, left] * (3 / 16)
+            work[:, ys[below] + 1, xs[below]] += error[:, below] * (5 / 16)
+            corner = below & right
+            work[:, ys[corner] + 1, xs[corner] + 1] += error[:, corner] * (1 / 16)
+
+        return result
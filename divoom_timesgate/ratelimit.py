@@ -0,0 +1,147 @@
+"""
+Adaptive per-device command pacing.
+
+The firmware slows down and starts failing when hammered. An AIMD limiter
+learns each device's sustainable command rate: it ramps the rate up
+additively while latency stays flat and backs off multiplicatively on
+failures or latency growth. Learned rates can be persisted so a restart
+does not start cold.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class AdaptiveRateLimiter:
+    """AIMD pacing of one device's commands."""
+
+    def __init__(
+        self,
+        rate: float = 5.0,
+        min_rate: float = 0.5,
+        max_rate: float = 50.0,
+        increase: float = 0.25,
+        decrease: float = 0.5,
+        latency_tolerance: float = 2.0,
+        backoff_interval: float = 1.0
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            rate: Starting rate in commands per second
+            min_rate: Lowest rate the limiter backs off to
+            max_rate: Highest rate the limiter ramps up to
+            increase: Commands per second added after each healthy response
+            decrease: Factor applied to the rate on failure or latency growth
+            latency_tolerance: Latency above ``baseline * tolerance`` counts
+                as congestion
+            backoff_interval: Minimum seconds between two backoffs
+        """
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.backoff_interval = backoff_interval
+        self.baseline: Optional[float] = None
+        self._next_slot = 0.0
+        self._last_backoff = 0.0
+        self.increases = 0
+        self.backoffs = 0
+
+    @property
+    def stats(self) -> Dict[str, float]:
+        """Current rate and adjustment counters."""
+        return {
+            "rate": self.rate,
+            "baseline_ms": (self.baseline or 0.0) * 1000,
+            "increases": self.increases,
+            "backoffs": self.backoffs
+        }
+
+    async def acquire(self):
+        """Wait for the next send slot."""
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / self.rate
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    def on_success(self, latency: float):
+        """
+        Adjust the rate after an acknowledged command.
+
+        Args:
+            latency: Round-trip time of the command in seconds
+        """
+        if self.baseline is None or latency < self.baseline:
+            self.baseline = latency
+        else:
+            # Let the baseline follow slow, genuine changes of the network
+            self.baseline += (latency - self.baseline) * 0.01
+
+        if latency > self.baseline * self.latency_tolerance:
+            self._back_off()
+        elif self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+            self.increases += 1
+
+    def on_failure(self):
+        """Back off after a failed or timed-out command."""
+        self._back_off()
+
+    def _back_off(self):
+        now = time.monotonic()
+        if now - self._last_backoff < self.backoff_interval:
+            return
+        self._last_backoff = now
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        self.backoffs += 1
+        # Give the device room to recover before the next command
+        self._next_slot = max(self._next_slot, now + 1.0 / self.rate)
+
+
+class RateStore:
+    """JSON file of learned rates, keyed by device URL."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: File used to persist learned rates
+        """
+        self.path = path
+
+    def load(self) -> Dict[str, float]:
+        """Read persisted rates (empty if the file is missing or corrupt)."""
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return {url: float(rate) for url, rate in data.items()}
+
+    def save(self, rates: Dict[str, float]):
+        """Atomically replace the persisted rates."""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".rates-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(rates, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Failed to persist learned rates to {self.path}: {e}")
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,235 @@
+"""
+Minimal asyncio HTTP/1.1 keep-alive client for Times Gate devices.
+
+Commands are tiny JSON POSTs to a single LAN endpoint, so this client skips
+everything a general-purpose HTTP library does per request: the request
+head is pre-built once per endpoint, each device gets exactly one
+persistent connection with TCP_NODELAY, and responses are parsed only as
+far as the status line, Content-Length and body.
+"""
+
+import asyncio
+import socket
+import time
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+import logging
+
+from .exceptions import TimesGateConnectionError
+from .transport import Transport
+
+logger = logging.getLogger(__name__)
+
+
+class _HttpClientProtocol(asyncio.Protocol):
+    """One HTTP/1.1 connection handling one request at a time."""
+
+    def __init__(self):
+        self.transport: Optional[asyncio.Transport] = None
+        self.closed = False
+        self.keep_alive = True
+        # Whether the current request was handed to the socket at all
+        self.written = False
+        self._buffer = bytearray()
+        self._waiter: Optional[asyncio.Future] = None
+        self._status = 0
+        self._body_start: Optional[int] = None
+        self._content_length: Optional[int] = None
+
+    def connection_made(self, transport: asyncio.Transport):
+        self.transport = transport
+        sock = transport.get_extra_info("socket")
+        if sock is not None:
+            try:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except (OSError, AttributeError):
+                pass
+
+    def connection_lost(self, exc: Optional[Exception]):
+        self.closed = True
+        waiter = self._waiter
+        if waiter is None or waiter.done():
+            return
+        if self._body_start is not None and self._content_length is None:
+            # No Content-Length: the body runs until the connection closes
+            waiter.set_result((self._status, bytes(self._buffer[self._body_start:])))
+        else:
+            waiter.set_exception(exc or ConnectionResetError("Connection closed by device"))
+
+    def data_received(self, data: bytes):
+        self._buffer += data
+        waiter = self._waiter
+        if waiter is None or waiter.done():
+            return
+        try:
+            self._parse(waiter)
+        except ValueError as e:
+            waiter.set_exception(e)
+
+    def request(self, data: bytes) -> asyncio.Future:
+        """Write a complete request and return a future of (status, body)."""
+        self._buffer.clear()
+        self._body_start = None
+        self._content_length = None
+        self._waiter = asyncio.get_running_loop().create_future()
+        if self.closed or self.transport.is_closing():
+            self.written = False
+            self._waiter.set_exception(ConnectionResetError("Connection closed by device"))
+        else:
+            self.written = True
+            self.transport.write(data)
+        return self._waiter
+
+    def close(self):
+        if self.transport is not None:
+            self.transport.close()
+        self.closed = True
+
+    def _parse(self, waiter: asyncio.Future):
+        buffer = self._buffer
+        if self._body_start is None:
+            end = buffer.find(b"\r\n\r\n")
+            if end < 0:
+                return
+            lines = bytes(buffer[:end]).split(b"\r\n")
+            parts = lines[0].split(b" ", 2)
+            if len(parts) < 2 or not parts[0].startswith(b"HTTP/"):
+                raise ValueError(f"Malformed status line: {lines[0][:64]!r}")
+            self._status = int(parts[1])
+            self.keep_alive = parts[0] != b"HTTP/1.0"
+            for line in lines[1:]:
+                name, _, value = line.partition(b":")
+                name = name.strip().lower()
+                if name == b"content-length":
+                    self._content_length = int(value)
+                elif name == b"connection":
+                    self.keep_alive = value.strip().lower() == b"keep-alive"
+                elif name == b"transfer-encoding" and value.strip().lower() != b"identity":
+                    raise ValueError(f"Unsupported transfer encoding: {value.strip()!r}")
+            if self._content_length is None:
+                self.keep_alive = False
+            self._body_start = end + 4
+
+        if self._content_length is not None:
+            end = self._body_start + self._content_length
+            if len(buffer) >= end:
+                waiter.set_result((self._status, bytes(buffer[self._body_start:end])))
+
+
+class _Endpoint:
+    """Persistent connection and pre-built request head for one device URL."""
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 80
+        path = parts.path or "/"
+        if parts.query:
+            path += "?" + parts.query
+        host_header = self.host if self.port == 80 else f"{self.host}:{self.port}"
+        self.head = (
+            f"POST {path} HTTP/1.1\r\n"
+            f"Host: {host_header}\r\n"
+            "Content-Type: application/json\r\n"
+            "Connection: keep-alive\r\n"
+            "Content-Length: "
+        ).encode("latin-1")
+        self.protocol: Optional[_HttpClientProtocol] = None
+        self.last_used = 0.0
+        self.lock = asyncio.Lock()
+
+    def close(self):
+        if self.protocol is not None:
+            self.protocol.close()
+            self.protocol = None
+
+
+class RawHttpTransport(Transport):
+    """Lean HTTP/1.1 transport keeping one connection per device."""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        keepalive_timeout: float = 30.0,
+        **kwargs
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            timeout: Total timeout per request (including connecting) in seconds
+            keepalive_timeout: Seconds an idle connection is kept before it
+                is replaced by a fresh one
+            **kwargs: Transport arguments (prewarm, adaptive_rate, ...)
+        """
+        super().__init__(**kwargs)
+        self.timeout = timeout
+        self.keepalive_timeout = keepalive_timeout
+        self._endpoints: Dict[str, _Endpoint] = {}
+
+    async def _open(self):
+        pass
+
+    async def _close(self):
+        for endpoint in self._endpoints.values():
+            endpoint.close()
+        self._endpoints.clear()
+
+    async def _request(self, url: str, body: bytes) -> bytes:
+        endpoint = self._endpoints.get(url)
+        if endpoint is None:
+            endpoint = self._endpoints[url] = _Endpoint(url)
+
+        async with endpoint.lock:
+            try:
+                status, data = await asyncio.wait_for(self._exchange(endpoint, body), self.timeout)
+            except (OSError, ValueError, asyncio.TimeoutError) as e:
+                endpoint.close()
+                raise TimesGateConnectionError(f"Failed to connect to device: {str(e)}")
+            except asyncio.CancelledError:
+                # The response may still arrive; never reuse the connection
+                endpoint.close()
+                raise
+        if not 200 <= status < 300:
+            raise TimesGateConnectionError(f"Device answered with HTTP status {status}")
+        return data
+
+    async def _connection(self, endpoint: _Endpoint) -> Tuple[_HttpClientProtocol, bool]:
+        """The endpoint's open connection, or a new one; and whether it is reused."""
+        protocol = endpoint.protocol
+        if protocol is not None and (
+                protocol.closed or time.monotonic() - endpoint.last_used > self.keepalive_timeout):
+            endpoint.close()
+            protocol = None
+
+        if protocol is not None:
+            self.connections_reused += 1
+            return protocol, True
+
+        loop = asyncio.get_running_loop()
+        _, protocol = await loop.create_connection(_HttpClientProtocol, endpoint.host, endpoint.port)
+        endpoint.protocol = protocol
+        self.connections_created += 1
+        return protocol, False
+
+    async def _exchange(self, endpoint: _Endpoint, body: bytes) -> Tuple[int, bytes]:
+        """Send one request over the endpoint's connection, opening it if needed."""
+        request = endpoint.head + str(len(body)).encode() + b"\r\n\r\n" + body
+        protocol, reused = await self._connection(endpoint)
+        try:
+            result = await protocol.request(request)
+        except OSError:
+            # A reused keep-alive connection the device closed while idle is
+            # replaced once, but only if the request never went out: once
+            # written it may have been delivered, and replaying a command is
+            # for the device's retry policy to decide
+            if not reused or protocol.written:
+                raise
+            logger.debug(f"Reused connection to {endpoint.host} failed; retrying on a new one")
+            endpoint.close()
+            protocol, _ = await self._connection(endpoint)
+            result = await protocol.request(request)
+        endpoint.last_used = time.monotonic()
+        if not protocol.keep_alive:
+            endpoint.close()
+        return result
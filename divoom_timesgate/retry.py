@@ -0,0 +1,161 @@
+"""
+Retry policy and circuit breaker for Times Gate devices.
+"""
+
+import random
+import time
+from typing import Any, Dict, FrozenSet, Optional, Tuple, Type
+import logging
+
+from .exceptions import TimesGateCircuitOpenError, TimesGateConnectionError
+
+logger = logging.getLogger(__name__)
+
+# Commands with side effects that must not be repeated when a response is lost
+NON_IDEMPOTENT_COMMANDS = frozenset([
+    "Device/Reboot",
+    "Device/PlayBuzzer",
+])
+
+
+class RetryPolicy:
+    """Retries of idempotent commands with exponential backoff and full jitter."""
+
+    def __init__(
+        self,
+        attempts: int = 3,
+        base_delay: float = 0.1,
+        max_delay: float = 2.0,
+        retry_on: Tuple[Type[BaseException], ...] = (TimesGateConnectionError,),
+        non_idempotent: FrozenSet[str] = NON_IDEMPOTENT_COMMANDS,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            attempts: Total attempts per command, including the first
+            base_delay: Backoff ceiling in seconds before the first retry
+            max_delay: Upper bound of the backoff ceiling
+            retry_on: Exception types that trigger a retry
+            non_idempotent: Commands that are never retried
+            seed: Seed for the jitter random generator
+        """
+        if attempts < 1:
+            raise ValueError("Attempts must be at least 1")
+
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+        self.non_idempotent = non_idempotent
+        self._rng = random.Random(seed)
+
+    def is_idempotent(self, command: Dict[str, Any]) -> bool:
+        """True if the command (and every member of a CommandList) is safe to repeat."""
+        name = command.get("Command")
+        if name == "Draw/CommandList":
+            return all(self.is_idempotent(sub_command) for sub_command in command.get("CommandList", []))
+        return name not in self.non_idempotent
+
+    def should_retry(self, command: Dict[str, Any], error: BaseException, attempt: int) -> bool:
+        """
+        Decide whether a failed attempt is retried.
+
+        Args:
+            command: Command that failed
+            error: Exception raised by the attempt
+            attempt: Number of attempts made so far
+
+        Returns:
+            True if another attempt should be made
+        """
+        return (
+            attempt < self.attempts and
+            isinstance(error, self.retry_on) and
+            not isinstance(error, TimesGateCircuitOpenError) and
+            self.is_idempotent(command)
+        )
+
+    def delay(self, attempt: int) -> float:
+        """
+        Backoff before the next attempt.
+
+        Args:
+            attempt: Number of attempts made so far (1 after the first failure)
+
+        Returns:
+            Seconds to wait, drawn uniformly below the exponential ceiling
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self._rng.uniform(0, ceiling)
+
+
+class CircuitBreaker:
+    """Fails fast after repeated connection failures to one device."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        """
+        Initialize the breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to fail fast before a half-open probe
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def before_request(self):
+        """
+        Check whether a request may be sent.
+
+        Raises:
+            TimesGateCircuitOpenError: While the circuit is open, or while a
+                half-open probe is already in flight
+        """
+        if self.state == self.CLOSED:
+            return
+
+        if self.state == self.OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+            self.state = self.HALF_OPEN
+            self._probing = False
+
+        if self.state == self.HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+
+        self.rejected += 1
+        raise TimesGateCircuitOpenError(
+            f"Circuit open after {self.failures} consecutive failures; failing fast"
+        )
+
+    def record_success(self):
+        """Close the circuit after a successful request."""
+        self.state = self.CLOSED
+        self.failures = 0
+        self._probing = False
+
+    def release(self):
+        """Give up a request without an outcome (e.g. it was cancelled)."""
+        self._probing = False
+
+    def record_failure(self):
+        """Count a failed request, opening the circuit at the threshold."""
+        self.failures += 1
+        self._probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Opening circuit after {self.failures} consecutive failures")
+                self.opened += 1
+            self.state = self.OPEN
+            self._opened_at = time.monotonic()
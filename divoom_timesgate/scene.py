@@ -0,0 +1,209 @@
+"""
+Declarative five-panel scenes compiled to ready-to-send payloads.
+
+A Scene describes what every panel should show (a display list, a dial,
+a timer or a scoreboard) plus device-wide brightness. SceneCompiler turns
+it into as few requests as possible: one Draw/SendHttpItemList when that is
+all there is, otherwise Draw/CommandList requests of up to ``max_commands``
+commands each. Compiled payloads are serialized once and memoized by the
+scene's content hash, so applying a scene again in a rotation only sends.
+"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from .codec import EncodedCommand, JSONCodec
+from .models import DisplayItem
+
+# Default display list background, as used by create_multi_item_display()
+DEFAULT_BACKGROUND = "http://f.divoom-gz.com/64_64.gif"
+
+Item = Union[DisplayItem, Dict[str, Any]]
+
+
+class PanelScene:
+    """Content of one panel."""
+
+    def __init__(
+        self,
+        items: Optional[Sequence[Item]] = None,
+        background_gif: str = DEFAULT_BACKGROUND,
+        dial: Optional[int] = None,
+        timer: Optional[Tuple[int, int]] = None,
+        scoreboard: Optional[Tuple[int, int]] = None
+    ):
+        """
+        Initialize the panel content.
+
+        Args:
+            items: Display list items (DisplayItem objects or item dicts)
+            background_gif: Background GIF URL of the display list
+            dial: Clock face ID (Channel/SetIndividualDial)
+            timer: (minutes, seconds) countdown started on the panel
+            scoreboard: (red score, blue score) shown on the panel
+        """
+        self.items = [item.to_dict() if isinstance(item, DisplayItem) else dict(item) for item in items or []]
+        self.background_gif = background_gif
+        self.dial = dial
+        self.timer = timer
+        self.scoreboard = scoreboard
+
+    def commands(self, panel: int) -> List[Dict[str, Any]]:
+        """Commands putting this content on a panel, tools before the display list."""
+        commands = []
+        if self.dial is not None:
+            commands.append({"Command": "Channel/SetIndividualDial", "LcdId": panel, "ClockId": self.dial})
+        if self.timer is not None:
+            minutes, seconds = self.timer
+            commands.append({
+                "Command": "Tools/SetTimer",
+                "Minute": minutes,
+                "Second": seconds,
+                "Status": 1,
+                "LcdId": panel
+            })
+        if self.scoreboard is not None:
+            red, blue = self.scoreboard
+            commands.append({
+                "Command": "Tools/SetScoreBoard",
+                "RedScore": red,
+                "BlueScore": blue,
+                "LcdId": panel
+            })
+        if self.items:
+            # NOTE: The API requires "BackgroudGif" with the typo
+            commands.append({
+                "Command": "Draw/SendHttpItemList",
+                "LcdIndex": panel,
+                "NewFlag": 1,
+                "BackgroudGif": self.background_gif,
+                "ItemList": self.items
+            })
+        return commands
+
+
+class Scene:
+    """What the whole gate shows. Treat it as immutable once created."""
+
+    def __init__(
+        self,
+        panels: Optional[Mapping[int, PanelScene]] = None,
+        brightness: Optional[int] = None
+    ):
+        """
+        Initialize the scene.
+
+        Args:
+            panels: Panel number (1-5) -> content; panels left out are untouched
+            brightness: Device brightness (0-100)
+        """
+        panels = dict(panels or {})
+        if not all(1 <= panel <= 5 for panel in panels):
+            raise ValueError("Panel must be between 1 and 5")
+        if brightness is not None and not 0 <= brightness <= 100:
+            raise ValueError("Brightness must be between 0 and 100")
+        self.panels = panels
+        self.brightness = brightness
+        self._commands: Optional[List[Dict[str, Any]]] = None
+        self._digest: Optional[str] = None
+
+    def commands(self) -> List[Dict[str, Any]]:
+        """Every command of the scene in send order."""
+        if self._commands is None:
+            commands = []
+            if self.brightness is not None:
+                commands.append({"Command": "Channel/SetBrightness", "Brightness": self.brightness})
+            for panel in sorted(self.panels):
+                commands += self.panels[panel].commands(panel)
+            self._commands = commands
+        return self._commands
+
+    @property
+    def digest(self) -> str:
+        """Content hash; equal scenes built separately share it."""
+        if self._digest is None:
+            canonical = json.dumps(self.commands(), sort_keys=True, separators=(",", ":"))
+            self._digest = hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+        return self._digest
+
+
+class CompiledScene:
+    """Serialized requests of a scene."""
+
+    def __init__(self, digest: str, requests: List[EncodedCommand]):
+        self.digest = digest
+        self.requests = requests
+
+    @property
+    def size(self) -> int:
+        """Total bytes of the request bodies."""
+        return sum(len(request.body) for request in self.requests)
+
+    def __repr__(self) -> str:
+        return f"CompiledScene({len(self.requests)} requests, {self.size} bytes)"
+
+
+class SceneCompiler:
+    """Compiles scenes and memoizes the result by content hash."""
+
+    def __init__(
+        self,
+        codec: Optional[JSONCodec] = None,
+        max_commands: int = 16,
+        cache_size: int = 64
+    ):
+        """
+        Initialize the compiler.
+
+        Args:
+            codec: Codec the payloads are serialized with
+            max_commands: Commands per Draw/CommandList request
+            cache_size: Compiled scenes kept in the LRU
+        """
+        self.codec = codec or JSONCodec()
+        self.max_commands = max_commands
+        self.cache_size = cache_size
+        self._compiled: "OrderedDict[str, CompiledScene]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Cache hit and miss counters."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._compiled)}
+
+    def compile(self, scene: Scene) -> CompiledScene:
+        """
+        Compile a scene, or return its memoized compilation.
+
+        Args:
+            scene: Scene to compile
+
+        Returns:
+            The scene's requests, ready to send
+        """
+        digest = scene.digest
+        compiled = self._compiled.get(digest)
+        if compiled is not None:
+            self._compiled.move_to_end(digest)
+            self.hits += 1
+            return compiled
+
+        self.misses += 1
+        commands = scene.commands()
+        if len(commands) == 1:
+            requests = [EncodedCommand(commands[0], self.codec)]
+        else:
+            requests = [
+                EncodedCommand({
+                    "Command": "Draw/CommandList",
+                    "CommandList": commands[i:i + self.max_commands]
+                }, self.codec)
+                for i in range(0, len(commands), self.max_commands)
+            ]
+        compiled = self._compiled[digest] = CompiledScene(digest, requests)
+        while len(self._compiled) > self.cache_size:
+            self._compiled.popitem(last=False)
+        return compiled
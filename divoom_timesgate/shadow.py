@@ -0,0 +1,204 @@
+"""
+Shadow device state for write-side no-op suppression.
+
+Remembers the last acknowledged value of every idempotent setter so that
+re-applying an unchanged value can complete locally without a round trip.
+"""
+
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+# Whole-device settings: survive channel and panel content changes
+DEVICE_SETTINGS = frozenset([
+    "Channel/SetBrightness",
+    "Channel/OnOffScreen",
+    "Device/SetTime24Flag",
+    "Device/SetDisTempMode",
+    "Device/SetMirrorMode",
+    "Sys/TimeZone",
+    "Sys/LogAndLat",
+])
+
+# Idempotent commands that decide what a panel (or all panels) shows
+PANEL_CONTENT = frozenset([
+    "Channel/SetWholeDial",
+    "Channel/SetIndividualDial",
+    "Tools/SetScoreBoard",
+    "Tools/SetNoiseStatus",
+])
+
+# Commands that change neither settings nor what the panels show
+NEUTRAL_COMMANDS = frozenset([
+    "Device/SetUTC",
+    "Device/PlayBuzzer",
+])
+
+# Channel/GetAllConf field -> setter command and parameter it mirrors
+CONFIG_FIELDS = {
+    "Brightness": ("Channel/SetBrightness", "Brightness"),
+    "LightSwitch": ("Channel/OnOffScreen", "OnOff"),
+    "Time24Flag": ("Device/SetTime24Flag", "Mode"),
+    "TemperatureMode": ("Device/SetDisTempMode", "Mode"),
+    "MirrorFlag": ("Device/SetMirrorMode", "Mode"),
+}
+
+Key = Tuple[str, Optional[int]]
+
+
+def _panel_of(command: Dict[str, Any]) -> Optional[int]:
+    """LCD panel addressed by a command, or None for the whole device."""
+    lcd_id = command.get("LcdId", command.get("LcdIndex"))
+    return int(lcd_id) if lcd_id is not None else None
+
+
+def _params(command: Dict[str, Any]) -> Hashable:
+    """Comparable representation of a command's parameters."""
+    return tuple(sorted((k, repr(v)) for k, v in command.items() if k != "Command"))
+
+
+class ShadowState:
+    """Last acknowledged value of every idempotent setter."""
+
+    def __init__(self):
+        self._values: Dict[Key, Hashable] = {}
+        self._pending: Dict[Key, Dict[str, Any]] = {}
+        self.suppressed = 0
+        self.resyncs = 0
+        self.drift = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Shadow counters for monitoring."""
+        return {
+            "suppressed": self.suppressed,
+            "entries": len(self._values),
+            "resyncs": self.resyncs,
+            "drift": self.drift
+        }
+
+    @staticmethod
+    def _key(command: Dict[str, Any]) -> Optional[Key]:
+        """Shadow key of an idempotent setter, or None."""
+        name = command.get("Command")
+        if name in DEVICE_SETTINGS:
+            return (name, None)
+        if name in PANEL_CONTENT:
+            return (name, _panel_of(command))
+        return None
+
+    def is_noop(self, command: Dict[str, Any]) -> bool:
+        """
+        Check whether a command would not change the device.
+
+        Args:
+            command: Command dictionary
+
+        Returns:
+            True if the same value was acknowledged and nothing has
+            changed it since
+        """
+        key = self._key(command)
+        if key is None or key not in self._values:
+            return False
+        if self._values[key] != _params(command):
+            return False
+        self.suppressed += 1
+        return True
+
+    def begin(self, command: Dict[str, Any]):
+        """
+        Note that a command is about to be sent.
+
+        The command's own shadow entry and every entry it overrides are
+        dropped until the device acknowledges it.
+
+        Args:
+            command: Command dictionary
+        """
+        name = command.get("Command", "")
+        if name == "Draw/CommandList":
+            for sub_command in command.get("CommandList", []):
+                self.begin(sub_command)
+            return
+        if name in NEUTRAL_COMMANDS or "/Get" in name:
+            return
+
+        key = self._key(command)
+        if key is not None and key[0] in DEVICE_SETTINGS:
+            self._forget(key)
+        elif key is not None or name.startswith(("Channel/", "Tools/", "Draw/", "Device/PlayTFGif")):
+            self._forget_content(_panel_of(command))
+        else:
+            self.clear()
+
+        if key is not None:
+            self._pending[key] = command
+
+    def acknowledge(self, command: Dict[str, Any]):
+        """
+        Record the value of an acknowledged command.
+
+        Args:
+            command: Command that the device accepted
+        """
+        if command.get("Command") == "Draw/CommandList":
+            for sub_command in command.get("CommandList", []):
+                self.acknowledge(sub_command)
+            return
+
+        key = self._key(command)
+        if key is not None and self._pending.get(key) is command:
+            del self._pending[key]
+            self._values[key] = _params(command)
+
+    def discard(self, command: Dict[str, Any]):
+        """
+        Forget a command whose outcome is unknown.
+
+        Args:
+            command: Command that failed
+        """
+        if command.get("Command") == "Draw/CommandList":
+            for sub_command in command.get("CommandList", []):
+                self.discard(sub_command)
+            return
+
+        key = self._key(command)
+        if key is not None and self._pending.get(key) is command:
+            del self._pending[key]
+
+    def reconcile(self, config: Dict[str, Any]):
+        """
+        Resynchronize with a Channel/GetAllConf response.
+
+        Device settings are replaced by what the device reports; panel
+        content cannot be read back and is forgotten.
+
+        Args:
+            config: Response of Channel/GetAllConf
+        """
+        self.resyncs += 1
+        for field, (name, param) in CONFIG_FIELDS.items():
+            if field not in config:
+                continue
+            key = (name, None)
+            value = _params({param: config[field]})
+            if key in self._values and self._values[key] != value:
+                self.drift += 1
+            if key not in self._pending:
+                self._values[key] = value
+        self._forget_content(None)
+
+    def _forget(self, key: Key):
+        self._values.pop(key, None)
+        self._pending.pop(key, None)
+
+    def _forget_content(self, panel: Optional[int]):
+        """Drop content shadows of one panel (and whole-device content)."""
+        for key in list(self._values) + list(self._pending):
+            if key[0] in PANEL_CONTENT and (panel is None or key[1] in (None, panel)):
+                self._forget(key)
+
+    def clear(self):
+        """Forget everything."""
+        self._values.clear()
+        self._pending.clear()
@@ -0,0 +1,331 @@
+"""
+Sprite and tile compositing for game and scoreboard displays.
+
+Sprites are preprocessed once: their alpha is turned into a boolean mask
+(fully opaque or transparent sprites) or into premultiplied color plus
+inverse alpha (translucent sprites), so drawing is a masked copy or one
+integer multiply-add. A Compositor keeps z-ordered layers of placed
+sprites and tile maps and tracks the rectangles that changed; render()
+recomposites only those rectangles into its frame.
+
+Requires numpy.
+"""
+
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from .framebuffer import Color, Frame, parse_color
+
+# (left, top, right, bottom), right and bottom exclusive
+Rect = Tuple[int, int, int, int]
+
+
+def _intersect(a: Rect, b: Rect) -> Optional[Rect]:
+    left, top = max(a[0], b[0]), max(a[1], b[1])
+    right, bottom = min(a[2], b[2]), min(a[3], b[3])
+    if left < right and top < bottom:
+        return (left, top, right, bottom)
+    return None
+
+
+class Sprite:
+    """An RGBA image prepared for fast blending."""
+
+    def __init__(self, pixels: "np.ndarray", color_key: Optional[Color] = None):
+        """
+        Prepare a sprite.
+
+        Args:
+            pixels: ``(height, width, 4)`` RGBA or ``(height, width, 3)`` RGB
+                uint8 array
+            color_key: For RGB pixels, a color treated as transparent
+        """
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        if pixels.ndim != 3 or pixels.shape[2] not in (3, 4):
+            raise ValueError("Sprite pixels must be a (height, width, 3 or 4) array")
+
+        rgb = np.ascontiguousarray(pixels[..., :3])
+        if pixels.shape[2] == 4:
+            alpha = pixels[..., 3]
+        elif color_key is not None:
+            alpha = np.where((rgb == parse_color(color_key)).all(axis=2), 0, 255).astype(np.uint8)
+        else:
+            alpha = np.full(rgb.shape[:2], 255, dtype=np.uint8)
+
+        self.rgb = rgb
+        self.height, self.width = rgb.shape[:2]
+        self.mask = alpha > 0
+        self.opaque = bool(((alpha == 0) | (alpha == 255)).all())
+        if self.opaque:
+            self.premultiplied = None
+            self.inverse_alpha = None
+        else:
+            self.premultiplied = rgb.astype(np.uint32) * alpha[..., None]
+            self.inverse_alpha = (255 - alpha.astype(np.uint32))[..., None]
+
+    def __repr__(self) -> str:
+        return f"Sprite({self.width}x{self.height})"
+
+    def draw(self, target: "np.ndarray", x: int, y: int, clip: Optional[Rect] = None):
+        """
+        Blend the sprite onto an RGB array, clipped to the array and ``clip``.
+
+        Args:
+            target: ``(height, width, 3)`` uint8 array to draw into
+            x: Destination column of the sprite's left edge
+            y: Destination row of the sprite's top edge
+            clip: Optional rectangle of the target to restrict drawing to
+        """
+        bounds = (0, 0, target.shape[1], target.shape[0])
+        if clip is not None:
+            bounds = _intersect(bounds, clip)
+            if bounds is None:
+                return
+        area = _intersect(bounds, (x, y, x + self.width, y + self.height))
+        if area is None:
+            return
+
+        left, top, right, bottom = area
+        region = target[top:bottom, left:right]
+        source = (slice(top - y, bottom - y), slice(left - x, right - x))
+        if self.opaque:
+            mask = self.mask[source]
+            region[mask] = self.rgb[source][mask]
+        else:
+            blended = self.premultiplied[source] + region * self.inverse_alpha[source] + 127
+            region[...] = blended // 255
+
+
+class SpriteSheet:
+    """Equally sized sprites cut from one image, preprocessed up front."""
+
+    def __init__(
+        self,
+        pixels: "np.ndarray",
+        tile_width: int,
+        tile_height: int,
+        color_key: Optional[Color] = None
+    ):
+        """
+        Cut a sheet into sprites, row by row.
+
+        Args:
+            pixels: RGBA or RGB uint8 array of the whole sheet
+            tile_width: Width of each sprite
+            tile_height: Height of each sprite
+            color_key: For RGB sheets, a color treated as transparent
+        """
+        pixels = np.asarray(pixels, dtype=np.uint8)
+        rows, columns = pixels.shape[0] // tile_height, pixels.shape[1] // tile_width
+        self.tile_width = tile_width
+        self.tile_height = tile_height
+        self.sprites = [
+            Sprite(pixels[r * tile_height:(r + 1) * tile_height, c * tile_width:(c + 1) * tile_width], color_key)
+            for r in range(rows)
+            for c in range(columns)
+        ]
+
+    def __len__(self) -> int:
+        return len(self.sprites)
+
+    def __getitem__(self, index: int) -> Sprite:
+        return self.sprites[index]
+
+
+class Layer:
+    """Sprites placed at positions, drawn in placement order."""
+
+    def __init__(self, compositor: "Compositor", z: int):
+        self._compositor = compositor
+        self.z = z
+        self._items: Dict[int, Tuple[Sprite, int, int]] = {}
+        self._next_handle = 0
+
+    def _bounds(self, handle: int) -> Rect:
+        sprite, x, y = self._items[handle]
+        return (x, y, x + sprite.width, y + sprite.height)
+
+    def place(self, sprite: Sprite, x: int, y: int) -> int:
+        """
+        Add a sprite to the layer.
+
+        Returns:
+            Handle for move(), change() and remove()
+        """
+        handle = self._next_handle
+        self._next_handle += 1
+        self._items[handle] = (sprite, x, y)
+        self._compositor.invalidate(self._bounds(handle))
+        return handle
+
+    def move(self, handle: int, x: int, y: int):
+        """Move a placed sprite."""
+        sprite, old_x, old_y = self._items[handle]
+        if (x, y) == (old_x, old_y):
+            return
+        self._compositor.invalidate(self._bounds(handle))
+        self._items[handle] = (sprite, x, y)
+        self._compositor.invalidate(self._bounds(handle))
+
+    def change(self, handle: int, sprite: Sprite):
+        """Swap the sprite shown at a placement (e.g. the next animation frame)."""
+        old, x, y = self._items[handle]
+        if sprite is old:
+            return
+        self._compositor.invalidate(self._bounds(handle))
+        self._items[handle] = (sprite, x, y)
+        self._compositor.invalidate(self._bounds(handle))
+
+    def remove(self, handle: int):
+        """Remove a placed sprite."""
+        self._compositor.invalidate(self._bounds(handle))
+        del self._items[handle]
+
+    def draw(self, target: "np.ndarray", clip: Rect):
+        """Draw every placement intersecting ``clip``."""
+        for sprite, x, y in self._items.values():
+            sprite.draw(target, x, y, clip)
+
+
+class TileLayer(Layer):
+    """A grid of sprite-sheet tiles; -1 marks an empty cell."""
+
+    def __init__(
+        self,
+        compositor: "Compositor",
+        z: int,
+        sheet: SpriteSheet,
+        tiles: Union["np.ndarray", Sequence[Sequence[int]]],
+        x: int = 0,
+        y: int = 0
+    ):
+        super().__init__(compositor, z)
+        self.sheet = sheet
+        self.tiles = np.array(tiles, dtype=np.int32)
+        self.x = x
+        self.y = y
+        rows, columns = self.tiles.shape
+        compositor.invalidate((x, y, x + columns * sheet.tile_width, y + rows * sheet.tile_height))
+
+    def set_tile(self, column: int, row: int, index: int):
+        """Change one cell."""
+        if self.tiles[row, column] == index:
+            return
+        self.tiles[row, column] = index
+        left = self.x + column * self.sheet.tile_width
+        top = self.y + row * self.sheet.tile_height
+        self._compositor.invalidate((left, top, left + self.sheet.tile_width, top + self.sheet.tile_height))
+
+    def draw(self, target: "np.ndarray", clip: Rect):
+        """Draw the tiles intersecting ``clip``, then any placed sprites."""
+        width, height = self.sheet.tile_width, self.sheet.tile_height
+        rows, columns = self.tiles.shape
+        first_column = max(0, (clip[0] - self.x) // width)
+        first_row = max(0, (clip[1] - self.y) // height)
+        last_column = min(columns, -(-(clip[2] - self.x) // width))
+        last_row = min(rows, -(-(clip[3] - self.y) // height))
+        for row in range(first_row, last_row):
+            for column in range(first_column, last_column):
+                index = self.tiles[row, column]
+                if index >= 0:
+                    self.sheet[index].draw(target, self.x + column * width, self.y + row * height, clip)
+        super().draw(target, clip)
+
+
+class Compositor:
+    """Z-ordered layers composited into a frame, redrawing only what changed."""
+
+    def __init__(
+        self,
+        frame: Optional[Frame] = None,
+        background: Color = "#000000",
+        max_rects: int = 16
+    ):
+        """
+        Initialize the compositor.
+
+        Args:
+            frame: Frame (or Canvas) to composite into; a new 64x64 frame by
+                default
+            background: Color under the lowest layer
+            max_rects: Dirty rectangles tracked before falling back to one
+                full redraw
+        """
+        self.frame = frame if frame is not None else Frame()
+        self.background = parse_color(background)
+        self.max_rects = max_rects
+        self._layers: List[Layer] = []
+        self._dirty: List[Rect] = [self._full]
+        self.pixels_drawn = 0
+
+    @property
+    def _full(self) -> Rect:
+        return (0, 0, self.frame.width, self.frame.height)
+
+    def layer(self, z: int = 0) -> Layer:
+        """Sprite layer at depth ``z`` (higher is drawn on top), created on first use."""
+        for layer in self._layers:
+            if layer.z == z and type(layer) is Layer:
+                return layer
+        return self._add(Layer(self, z))
+
+    def tile_layer(
+        self,
+        sheet: SpriteSheet,
+        tiles: Union["np.ndarray", Sequence[Sequence[int]]],
+        z: int = 0,
+        x: int = 0,
+        y: int = 0
+    ) -> TileLayer:
+        """
+        Add a tile map layer.
+
+        Args:
+            sheet: Sprite sheet the tile indices refer to
+            tiles: ``(rows, columns)`` grid of sprite indices (-1 for empty)
+            z: Depth (higher is drawn on top)
+            x: Left edge of the map
+            y: Top edge of the map
+        """
+        return self._add(TileLayer(self, z, sheet, tiles, x, y))
+
+    def _add(self, layer: Layer) -> Layer:
+        self._layers.append(layer)
+        # Stable sort keeps creation order among layers of equal depth
+        self._layers.sort(key=lambda item: item.z)
+        return layer
+
+    def invalidate(self, rect: Optional[Rect] = None):
+        """
+        Mark a rectangle (or the whole frame) for redrawing.
+
+        Args:
+            rect: Rectangle in frame coordinates; None for everything
+        """
+        rect = self._full if rect is None else _intersect(rect, self._full)
+        if rect is None:
+            return
+        if len(self._dirty) >= self.max_rects:
+            self._dirty = [self._full]
+        elif self._full not in self._dirty:
+            self._dirty.append(rect)
+
+    def render(self) -> List[Rect]:
+        """
+        Recomposite the dirty rectangles into the frame.
+
+        Returns:
+            The rectangles redrawn (empty if nothing changed)
+        """
+        dirty, self._dirty = self._dirty, []
+        if self._full in dirty:
+            dirty = [self._full]
+        target = self.frame.pixels
+        for rect in dirty:
+            left, top, right, bottom = rect
+            target[top:bottom, left:right] = self.background
+            for layer in self._layers:
+                layer.draw(target, rect)
+            self.pixels_drawn += (right - left) * (bottom - top)
+        return dirty
@@ -0,0 +1,147 @@
+"""
+Live frame streaming to a panel.
+
+Frames are pulled from an async iterator at most ``fps`` times per second,
+grouped into chunks and encoded while the previous chunk is still being
+uploaded. When the device falls behind, only the newest encoded chunk is
+kept: older ones are dropped instead of queueing up latency.
+
+Requires numpy.
+"""
+
+import asyncio
+import time
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, List, Optional
+import logging
+
+from .framebuffer import RGB888, as_pixels, encode_frames
+
+logger = logging.getLogger(__name__)
+
+
+class FrameStream:
+    """Pipelined, frame-dropping uploader for one stream."""
+
+    def __init__(
+        self,
+        send_chunk: Callable[[List[str]], Awaitable[Any]],
+        fps: float = 10.0,
+        chunk_size: int = 1,
+        pixel_format: str = RGB888,
+        quantizer: Any = None
+    ):
+        """
+        Initialize the stream.
+
+        Args:
+            send_chunk: Coroutine function that uploads a list of encoded
+                frames as one animation
+            fps: Maximum frames consumed per second
+            chunk_size: Frames per uploaded animation (1 shows every frame
+                as soon as it arrives; larger chunks trade latency for fewer
+                PicID switches)
+            pixel_format: PicData pixel format
+            quantizer: Optional quantize.Quantizer applied to each chunk
+        """
+        if fps <= 0:
+            raise ValueError("FPS must be positive")
+        if chunk_size < 1:
+            raise ValueError("Chunk size must be at least 1")
+
+        self._send_chunk = send_chunk
+        self.fps = fps
+        self.chunk_size = chunk_size
+        self.pixel_format = pixel_format
+        self.quantizer = quantizer
+        self._pending: Optional[List[str]] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._finished = False
+        self.frames_in = 0
+        self.frames_sent = 0
+        self.frames_dropped = 0
+        self.chunks_sent = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Frame and chunk counters."""
+        return {
+            "frames_in": self.frames_in,
+            "frames_sent": self.frames_sent,
+            "frames_dropped": self.frames_dropped,
+            "chunks_sent": self.chunks_sent
+        }
+
+    async def run(self, frames: AsyncIterable[Any]) -> Dict[str, int]:
+        """
+        Stream frames until the iterator is exhausted.
+
+        Args:
+            frames: Async iterator of 64x64 frames or RGB uint8 arrays
+
+        Returns:
+            Stream counters
+        """
+        self._ready = asyncio.Event()
+        self._finished = False
+        sender = asyncio.ensure_future(self._send_loop())
+        try:
+            await self._produce(frames, sender)
+        except BaseException:
+            sender.cancel()
+            raise
+        finally:
+            self._finished = True
+            self._ready.set()
+
+        await sender
+        return self.stats
+
+    async def _produce(self, frames: AsyncIterable[Any], sender: asyncio.Future):
+        """Pace, chunk and encode frames, handing chunks to the sender."""
+        interval = 1.0 / self.fps
+        next_frame = time.monotonic()
+        chunk = []
+        async for frame in frames:
+            if sender.done():
+                # The sender failed; stop consuming and surface its error
+                break
+            self.frames_in += 1
+            # Copy: generators commonly redraw the same buffer every frame
+            chunk.append(as_pixels(frame).copy())
+            if len(chunk) == self.chunk_size:
+                self._hand_over(chunk)
+                chunk = []
+
+            next_frame += interval
+            delay = next_frame - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                # Behind schedule: do not try to catch up with a burst
+                next_frame = time.monotonic()
+
+        if chunk and not sender.done():
+            self._hand_over(chunk)
+
+    def _hand_over(self, chunk: List[Any]):
+        """Encode a chunk and make it the newest pending upload."""
+        encoded = encode_frames(chunk, self.pixel_format, self.quantizer)
+        if self._pending is not None:
+            self.frames_dropped += len(self._pending)
+        self._pending = encoded
+        self._ready.set()
+
+    async def _send_loop(self):
+        """Upload the newest pending chunk until the producer is done."""
+        while True:
+            if self._pending is None:
+                if self._finished:
+                    return
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            chunk, self._pending = self._pending, None
+            await self._send_chunk(chunk)
+            self.frames_sent += len(chunk)
+            self.chunks_sent += 1
@@ -0,0 +1,231 @@
+"""
+Client-side bitmap text for panel frames.
+
+Draw/SendHttpText does not show up over HTTP, so text is rasterized
+locally and uploaded as a frame instead. Two bitmap fonts are bundled (a
+3x5 and a 5x7 ASCII font) and scaled by whole pixels to the FontSize tiers:
+
+    TINY   3x5  x1   5 px line
+    SMALL  5x7  x1   8 px line
+    MEDIUM 3x5  x2  11 px line
+    LARGE  5x7  x2  14 px line
+    HUGE   3x5  x3  16 px line
+
+Every font keeps its glyphs in one preloaded atlas array, so rendering a
+string is a single gather and reshape; rendered strings are memoized.
+
+Requires numpy.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .framebuffer import PANEL_SIZE, Color, Frame, parse_color
+from .models import FontSize, TextAlignment
+
+# 5x7 font, ASCII 32-126: five column bytes per glyph, bit 0 is the top row
+_FONT_5X7 = (
+    "0000000000 00005f0000 0007000700 147f147f14 242a7f2a12 2313086462 3649552250 0005030000 "
+    "001c224100 0041221c00 082a1c2a08 08083e0808 0050300000 0808080808 0060600000 2010080402 "
+    "3e5149453e 00427f4000 4261514946 2141454b31 1814127f10 2745454539 3c4a494930 0171090503 "
+    "3649494936 064949291e 0036360000 0056360000 0814224100 1414141414 0041221408 0201510906 "
+    "324979413e 7e1111117e 7f49494936 3e41414122 7f4141221c 7f49494941 7f09090101 3e41415132 "
+    "7f0808087f 00417f4100 2040413f01 7f08142241 7f40404040 7f0204027f 7f0408107f 3e4141413e "
+    "7f09090906 3e4151215e 7f09192946 4649494931 01017f0101 3f4040403f 1f2040201f 7f2018207f "
+    "6314081463 0304780403 6151494543 00007f4141 0204081020 41417f0000 0402010204 4040404040 "
+    "0001020400 2054545478 7f48444438 3844444420 384444487f 3854545418 087e090102 081454543c "
+    "7f08040478 00447d4000 2040443d00 007f102844 00417f4000 7c0418047c 7c08040478 3844444438 "
+    "7c14141408 081414187c 7c08040408 4854545420 043f444020 3c4040207c 1c2040201c 3c4030403c "
+    "4428102844 0c5050503c 4464544c44 0008364100 00007f0000 0041360800 0201020402"
+)
+
+# 3x5 font, ASCII 32-96: five octal rows per glyph, 4 is the left column.
+# Lowercase letters reuse the uppercase glyphs; {|}~ are in _FONT_3X5_EXTRA.
+_FONT_3X5 = (
+    "00000 22202 55000 57575 36236 51245 25253 22000 12221 42224 05250 02720 00024 00700 00002 11244 "
+    "75557 26227 71747 71717 55711 74717 74757 71111 75757 75717 02020 02024 12421 07070 42124 71202 "
+    "25743 25755 65656 34443 65556 74647 74644 34553 55755 72227 11153 55655 44447 57755 65555 25552 "
+    "65644 25563 65655 34216 72222 55557 55552 55775 55255 55222 71247 64446 44211 32223 25000 00007 "
+    "42000"
+)
+_FONT_3X5_EXTRA = "32623 22222 62326 03600"
+
+# FontSize -> (font, scale, line height)
+_TIERS = {
+    FontSize.TINY: ("3x5", 1, 5),
+    FontSize.SMALL: ("5x7", 1, 8),
+    FontSize.MEDIUM: ("3x5", 2, 11),
+    FontSize.LARGE: ("5x7", 2, 14),
+    FontSize.HUGE: ("3x5", 3, 16),
+}
+
+
+def _glyphs_5x7() -> "np.ndarray":
+    """``(128, 7, 5)`` bool glyphs of the 5x7 font."""
+    glyphs = np.zeros((128, 7, 5), dtype=bool)
+    for code, columns in enumerate(_FONT_5X7.split(), start=32):
+        values = np.frombuffer(bytes.fromhex(columns), dtype=np.uint8)
+        glyphs[code] = (values[None, :] >> np.arange(7)[:, None]) & 1
+    return glyphs
+
+
+def _glyphs_3x5() -> "np.ndarray":
+    """``(128, 5, 3)`` bool glyphs of the 3x5 font."""
+    glyphs = np.zeros((128, 5, 3), dtype=bool)
+    for code, rows in enumerate(_FONT_3X5.split(), start=32):
+        values = np.array([int(row, 8) for row in rows])
+        glyphs[code] = (values[:, None] >> np.array([2, 1, 0])[None, :]) & 1
+    glyphs[ord("a"):ord("z") + 1] = glyphs[ord("A"):ord("Z") + 1]
+    for code, rows in enumerate(_FONT_3X5_EXTRA.split(), start=ord("{")):
+        values = np.array([int(row, 8) for row in rows])
+        glyphs[code] = (values[:, None] >> np.array([2, 1, 0])[None, :]) & 1
+    return glyphs
+
+
+class BitmapFont:
+    """A fixed-width bitmap font with a preloaded glyph atlas."""
+
+    def __init__(
+        self,
+        glyphs: "np.ndarray",
+        scale: int = 1,
+        line_height: Optional[int] = None,
+        cache_size: int = 256
+    ):
+        """
+        Initialize the font.
+
+        Args:
+            glyphs: ``(128, height, width)`` bool glyph bitmaps indexed by
+                ASCII code; characters without a glyph render as "?"
+            scale: Whole-pixel magnification
+            line_height: Rendered height (default: the scaled glyph height)
+            cache_size: Rendered strings kept in the LRU
+        """
+        glyphs = glyphs.repeat(scale, axis=1).repeat(scale, axis=2)
+        count, height, width = glyphs.shape
+        self.scale = scale
+        self.height = line_height or height
+        if self.height < height:
+            raise ValueError("Line height is smaller than the glyphs")
+
+        # Atlas cells are padded to the line height plus one glyph gap, so a
+        # string is just atlas[codes] laid side by side
+        self.atlas = np.zeros((count, self.height, width + scale), dtype=bool)
+        self.atlas[:, :height, :width] = glyphs
+        blank = ~glyphs.any(axis=(1, 2))
+        blank[ord(" ")] = False
+        self.atlas[blank] = self.atlas[ord("?")]
+        self.advance = width + scale
+        self.mask = lru_cache(maxsize=cache_size)(self._render)
+
+    def __repr__(self) -> str:
+        return f"BitmapFont({self.advance - self.scale}x{self.height})"
+
+    def width(self, text: str) -> int:
+        """Rendered width of a string in pixels."""
+        return max(0, len(text) * self.advance - self.scale)
+
+    def _render(self, text: str) -> "np.ndarray":
+        """Bool mask of a rendered string, ``(height, width(text))``; read-only."""
+        codes = np.frombuffer(text.encode("ascii", "replace"), dtype=np.uint8)
+        cells = self.atlas[codes]
+        mask = cells.transpose(1, 0, 2).reshape(self.height, len(codes) * self.advance)[:, :self.width(text)]
+        mask.flags.writeable = False
+        return mask
+
+
+_FONTS: Dict[FontSize, BitmapFont] = {}
+
+
+def font(size: FontSize = FontSize.SMALL) -> BitmapFont:
+    """
+    Bundled font of a FontSize tier.
+
+    Args:
+        size: Font size tier
+
+    Returns:
+        The shared BitmapFont of that tier
+    """
+    size = FontSize(size)
+    bitmap = _FONTS.get(size)
+    if bitmap is None:
+        name, scale, line_height = _TIERS[size]
+        glyphs = _glyphs_5x7() if name == "5x7" else _glyphs_3x5()
+        bitmap = _FONTS[size] = BitmapFont(glyphs, scale, line_height)
+    return bitmap
+
+
+def text_size(text: str, size: FontSize = FontSize.SMALL) -> Tuple[int, int]:
+    """(width, height) of a rendered string."""
+    bitmap = font(size)
+    return bitmap.width(text), bitmap.height
+
+
+def draw_text(
+    frame: Frame,
+    text: str,
+    x: int,
+    y: int,
+    color: Color,
+    size: FontSize = FontSize.SMALL
+) -> Frame:
+    """
+    Draw a string onto a frame, clipped to the frame.
+
+    Args:
+        frame: Frame to draw into
+        text: Single line of ASCII text
+        x: Left edge
+        y: Top edge of the line
+        color: Text color (the background is left untouched)
+        size: Font size tier
+
+    Returns:
+        The frame
+    """
+    mask = font(size).mask(text)
+    height, width = mask.shape
+    x0, y0 = max(x, 0), max(y, 0)
+    x1, y1 = min(x + width, frame.width), min(y + height, frame.height)
+    if x0 < x1 and y0 < y1:
+        frame.pixels[y0:y1, x0:x1][mask[y0 - y:y1 - y, x0 - x:x1 - x]] = parse_color(color)
+    return frame
+
+
+def render_text(
+    text: str,
+    color: Color = "#FFFFFF",
+    background: Color = "#000000",
+    size: FontSize = FontSize.SMALL,
+    alignment: TextAlignment = TextAlignment.CENTER,
+    width: int = PANEL_SIZE,
+    height: int = PANEL_SIZE
+) -> Frame:
+    """
+    Render a string onto a new frame, vertically centered.
+
+    Args:
+        text: Single line of ASCII text
+        color: Text color
+        background: Background color
+        size: Font size tier
+        alignment: Horizontal alignment
+        width: Frame width
+        height: Frame height
+
+    Returns:
+        The rendered frame (text wider than the frame is clipped)
+    """
+    text_width, text_height = text_size(text, size)
+    if alignment == TextAlignment.LEFT:
+        x = 0
+    elif alignment == TextAlignment.RIGHT:
+        x = width - text_width
+    else:
+        x = (width - text_width) // 2
+    frame = Frame(width, height).fill(background)
+    return draw_text(frame, text, x, (height - text_height) // 2, color, size)
@@ -0,0 +1,269 @@
+"""
+HTTP transports for Times Gate devices.
+
+A transport owns the connections used to talk to devices. One transport
+can be shared by many TimesGateDevice instances so they reuse a single
+connection pool, DNS cache and set of keep-alive connections.
+
+``Transport`` is the interface devices depend on. ``AiohttpTransport`` is
+the default; ``RawHttpTransport`` (in ``rawhttp``) trades aiohttp's
+generality for a much cheaper per-request path, and ``LoopbackTransport``
+(in ``loopback``) talks to an in-process emulator without sockets.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+import logging
+
+import aiohttp
+
+from .exceptions import TimesGateConnectionError
+from .ratelimit import AdaptiveRateLimiter, RateStore
+
+logger = logging.getLogger(__name__)
+
+# Body used to open a connection ahead of the first real command
+_WARMUP_BODY = b'{"Command": "Channel/GetAllConf"}'
+
+
+class Transport:
+    """Interface between devices and the network.
+
+    Subclasses implement ``_open``, ``_close`` and ``_request``; pacing,
+    request counters and learned-rate persistence are shared.
+    """
+
+    def __init__(
+        self,
+        prewarm: bool = False,
+        adaptive_rate: bool = False,
+        rate_store_path: Optional[str] = None,
+        rate_limiter_options: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            prewarm: Open a connection when a device connects
+            adaptive_rate: Pace each device with an AIMD rate limiter that
+                learns its sustainable command rate
+            rate_store_path: JSON file where learned rates are loaded from
+                on start and saved to on close
+            rate_limiter_options: Extra AdaptiveRateLimiter arguments
+        """
+        self.prewarm = prewarm
+        self.adaptive_rate = adaptive_rate
+        self._rate_store = RateStore(rate_store_path) if rate_store_path else None
+        self._rate_limiter_options = dict(rate_limiter_options or {})
+        self._learned_rates: Dict[str, float] = {}
+        self._limiters: Dict[str, AdaptiveRateLimiter] = {}
+        self._started = False
+        self.requests = 0
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    @property
+    def started(self) -> bool:
+        """True between start() and close()."""
+        return self._started
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Connection reuse counters."""
+        return {
+            "requests": self.requests,
+            "connections_created": self.connections_created,
+            "connections_reused": self.connections_reused
+        }
+
+    @property
+    def rate_stats(self) -> Dict[str, Dict[str, float]]:
+        """Learned rate and adjustment counters per device URL."""
+        return {url: limiter.stats for url, limiter in self._limiters.items()}
+
+    def limiter(self, url: str) -> AdaptiveRateLimiter:
+        """
+        Return the rate limiter of a device, creating it on first use.
+
+        Args:
+            url: Device endpoint URL
+        """
+        limiter = self._limiters.get(url)
+        if limiter is None:
+            options = dict(self._rate_limiter_options)
+            if url in self._learned_rates:
+                options["rate"] = self._learned_rates[url]
+            limiter = self._limiters[url] = AdaptiveRateLimiter(**options)
+        return limiter
+
+    async def start(self):
+        """Open the transport."""
+        if self._started:
+            return
+
+        if self._rate_store is not None:
+            self._learned_rates = self._rate_store.load()
+        await self._open()
+        self._started = True
+
+    async def close(self):
+        """Close every connection."""
+        if self._rate_store is not None and self._limiters:
+            self._learned_rates.update(
+                (url, limiter.rate) for url, limiter in self._limiters.items()
+            )
+            self._rate_store.save(self._learned_rates)
+        if self._started:
+            self._started = False
+            await self._close()
+
+    async def post(self, url: str, body: bytes) -> bytes:
+        """
+        POST a request body and return the raw response body.
+
+        Args:
+            url: Device endpoint URL
+            body: Encoded JSON command
+
+        Returns:
+            Response body
+
+        Raises:
+            TimesGateConnectionError: If the request fails
+        """
+        if not self._started:
+            await self.start()
+
+        limiter = self.limiter(url) if self.adaptive_rate else None
+        if limiter is not None:
+            await limiter.acquire()
+
+        self.requests += 1
+        start = time.monotonic()
+        try:
+            data = await self._request(url, body)
+        except TimesGateConnectionError:
+            if limiter is not None:
+                limiter.on_failure()
+            raise
+
+        if limiter is not None:
+            limiter.on_success(time.monotonic() - start)
+        return data
+
+    async def warm(self, url: str):
+        """
+        Open a connection to a device ahead of the first command.
+
+        Args:
+            url: Device endpoint URL
+        """
+        try:
+            await self.post(url, _WARMUP_BODY)
+        except TimesGateConnectionError as e:
+            logger.debug(f"Pre-warming {url} failed: {e}")
+
+    async def _open(self):
+        """Allocate connection resources."""
+        raise NotImplementedError
+
+    async def _close(self):
+        """Release connection resources."""
+        raise NotImplementedError
+
+    async def _request(self, url: str, body: bytes) -> bytes:
+        """
+        Send one request.
+
+        Raises:
+            TimesGateConnectionError: If the request fails
+        """
+        raise NotImplementedError
+
+
+class AiohttpTransport(Transport):
+    """aiohttp connection pool shared by one or more devices."""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        keepalive_timeout: float = 30.0,
+        limit_per_host: int = 1,
+        limit: int = 0,
+        dns_cache_ttl: int = 300,
+        **kwargs
+    ):
+        """
+        Initialize the transport.
+
+        Args:
+            timeout: Total timeout per request in seconds
+            keepalive_timeout: Seconds an idle connection is kept open
+            limit_per_host: Connections per device (the firmware handles one
+                request at a time, so more than one rarely helps)
+            limit: Total connections across all devices (0 for no limit)
+            dns_cache_ttl: Seconds to cache DNS lookups
+            **kwargs: Transport arguments (prewarm, adaptive_rate, ...)
+        """
+        super().__init__(**kwargs)
+        self.keepalive_timeout = keepalive_timeout
+        self.limit_per_host = limit_per_host
+        self.limit = limit
+        self.dns_cache_ttl = dns_cache_ttl
+        self._timeout = aiohttp.ClientTimeout(total=timeout)
+        self._headers = {"Content-Type": "application/json"}
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    @property
+    def session(self) -> Optional[aiohttp.ClientSession]:
+        """Underlying aiohttp session (None until started)."""
+        return self._session
+
+    async def _open(self):
+        """Create the connector and session."""
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_connection_create_end.append(self._on_connection_created)
+        trace_config.on_connection_reuseconn.append(self._on_connection_reused)
+
+        connector = aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=self._timeout,
+            trace_configs=[trace_config]
+        )
+
+    async def _close(self):
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    async def _on_connection_created(self, session, context, params):
+        self.connections_created += 1
+
+    async def _on_connection_reused(self, session, context, params):
+        self.connections_reused += 1
+
+    async def _request(self, url: str, body: bytes) -> bytes:
+        try:
+            async with self._session.post(url, data=body, headers=self._headers) as response:
+                data = await response.read()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            raise TimesGateConnectionError(f"Failed to connect to device: {str(e)}")
+        if not 200 <= response.status < 300:
+            raise TimesGateConnectionError(f"Device answered with HTTP status {response.status}")
+        return data
@@ -33,13 +33,18 @@ async def countdown_race():
         ]
         
         print("Starting timers:")
+        # Batch the five timers into a single Draw/CommandList request
+        async with device.batch():
+            await asyncio.gather(*(
+                device.set_panel_timer(
+                    panel=timer["panel"],
+                    minutes=0,
+                    seconds=timer["seconds"],
+                    start=True
+                )
+                for timer in timers
+            ))
         for timer in timers:
-            await device.set_panel_timer(
-                panel=timer["panel"],
-                minutes=0,
-                seconds=timer["seconds"],
-                start=True
-            )
             print(f"  ✓ {timer['name']}")
         
         print("\nTimers are running! Watch them count down...")
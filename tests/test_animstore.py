@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for the memory-mapped animation store.
+"""
+
+import os
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from divoom_timesgate.animstore import AnimationStore, AnimationWriter, write_animation
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.framebuffer import Frame, decode_frame
+from divoom_timesgate.loopback import LoopbackTransport
+
+
+def wall(index, panels=5):
+    """Wall frame whose panel p is filled with (index, p, 255 - index)."""
+    frame = Frame(64 * panels, 64)
+    for panel in range(panels):
+        frame.rect(panel * 64, 0, 64, 64, (index, panel + 1, 255 - index))
+    return frame
+
+
+def test_round_trip_and_zero_copy_views(tmp_path):
+    """Frames and panel strips are views into the mapped file."""
+    path = str(tmp_path / "wall.anim")
+    assert write_animation(path, (wall(i) for i in range(50)), speed=40) == 50
+
+    with AnimationStore(path) as store:
+        assert (len(store), store.panels, store.speed) == (50, 5, 40)
+        assert np.array_equal(store.frame(7), wall(7).pixels)
+
+        strip = store.panel_frames(3, 10, 20)
+        assert strip.shape == (10, 64, 64, 3)
+        assert isinstance(strip, np.memmap) and not strip.flags.owndata
+        assert (strip[:, :, :, 1] == 3).all()
+        assert (strip[4, 0, 0] == (14, 3, 241)).all()
+
+        with pytest.raises(ValueError):
+            store.panel_frames(6)
+
+
+def test_writer_is_atomic(tmp_path):
+    """A failed write leaves neither a partial file nor temp files behind."""
+    path = str(tmp_path / "wall.anim")
+    with pytest.raises(ValueError):
+        with AnimationWriter(path) as writer:
+            writer.append(wall(0))
+            writer.append(Frame())
+    assert os.listdir(str(tmp_path)) == []
+
+    with pytest.raises(ValueError):
+        AnimationStore(__file__)
+
+
+@pytest.mark.asyncio
+async def test_panel_strip_feeds_send_frames(tmp_path):
+    """A mapped panel strip uploads directly through send_frames."""
+    path = str(tmp_path / "wall.anim")
+    write_animation(path, (wall(i) for i in range(8)))
+    emulator = TimesGateEmulator()
+    with AnimationStore(path) as store:
+        async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+            await device.send_frames(2, store.panel_frames(2), speed=store.speed)
+
+    gif = emulator.state.panel(2).gif
+    assert gif["PicNum"] == 8
+    assert decode_frame(gif["Frames"][5]) == Frame().fill((5, 2, 250))
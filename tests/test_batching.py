@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for Draw/CommandList command coalescing.
+"""
+
+import asyncio
+import pytest
+
+from divoom_timesgate import TimesGateCommandError
+from divoom_timesgate.emulator import TimesGateEmulator
+
+
+@pytest.mark.asyncio
+async def test_batch_context_coalesces():
+    """Concurrent setters inside device.batch() become one request."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device() as device:
+            async with device.batch():
+                results = await asyncio.gather(*(
+                    device.set_panel_timer(panel, 0, 10 * panel) for panel in range(1, 6)
+                ))
+
+            assert results == [True] * 5
+            assert device.batch_stats["flushes"] == 1
+            assert device.batch_stats["commands"] == 5
+
+    assert emulator.stats.requests == 1
+    assert emulator.stats.commands["Draw/CommandList"] == 1
+    assert [panel.timer["Second"] for panel in emulator.state.panels] == [10, 20, 30, 40, 50]
+
+
+@pytest.mark.asyncio
+async def test_batch_is_scoped_to_its_task():
+    """Commands of other tasks are not folded into an open batch."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device() as device:
+            opened = asyncio.Event()
+            other_done = asyncio.Event()
+
+            async def other():
+                await opened.wait()
+                assert await device.set_brightness(40) is True
+                other_done.set()
+
+            async def batched():
+                async with device.batch():
+                    opened.set()
+                    await other_done.wait()
+                    await asyncio.gather(device.set_panel_timer(1, 0, 5), device.set_panel_timer(2, 0, 6))
+
+            await asyncio.gather(other(), batched())
+            assert device.batch_stats["commands"] == 2
+
+    assert emulator.stats.commands["Channel/SetBrightness"] == 1
+    assert emulator.stats.commands["Draw/CommandList"] == 1
+
+
+@pytest.mark.asyncio
+async def test_auto_batch_reads_bypass():
+    """Reads are never batched and observe earlier batched writes."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(auto_batch=True, batch_window=0.05) as device:
+            write = asyncio.ensure_future(device.set_brightness(33))
+            await asyncio.sleep(0)
+            settings = await device.get_settings()
+            assert settings["Brightness"] == 33
+            assert await write is True
+
+
+@pytest.mark.asyncio
+async def test_batch_error_propagates():
+    """A failed Draw/CommandList fails every caller in the batch."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure("Draw/CommandList", error_rate=1.0)
+        async with emulator.create_device(auto_batch=True) as device:
+            results = await asyncio.gather(
+                device.set_brightness(10),
+                device.set_mirror_mode(True),
+                return_exceptions=True
+            )
+    assert all(isinstance(result, TimesGateCommandError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_max_batch_size():
+    """Batches are split at max_batch_size."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(auto_batch=True, max_batch_size=2) as device:
+            await asyncio.gather(*(device.set_brightness(i) for i in range(5)))
+            assert device.batch_stats["flushes"] == 3
+
+
+@pytest.mark.asyncio
+async def test_interactive_commands_skip_batch():
+    """Alerts are sent immediately instead of waiting for the batch window."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(auto_batch=True, batch_window=10) as device:
+            await asyncio.wait_for(device.play_buzzer(100, 100, 100), 1)
+    assert emulator.stats.commands["Draw/CommandList"] == 0
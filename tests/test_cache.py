@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Tests for the read-through state cache.
+"""
+
+import asyncio
+import pytest
+
+from divoom_timesgate import TimesGateCommandError
+from divoom_timesgate.cache import StateCache
+from divoom_timesgate.emulator import TimesGateEmulator
+
+
+@pytest.mark.asyncio
+async def test_settings_served_from_cache():
+    """Repeated get_settings only reaches the device once."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(cache_ttl=60) as device:
+            for _ in range(3):
+                await device.get_settings()
+            assert device.cache_stats["hits"] == 2
+            assert device.cache_stats["misses"] == 1
+    assert emulator.stats.commands["Channel/GetAllConf"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mutating_a_result_leaves_the_cache_intact():
+    """Callers get their own copy of cached lists."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(cache_ttl=60) as device:
+            fonts = await device.get_font_list()
+            expected = [dict(font) for font in fonts]
+            fonts.clear()
+            cached = await device.get_font_list()
+            assert cached == expected and cached
+            cached[0]["name"] = "changed"
+            assert await device.get_font_list() == expected
+            assert device.cache_stats["hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_setter_patches_cached_settings():
+    """set_brightness patches the cached GetAllConf instead of re-reading."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(cache_ttl=60) as device:
+            await device.get_settings()
+            await device.set_brightness(12)
+            await device.set_screen_power(False)
+
+            settings = await device.get_settings()
+            assert settings["Brightness"] == 12
+            assert settings["LightSwitch"] == 0
+            assert device.cache_stats["patches"] == 2
+    assert emulator.stats.commands["Channel/GetAllConf"] == 1
+
+
+@pytest.mark.asyncio
+async def test_setter_invalidates_channel_reads():
+    """Panel tools drop the cached channel index."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(cache_ttl=60) as device:
+            await device.get_panel_channels()
+            await device.set_panel_timer(2, 0, 10)
+            await device.get_panel_channels()
+    assert emulator.stats.commands["Channel/GetIndex"] == 2
+
+
+@pytest.mark.asyncio
+async def test_batched_setters_patch_cache():
+    """Writes inside a Draw/CommandList update the cache too."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(cache_ttl=60) as device:
+            await device.get_settings()
+            async with device.batch():
+                await asyncio.gather(device.set_brightness(5), device.set_mirror_mode(True))
+            settings = await device.get_settings()
+            assert settings["Brightness"] == 5
+            assert settings["MirrorFlag"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_setter_invalidates():
+    """A write that fails leaves no stale cached value behind."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure("Channel/SetBrightness", error_rate=1.0)
+        async with emulator.create_device(cache_ttl=60) as device:
+            await device.get_settings()
+            with pytest.raises(TimesGateCommandError):
+                await device.set_brightness(5)
+            await device.get_settings()
+    assert emulator.stats.commands["Channel/GetAllConf"] == 2
+
+
+def test_ttl_expiry(monkeypatch):
+    """Entries expire after their TTL."""
+    now = [100.0]
+    monkeypatch.setattr("divoom_timesgate.cache.time.monotonic", lambda: now[0])
+
+    cache = StateCache(ttl=1.0)
+    command = {"Command": "Channel/GetAllConf"}
+    cache.record(command, {"error_code": 0, "Brightness": 1})
+    assert cache.lookup(command)["Brightness"] == 1
+
+    now[0] += 2
+    assert cache.lookup(command) is None
+
+
+def test_unknown_setter_clears_cache():
+    """Commands missing from the matrix invalidate every read."""
+    cache = StateCache()
+    cache.record({"Command": "Channel/GetAllConf"}, {"error_code": 0})
+    cache.record({"Command": "Channel/GetIndex"}, {"error_code": 0})
+    cache.record({"Command": "Device/Reboot"}, {"error_code": 0})
+    assert cache.stats["entries"] == 0
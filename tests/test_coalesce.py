@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Tests for last-write-wins coalescing.
+"""
+
+import asyncio
+import pytest
+
+from divoom_timesgate.emulator import TimesGateEmulator
+
+
+def scoreboard(panel, red, blue):
+    return {"Command": "Tools/SetScoreBoard", "RedScore": red, "BlueScore": blue, "LcdId": panel}
+
+
+@pytest.mark.asyncio
+async def test_burst_converges_on_latest():
+    """A burst of updates sends the first and the last, dropping the rest."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(latency=0.02)
+        async with emulator.create_device() as device:
+            first = asyncio.ensure_future(device.send_latest(scoreboard(1, 0, 0)))
+            await asyncio.sleep(0.005)
+            results = await asyncio.gather(first, *(
+                device.send_latest(scoreboard(1, score, 0)) for score in range(1, 20)
+            ))
+
+            assert results == [True] * 20
+            assert device.coalesce_stats["sent"] == 2
+            assert device.coalesce_stats["dropped"] == 18
+
+    assert emulator.state.panel(1).scoreboard["RedScore"] == 19
+
+
+@pytest.mark.asyncio
+async def test_keys_are_independent():
+    """Updates for different panels never replace each other."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device() as device:
+            await asyncio.gather(
+                device.send_latest(scoreboard(1, 1, 1)),
+                device.send_latest(scoreboard(2, 2, 2)),
+            )
+            assert device.coalesce_stats["dropped"] == 0
+
+    assert emulator.state.panel(1).scoreboard["RedScore"] == 1
+    assert emulator.state.panel(2).scoreboard["RedScore"] == 2
+
+
+@pytest.mark.asyncio
+async def test_close_waits_for_drains():
+    """Closing the device finishes updates whose callers stopped waiting."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(latency=0.02)
+        async with emulator.create_device() as device:
+            caller = asyncio.ensure_future(device.send_latest(scoreboard(1, 7, 0)))
+            await asyncio.sleep(0)
+            caller.cancel()
+        assert not device._coalescer._tasks
+
+    assert emulator.state.panel(1).scoreboard["RedScore"] == 7
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Tests for the JSON codec and the lean send path.
+"""
+
+import logging
+import pytest
+
+from divoom_timesgate import TimesGateCommandError
+from divoom_timesgate.codec import JSONCodec, OrjsonCodec, default_codec, is_ok_body, orjson
+from divoom_timesgate.emulator import TimesGateEmulator
+
+
+def test_codecs_round_trip():
+    """Every available codec encodes compact, ASCII-escaped JSON that decodes back."""
+    codecs = [JSONCodec()]
+    if orjson is not None:
+        codecs.append(OrjsonCodec())
+    command = {"Command": "Draw/SendHttpText", "TextString": "héllo", "LcdIndex": 2}
+    for codec in codecs:
+        body = codec.dumps(command)
+        assert isinstance(body, bytes)
+        assert b": " not in body
+        assert body.isascii() and b"h\\u00e9llo" in body
+        assert codec.loads(body) == command
+    assert default_codec().name == ("orjson" if orjson is not None else "json")
+
+
+def test_ok_body_detection():
+    """Only bare success replies take the fast path."""
+    assert is_ok_body(b'{"error_code": 0}')
+    assert is_ok_body(b'{"error_code":0}')
+    assert not is_ok_body(b'{"error_code": 1}')
+    assert not is_ok_body(b'{"error_code": 0, "Brightness": 50}')
+
+
+@pytest.mark.asyncio
+async def test_send_path_with_each_codec(caplog):
+    """Setters, reads and errors behave the same with either codec."""
+    async with TimesGateEmulator() as emulator:
+        for codec in (JSONCodec(), default_codec()):
+            async with emulator.create_device(codec=codec) as device:
+                assert await device.set_brightness(42) is True
+                assert (await device.get_settings())["Brightness"] == 42
+
+                emulator.configure("Device/SetMirrorMode", error_rate=1.0)
+                with pytest.raises(TimesGateCommandError):
+                    await device.set_mirror_mode(True)
+                emulator.configure("Device/SetMirrorMode", error_rate=0.0)
+
+        with caplog.at_level(logging.DEBUG, logger="divoom_timesgate.device"):
+            async with emulator.create_device() as device:
+                await device.set_brightness(7)
+        assert "Channel/SetBrightness" in caplog.text
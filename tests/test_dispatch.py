@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for prioritized per-device command dispatch.
+"""
+
+import asyncio
+import pytest
+
+from divoom_timesgate import Priority
+from divoom_timesgate.dispatch import CommandDispatcher, priority_for
+from divoom_timesgate.emulator import TimesGateEmulator
+
+
+def test_default_priorities():
+    """Alerts are interactive, display uploads bulk, the rest normal."""
+    assert priority_for({"Command": "Device/PlayBuzzer"}) == Priority.INTERACTIVE
+    assert priority_for({"Command": "Draw/SendHttpItemList"}) == Priority.BULK
+    assert priority_for({"Command": "Channel/SetBrightness"}) == Priority.NORMAL
+    assert priority_for({
+        "Command": "Draw/CommandList",
+        "CommandList": [{"Command": "Draw/SendHttpItemList"}, {"Command": "Device/PlayBuzzer"}]
+    }) == Priority.INTERACTIVE
+
+
+@pytest.mark.asyncio
+async def test_alert_jumps_bulk_queue():
+    """A buzzer never waits behind a queued 5-panel layout refresh."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(latency=0.02)
+        async with emulator.create_device() as device:
+            layout = [
+                asyncio.ensure_future(device.send_display_list(lcd_index=panel, item_list=[]))
+                for panel in range(1, 6)
+            ]
+            await asyncio.sleep(0.005)
+            await device.play_buzzer(100, 100, 100)
+            sent_before_buzzer = emulator.stats.commands["Draw/SendHttpItemList"]
+            await asyncio.gather(*layout)
+
+            stats = device.queue_stats
+            assert stats["bulk"]["sent"] == 5
+            assert stats["interactive"]["sent"] == 1
+
+    # Only the upload already in flight was ahead of the alert
+    assert sent_before_buzzer == 1
+
+
+@pytest.mark.asyncio
+async def test_backpressure():
+    """Submitters wait once their lane is full."""
+    release = asyncio.Event()
+    sent = []
+
+    async def send(command):
+        await release.wait()
+        sent.append(command["n"])
+        return {"error_code": 0}
+
+    dispatcher = CommandDispatcher(send, max_queue=2)
+    tasks = [asyncio.ensure_future(dispatcher.submit({"Command": "X", "n": n})) for n in range(5)]
+    await asyncio.sleep(0.01)
+
+    # One in flight, two queued, two waiting for room
+    assert dispatcher.depth == 2
+
+    release.set()
+    await asyncio.gather(*tasks)
+    assert sent == [0, 1, 2, 3, 4]
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_serialized_per_device():
+    """Concurrent callers never have two requests in flight."""
+    async with TimesGateEmulator(serialize=False) as emulator:
+        emulator.configure(latency=0.01)
+        async with emulator.create_device() as device:
+            await asyncio.gather(*(device.set_brightness(i) for i in range(5)))
+    assert emulator.stats.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_cancels_in_flight_send():
+    """Giving up on a hung request cancels it, so close() does not wait for it."""
+    cancelled = []
+
+    async def hang(command):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(command["Command"])
+            raise
+
+    dispatcher = CommandDispatcher(hang)
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(dispatcher.submit({"Command": "Channel/SetBrightness"}), 0.05)
+    await asyncio.sleep(0)
+    assert cancelled == ["Channel/SetBrightness"]
+
+    # A hung request whose caller is still waiting is bounded by close()
+    pending = asyncio.ensure_future(dispatcher.submit({"Command": "Device/PlayBuzzer"}))
+    await asyncio.sleep(0.01)
+    await asyncio.wait_for(dispatcher.close(timeout=0.05), 1.0)
+    with pytest.raises(Exception):
+        await pending
+    assert cancelled[-1] == "Device/PlayBuzzer"
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Tests for incremental display-list updates.
+"""
+
+import pytest
+
+from divoom_timesgate import TextDisplayItem
+from divoom_timesgate.displaylist import DisplayListManager
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.loopback import LoopbackTransport
+
+
+def board(status="On time"):
+    return {
+        "title": TextDisplayItem(0, "Departures", y=0),
+        "line1": TextDisplayItem(0, "Bus 12", y=16),
+        "line2": TextDisplayItem(0, "Tram 4", y=32),
+        "status": TextDisplayItem(0, status, y=48),
+    }
+
+
+def test_slots_are_stable_and_bounded():
+    """Names keep their TextId; freed slots are reused; 20 slots at most."""
+    manager = DisplayListManager()
+    command, wanted = manager.plan(1, board(), "")
+    assert [item["TextId"] for item in command["ItemList"]] == [0, 1, 2, 3]
+
+    items = board()
+    del items["line1"]
+    items["line3"] = TextDisplayItem(0, "Train 7", y=16)
+    command, wanted = manager.plan(1, items, "")
+    assert {item["TextString"]: item["TextId"] for item in command["ItemList"]}["Train 7"] == 1
+    assert wanted[3]["TextString"] == "On time"
+
+    with pytest.raises(ValueError):
+        manager.plan(2, {str(i): {"TextString": str(i)} for i in range(21)}, "")
+
+
+@pytest.mark.asyncio
+async def test_update_sends_minimal_diff():
+    """One changed item goes out alone; removals and big changes push in full."""
+    emulator = TimesGateEmulator()
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        assert await device.update_display_list(2, board()) == 4
+        assert await device.update_display_list(2, board()) == 0
+
+        assert await device.update_display_list(2, board("Delayed")) == 1
+        sent = emulator.state.panel(2).item_list
+        assert [item["TextString"] for item in sent] == ["Departures", "Bus 12", "Tram 4", "Delayed"]
+
+        items = board("Delayed")
+        del items["line2"]
+        assert await device.update_display_list(2, items) == 3
+        assert len(emulator.state.panel(2).item_list) == 3
+
+        # Anything else drawn on the panel forces the next update to be full
+        await device.set_panel_scoreboard(2, 1, 0)
+        assert await device.update_display_list(2, items) == 3
+
+        stats = device.display_list_stats
+        assert stats["partial_pushes"] == 1
+        assert stats["full_pushes"] == 3
+        assert stats["skipped"] == 1
+        assert stats["items_saved"] == 3
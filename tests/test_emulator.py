@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Tests for the local Times Gate emulator.
+
+These run entirely offline against divoom_timesgate.emulator.
+"""
+
+import asyncio
+import json
+import pytest
+
+from divoom_timesgate import TimesGateConnectionError, TimesGateCommandError
+from divoom_timesgate.emulator import ILLEGAL_PARAMETER_ERROR, TimesGateEmulator
+
+
+@pytest.mark.asyncio
+async def test_settings_round_trip():
+    """Setters are reflected in Channel/GetAllConf."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device() as device:
+            await device.set_brightness(42)
+            await device.set_screen_power(False)
+
+            settings = await device.get_settings()
+            assert settings["Brightness"] == 42
+            assert settings["LightSwitch"] == 0
+
+
+@pytest.mark.asyncio
+async def test_panel_state():
+    """Per-panel tools only touch the addressed LcdId."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device() as device:
+            await device.set_panel_timer(panel=2, minutes=1, seconds=30)
+            await device.set_panel_scoreboard(panel=4, red_score=3, blue_score=7)
+
+    assert emulator.state.panel(2).timer == {"Minute": 1, "Second": 30, "Status": 1}
+    assert emulator.state.panel(1).timer is None
+    assert emulator.state.panel(4).scoreboard == {"RedScore": 3, "BlueScore": 7}
+    assert emulator.state.panel(4).timer is None
+
+
+@pytest.mark.asyncio
+async def test_command_list():
+    """Draw/CommandList applies every sub-command."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device() as device:
+            await device.send_command_list([
+                {"Command": "Channel/SetBrightness", "Brightness": 10},
+                {"Command": "Tools/SetTimer", "Minute": 0, "Second": 5, "Status": 1, "LcdId": 5},
+            ])
+
+    assert emulator.state.brightness == 10
+    assert emulator.state.panel(5).timer["Second"] == 5
+    assert emulator.stats.requests == 1
+
+
+@pytest.mark.asyncio
+async def test_injected_error_code():
+    """error_rate=1 turns every response into a failure."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure("Channel/SetBrightness", error_rate=1.0, error_code=7)
+        async with emulator.create_device() as device:
+            with pytest.raises(TimesGateCommandError):
+                await device.set_brightness(50)
+            # Other commands are unaffected
+            await device.set_screen_power(True)
+
+
+@pytest.mark.asyncio
+async def test_injected_garbage():
+    """garbage_rate=1 answers with a non-JSON body."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(garbage_rate=1.0)
+        async with emulator.create_device() as device:
+            with pytest.raises(TimesGateCommandError):
+                await device.get_settings()
+    assert emulator.stats.garbage == 1
+
+
+@pytest.mark.asyncio
+async def test_malformed_commands_get_error_codes():
+    """Non-object bodies and missing parameters are rejected, not crashed on."""
+    emulator = TimesGateEmulator()
+    for body in [b"[]", b"42", b'{"Command": "Tools/SetTimer"}',
+                 b'{"Command": "Draw/CommandList", "CommandList": [1]}']:
+        reply = json.loads(await emulator.respond(body))
+        assert reply["error_code"] != 0
+
+    reply = json.loads(await emulator.respond(b'{"Command": "Channel/SetBrightness", "Brightness": 5}'))
+    assert reply == {"error_code": 0}
+
+
+@pytest.mark.asyncio
+async def test_out_of_range_panels_are_rejected():
+    """LCD ids outside 1-5 get an error code and touch no panel."""
+    emulator = TimesGateEmulator()
+    for command in [
+        {"Command": "Tools/SetTimer", "Minute": 1, "Second": 0, "Status": 1, "LcdId": 0},
+        {"Command": "Tools/SetTimer", "Minute": 1, "Second": 0, "Status": 1, "LcdId": 6},
+        {"Command": "Channel/SetIndividualDial", "LcdId": 9, "ClockId": 3},
+        {"Command": "Draw/SendHttpItemList", "LcdIndex": 9, "NewFlag": 1, "ItemList": []},
+    ]:
+        reply = json.loads(await emulator.respond(json.dumps(command).encode()))
+        assert reply == {"error_code": ILLEGAL_PARAMETER_ERROR}
+    assert emulator.state.panel(5).timer is None
+    with pytest.raises(ValueError):
+        emulator.state.panel(0)
+
+
+def test_emulator_built_outside_the_loop():
+    """Serialized requests contend on a lock bound to the serving loop."""
+    emulator = TimesGateEmulator()
+    emulator.configure(latency=0.01)
+
+    async def contend():
+        body = b'{"Command": "Channel/SetBrightness", "Brightness": 5}'
+        return await asyncio.gather(emulator.respond(body), emulator.respond(body))
+
+    assert all(json.loads(reply) == {"error_code": 0} for reply in asyncio.run(contend()))
+
+
+@pytest.mark.asyncio
+async def test_injected_drop():
+    """drop_rate=1 resets the connection."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(drop_rate=1.0)
+        async with emulator.create_device() as device:
+            with pytest.raises(TimesGateConnectionError):
+                await device.set_brightness(50)
+    assert emulator.stats.dropped == 1
+
+
+@pytest.mark.asyncio
+async def test_serialization():
+    """A serialized emulator never handles two requests at once."""
+    async with TimesGateEmulator(serialize=True) as emulator:
+        emulator.configure(latency=0.01)
+        async with emulator.create_device() as device:
+            await asyncio.gather(*(device.set_brightness(i) for i in range(5)))
+    assert emulator.stats.max_in_flight == 1
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent fleet control.
+"""
+
+import asyncio
+import time
+import pytest
+
+from divoom_timesgate import TimesGateFleet, TimesGateConnectionError
+from divoom_timesgate.emulator import TimesGateEmulator
+
+
+async def start_emulators(count, **profile):
+    """Start ``count`` emulators sharing one fault profile."""
+    emulators = []
+    for _ in range(count):
+        emulator = TimesGateEmulator()
+        await emulator.start()
+        emulator.configure(**profile)
+        emulators.append(emulator)
+    return emulators
+
+
+async def stop_emulators(emulators):
+    for emulator in emulators:
+        await emulator.stop()
+
+
+async def close_devices(devices):
+    await asyncio.gather(*(device.close() for device in devices))
+
+
+@pytest.mark.asyncio
+async def test_fan_out_is_concurrent():
+    """A fleet-wide command takes about one device round trip."""
+    emulators = await start_emulators(20, latency=0.1)
+    try:
+        devices = [emulator.create_device() for emulator in emulators]
+        async with TimesGateFleet(devices) as fleet:
+            start = time.perf_counter()
+            results = await fleet.run("set_brightness", 30)
+            elapsed = time.perf_counter() - start
+        await close_devices(devices)
+
+        assert len(results) == 20
+        assert all(result.ok and result.result is True for result in results.values())
+        assert elapsed < 1.0
+        assert all(emulator.state.brightness == 30 for emulator in emulators)
+    finally:
+        await stop_emulators(emulators)
+
+
+@pytest.mark.asyncio
+async def test_errors_and_timeouts_are_per_device():
+    """Failures are reported per device without affecting the others."""
+    healthy = await start_emulators(2)
+    failing = await start_emulators(1, error_rate=1.0)
+    hanging = await start_emulators(1, drop_rate=1.0, drop_mode="hang")
+    try:
+        devices = [emulator.create_device() for emulator in healthy + failing + hanging]
+        start = time.monotonic()
+        async with TimesGateFleet(devices, timeout=0.3) as fleet:
+            streamed = [result async for result in fleet.stream("set_screen_power", True)]
+        await close_devices(devices)
+        # A timed-out request must not keep the hung device's close() waiting
+        assert time.monotonic() - start < 2.0
+
+        assert [result.ok for result in streamed[:2]] == [True, True]
+        assert isinstance(streamed[-1].error, TimesGateConnectionError)
+        assert sum(1 for result in streamed if not result.ok) == 2
+    finally:
+        await stop_emulators(healthy + failing + hanging)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit():
+    """No more than ``concurrency`` devices are driven at once."""
+    emulators = await start_emulators(6, latency=0.05)
+    try:
+        active = []
+        peak = []
+
+        async def probe(device):
+            active.append(device)
+            peak.append(len(active))
+            await device.get_settings()
+            active.remove(device)
+            return True
+
+        devices = [emulator.create_device() for emulator in emulators]
+        async with TimesGateFleet(devices, concurrency=2) as fleet:
+            results = await fleet.run(probe)
+        await close_devices(devices)
+
+        assert len(results) == 6
+        assert max(peak) == 2
+    finally:
+        await stop_emulators(emulators)
+
+
+@pytest.mark.asyncio
+async def test_fleet_device_ownership():
+    """Duplicate addresses are rejected; devices passed in are left open."""
+    async with TimesGateEmulator() as emulator:
+        device = emulator.create_device()
+        with pytest.raises(ValueError):
+            TimesGateFleet([device, emulator.create_device()])
+
+        async with TimesGateFleet([device]) as fleet:
+            await fleet.run("set_brightness", 12)
+        assert device._transport is not None and device._transport.started
+        await device.close()
+
+
+@pytest.mark.asyncio
+async def test_leaving_a_stream_early_cancels_the_rest():
+    """Exiting the stream's context cancels devices that have not finished."""
+    emulators = await start_emulators(5, latency=0.05)
+    try:
+        devices = [emulator.create_device() for emulator in emulators]
+        async with TimesGateFleet(devices, concurrency=1) as fleet:
+            async with fleet.stream("set_brightness", 77) as results:
+                async for first in results:
+                    break
+            assert first.ok
+            assert all(task.done() for task in results._tasks)
+        await close_devices(devices)
+
+        # At most the device started after the first one got the command
+        assert sum(emulator.state.brightness == 77 for emulator in emulators) <= 2
+        assert emulators[-1].state.brightness != 77
+    finally:
+        await stop_emulators(emulators)
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for NumPy frames and Draw/SendHttpGif uploads.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from divoom_timesgate import TimesGateConnectionError
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.framebuffer import (
+    RGB565,
+    Canvas,
+    Frame,
+    decode_frame,
+    encode_frames,
+    parse_color
+)
+from divoom_timesgate.loopback import LoopbackTransport
+
+
+def test_drawing_primitives_clip():
+    """fill, rect, line and blit draw in place and clip at the edges."""
+    frame = Frame().fill("#000010")
+    frame.rect(60, 60, 10, 10, (255, 0, 0))
+    assert (frame.pixels[60:, 60:] == (255, 0, 0)).all()
+    assert (frame.pixels[59, 59] == (0, 0, 16)).all()
+
+    frame.rect(10, 10, 5, 4, "#00FF00", fill=False)
+    assert (frame.pixels[10, 10:15] == (0, 255, 0)).all()
+    assert (frame.pixels[11, 11] == (0, 0, 16)).all()
+
+    frame.clear().line(-5, -5, 70, 70, "#FFFFFF")
+    diagonal = frame.pixels[np.arange(64), np.arange(64)]
+    assert (diagonal == 255).all()
+    assert frame.pixels.sum() == 64 * 3 * 255
+
+    sprite = Frame(8, 8).fill("#0000FF")
+    frame.clear().blit(sprite, -4, 60)
+    assert (frame.pixels[60:64, 0:4] == (0, 0, 255)).all()
+    assert frame.pixels[:60].sum() == 0
+
+    assert parse_color("#102030") == (16, 32, 48)
+    with pytest.raises(ValueError):
+        parse_color("#12")
+
+
+def test_encode_round_trip():
+    """Batch encoding matches per-frame encoding in both pixel formats."""
+    rng = np.random.default_rng(0)
+    frames = [Frame.from_array(rng.integers(0, 256, (64, 64, 3))) for _ in range(5)]
+
+    encoded = encode_frames(frames)
+    assert len(encoded) == 5
+    assert all(len(data) == 16384 for data in encoded)
+    assert [decode_frame(data) for data in encoded] == frames
+
+    packed = encode_frames(frames, RGB565)
+    decoded = decode_frame(packed[2], RGB565)
+    assert (decoded.pixels == (frames[2].pixels & np.array([0xF8, 0xFC, 0xF8], dtype=np.uint8))).all()
+
+
+@pytest.mark.asyncio
+async def test_send_frames_uploads_each_offset():
+    """send_frames uploads every frame under one PicID to the chosen panels."""
+    emulator = TimesGateEmulator()
+    frames = [Frame().fill("#FF0000"), Frame().fill("#00FF00")]
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        await device.send_frames(3, frames, speed=50)
+        await device.send_frames([1, 2], frames[:1])
+
+        with pytest.raises(ValueError):
+            await device.send_frames(6, frames)
+
+    gif = emulator.state.panel(3).gif
+    assert gif["PicNum"] == 2 and gif["PicSpeed"] == 50
+    assert decode_frame(gif["Frames"][1]) == frames[1]
+    assert emulator.state.panel(1).gif["PicID"] == gif["PicID"] + 1
+    assert emulator.state.panel(4).gif is None
+
+
+@pytest.mark.asyncio
+async def test_unchanged_panels_are_skipped():
+    """Only changed panels are uploaded; identical new frames share one request."""
+    emulator = TimesGateEmulator()
+    red, blue = Frame().fill("#FF0000"), Frame().fill("#0000FF")
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        scene = {panel: red for panel in range(1, 6)}
+        assert await device.send_panel_frames(scene) == [1, 2, 3, 4, 5]
+        assert emulator.stats.requests == 1
+        assert device.frame_stats["requests_saved"] == 4
+
+        # Panels 2 and 4 change to different frames: one CommandList
+        scene.update({2: blue, 4: Frame().fill("#00FF00")})
+        assert await device.send_panel_frames(scene) == [2, 4]
+        assert emulator.stats.requests == 2
+        assert emulator.stats.commands["Draw/SendHttpGif"] == 3
+
+        assert await device.send_panel_frames(scene) == []
+        assert emulator.stats.requests == 2
+
+        # Other content on a panel makes its frame unknown again
+        await device.set_panel_timer(panel=3, minutes=1, seconds=0)
+        assert await device.send_panel_frames(scene) == [3]
+        assert await device.send_panel_frames(scene, force=True) == [1, 2, 3, 4, 5]
+
+        stats = device.frame_stats
+        assert stats["sent"] == 13
+        assert stats["skipped"] == 12
+        assert stats["bytes_saved"] == stats["requests_saved"] * 16384
+
+    assert decode_frame(emulator.state.panel(2).gif["Frames"][0]) == blue
+
+
+@pytest.mark.asyncio
+async def test_non_uint8_frames_are_converted():
+    """Float and wide integer arrays are rounded and clipped to uint8."""
+    emulator = TimesGateEmulator()
+    floats = np.full((64, 64, 3), 254.6)
+    wide = np.full((64, 64, 3), 300, dtype=np.int64)
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        assert await device.send_panel_frames({1: floats, 2: wide}) == [1, 2]
+        assert await device.send_panel_frames({1: floats, 2: wide}) == []
+
+    white = Frame().fill("#FFFFFF")
+    assert decode_frame(emulator.state.panel(1).gif["Frames"][0]) == white
+    assert decode_frame(emulator.state.panel(2).gif["Frames"][0]) == white
+
+
+@pytest.mark.asyncio
+async def test_failed_upload_is_not_remembered():
+    """A panel whose upload failed is sent again next time."""
+    emulator = TimesGateEmulator()
+    white = Frame().fill("#FFFFFF")
+    scene = {1: white, 2: white}
+    async with emulator.create_device(transport=LoopbackTransport(emulator, timeout=0.1)) as device:
+        emulator.configure("Draw/SendHttpGif", drop_rate=1.0)
+        with pytest.raises(TimesGateConnectionError):
+            await device.send_panel_frames(scene)
+        # Nothing was delivered, so nothing was saved either
+        assert device.frame_stats["requests_saved"] == 0
+        assert device.frame_stats["bytes_saved"] == 0
+        emulator.configure("Draw/SendHttpGif")
+        assert await device.send_panel_frames(scene) == [1, 2]
+        assert device.frame_stats["requests_saved"] == 1
+
+
+@pytest.mark.asyncio
+async def test_canvas_uploads_changed_panels():
+    """Panels are views of one wall array; only changed slices are uploaded."""
+    canvas = Canvas()
+    assert canvas.width == 320 and canvas.height == 64
+    assert all(np.shares_memory(frame.pixels, canvas.pixels) for frame in canvas.panel_frames().values())
+
+    emulator = TimesGateEmulator()
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        canvas.fill("#000000")
+        assert await device.send_canvas(canvas) == [1, 2, 3, 4, 5]
+
+        # A bar crossing the border of panels 2 and 3 dirties just those two
+        canvas.rect(100, 10, 60, 8, "#FF0000")
+        requests = emulator.stats.requests
+        assert await device.send_canvas(canvas) == [2, 3]
+        assert emulator.stats.requests == requests + 1
+        assert await device.send_canvas(canvas) == []
+
+    assert decode_frame(emulator.state.panel(3).gif["Frames"][0]) == canvas.panel(3)
+    with pytest.raises(ValueError):
+        canvas.panel(6)
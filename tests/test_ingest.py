@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Tests for off-loop frame ingestion.
+"""
+
+import io
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from divoom_timesgate.framebuffer import RGB565, decode_frame
+from divoom_timesgate.ingest import FrameIngestor, prepare_payload, resize_frames
+from divoom_timesgate.payloadcache import PayloadCache
+from divoom_timesgate.quantize import Quantizer
+
+
+def gradient(frames=2, height=128, width=128):
+    rng = np.random.default_rng(1)
+    return rng.integers(0, 256, (frames, height, width, 3)).astype(np.uint8)
+
+
+def test_resize_box_average_and_nearest():
+    """Downscaling averages blocks; upscaling repeats pixels."""
+    source = gradient()
+    small = resize_frames(source)
+    expected = source.reshape(2, 64, 2, 64, 2, 3).mean(axis=(2, 4))
+    assert small.shape == (2, 64, 64, 3)
+    assert np.abs(small.astype(int) - np.rint(expected)).max() == 0
+
+    tiny = gradient(1, 16, 32)
+    big = resize_frames(tiny)
+    assert big.shape == (1, 64, 64, 3)
+    assert (big[0, 0:4, 0:2] == tiny[0, 0, 0]).all()
+
+    assert resize_frames(small) is small
+
+
+def test_prepare_payload_is_compact_bytes():
+    """Workers return one bytes object of newline-separated PicData."""
+    data = prepare_payload(gradient(3))
+    assert isinstance(data, bytes)
+    chunks = data.decode("ascii").split("\n")
+    assert len(chunks) == 3
+    assert decode_frame(chunks[1]).pixels.shape == (64, 64, 3)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("processes", [False, True])
+async def test_ingestor_offloads(processes):
+    """Thread and process pools produce the same payload as inline encoding."""
+    source = gradient(4)
+    expected = prepare_payload(source).decode("ascii").split("\n")
+    async with FrameIngestor(processes=processes, max_workers=2) as ingestor:
+        assert await ingestor.encode(source) == expected
+        assert ingestor.encoded == 1
+    assert ingestor._executor is None
+
+
+@pytest.mark.asyncio
+async def test_ingestor_uses_payload_cache():
+    """Image sources already in the cache are not decoded again."""
+    Image = pytest.importorskip("PIL.Image")
+    buffer = io.BytesIO()
+    Image.fromarray(gradient(1)[0]).save(buffer, format="PNG")
+
+    cache = PayloadCache()
+    async with FrameIngestor(processes=False, cache=cache) as ingestor:
+        first = await ingestor.encode(buffer.getvalue())
+        second = await ingestor.encode(buffer.getvalue())
+        # Quantizers differing only in seed or pixel format are cached apart
+        await ingestor.encode(buffer.getvalue(), quantizer=Quantizer(seed=0))
+        await ingestor.encode(buffer.getvalue(), quantizer=Quantizer(seed=1))
+        await ingestor.encode(buffer.getvalue(), quantizer=Quantizer(pixel_format=RGB565))
+    assert first == second
+    assert ingestor.encoded == 4
+    assert cache.stats["memory_hits"] == 1
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Tests for client-side scrolling text.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.framebuffer import decode_frame, encode_frames
+from divoom_timesgate.loopback import LoopbackTransport
+from divoom_timesgate.marquee import RIGHT, Marquee
+from divoom_timesgate.text import text_size
+
+
+def test_windows_are_views_of_one_strip():
+    """Every step is a zero-copy view; the strided batch matches window()."""
+    marquee = Marquee("SCROLLING", step=3)
+    text_width, _ = text_size("SCROLLING")
+    assert len(marquee) == -(-(text_width + 64) // 3)
+
+    window = marquee.window(5)
+    assert window.shape == (64, 64, 3)
+    assert np.shares_memory(window, marquee.strip)
+    assert not marquee.window(0).any()
+    assert (marquee.window(len(marquee)) == marquee.window(0)).all()
+
+    windows = marquee.windows
+    assert np.shares_memory(windows, marquee.strip)
+    assert all((windows[i] == marquee.window(i)).all() for i in (0, 7, len(marquee) - 1))
+    assert len(encode_frames(windows)) == len(marquee)
+    with pytest.raises(ValueError):
+        windows[0, 0, 0] = 1
+
+
+def test_right_scroll_mirrors_left():
+    """Scrolling right walks the same windows in reverse order."""
+    left, right = Marquee("ABC"), Marquee("ABC", direction=RIGHT)
+    assert len(left) == len(right)
+    last = len(left) - 1
+    assert (right.window(0) == left.window(last + 1)).all()
+    assert (right.window(1) == left.window(last)).all()
+    assert (right.windows[10] == left.window(last - 9)).all()
+
+
+@pytest.mark.asyncio
+async def test_scroll_text_streams_every_step():
+    """scroll_text streams each step through the frame path."""
+    emulator = TimesGateEmulator()
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        stats = await device.scroll_text(4, "HI", fps=200, step=8)
+
+    marquee = Marquee("HI", step=8)
+    assert stats["frames_in"] == len(marquee)
+    assert stats["frames_sent"] + stats["frames_dropped"] == len(marquee)
+    shown = decode_frame(emulator.state.panel(4).gif["Frames"][0])
+    assert (shown.pixels == marquee.window(len(marquee) - 1)).all()
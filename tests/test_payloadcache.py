@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Tests for the encoded payload cache.
+"""
+
+import os
+import pytest
+
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.loopback import LoopbackTransport
+from divoom_timesgate.payloadcache import PayloadCache, payload_key
+
+
+def chunks(tag, count=2, size=1000):
+    return [(tag + str(i)) * (size // (len(tag) + 1)) for i in range(count)]
+
+
+def test_key_covers_content_and_params():
+    """Different content or encode parameters never share a key."""
+    key = payload_key(b"gif", size=64, speed=100)
+    assert key == payload_key(b"gif", speed=100, size=64)
+    assert key != payload_key(b"gif", size=64, speed=50)
+    assert key != payload_key(b"png", size=64, speed=100)
+
+
+def test_memory_lru_budget():
+    """The least recently used entries are evicted past the memory budget."""
+    cache = PayloadCache(memory_budget=6500)
+    for tag in "abc":
+        cache.put(tag, chunks(tag))
+    assert cache.get("a") is not None
+    cache.put("d", chunks("d"))
+
+    assert cache.get("b") is None
+    assert cache.get("a") == chunks("a")
+    stats = cache.stats
+    assert stats["memory_evictions"] == 1
+    assert stats["memory_bytes"] <= 6500
+    assert (stats["memory_hits"], stats["misses"]) == (2, 1)
+
+
+def test_disk_level_is_shared_and_bounded(tmp_path):
+    """A second cache on the same directory sees entries; old files are evicted."""
+    directory = str(tmp_path)
+    writer = PayloadCache(directory, disk_budget=5000)
+    writer.put("a", chunks("a"))
+    os.utime(os.path.join(directory, "a.picdata"), (1, 1))
+    writer.put("b", chunks("b"))
+
+    reader = PayloadCache(directory)
+    assert reader.get("b") == chunks("b")
+    assert reader.stats["disk_hits"] == 1
+
+    writer.put("c", chunks("c"))
+    assert writer.stats["disk_evictions"] == 1
+    assert sorted(os.listdir(directory)) == ["b.picdata", "c.picdata"]
+    assert reader.get("a") is None
+
+
+def test_disk_edge_cases(tmp_path):
+    """Empty payloads round-trip, overwrites are not double-counted, corrupt files are misses."""
+    directory = str(tmp_path)
+    writer = PayloadCache(directory)
+    writer.put("empty", [])
+    assert PayloadCache(directory).get("empty") == []
+
+    writer.put("a", chunks("a"))
+    size = writer.stats["disk_bytes"]
+    writer.put("a", chunks("a"))
+    assert writer.stats["disk_bytes"] == size
+
+    with open(os.path.join(directory, "bad.picdata"), "wb") as f:
+        f.write(b"\xff\xfe")
+    reader = PayloadCache(directory)
+    assert reader.get("bad") is None
+    assert reader.stats["misses"] == 1
+    assert not os.path.exists(os.path.join(directory, "bad.picdata"))
+
+
+@pytest.mark.asyncio
+async def test_get_or_encode_feeds_uploads(tmp_path):
+    """Encoding runs once per content; cached payloads upload unchanged."""
+    calls = []
+
+    def encode():
+        calls.append(1)
+        return chunks("x", count=3)
+
+    cache = PayloadCache(str(tmp_path))
+    emulator = TimesGateEmulator()
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        for _ in range(3):
+            pic_data = cache.get_or_encode(b"source", encode, size=64, speed=100)
+            await device.send_encoded_frames(4, pic_data, speed=100)
+
+    assert len(calls) == 1
+    gif = emulator.state.panel(4).gif
+    assert gif["PicNum"] == 3
+    assert gif["Frames"][2] == chunks("x", count=3)[2]
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for palette quantization and dithering.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.framebuffer import RGB565, Frame, decode_frame, encode_frames
+from divoom_timesgate.loopback import LoopbackTransport
+from divoom_timesgate.quantize import (
+    DITHER_MODES,
+    FLOYD_STEINBERG,
+    Quantizer,
+    median_cut,
+    nearest_indices
+)
+
+
+def gradient(count=2):
+    """Smooth horizontal gradient frames, the worst case for banding."""
+    ramp = np.linspace(0, 255, 64)
+    frame = np.stack(np.broadcast_arrays(ramp[None, :], ramp[:, None], 255 - ramp[None, :]), axis=-1)
+    return np.repeat(np.rint(frame).astype(np.uint8)[None], count, axis=0)
+
+
+def test_palette_building():
+    """median_cut yields at most the requested colors; lookup finds exact matches."""
+    rng = np.random.default_rng(1)
+    pixels = rng.integers(0, 256, (5000, 3)).astype(np.uint8)
+    palette = median_cut(pixels, 16)
+    assert palette.shape == (16, 3)
+
+    # Fewer distinct colors than requested: the palette is exact
+    two = np.array([[255, 0, 0], [0, 0, 255]] * 50, dtype=np.uint8)
+    assert len(np.unique(median_cut(two, 16), axis=0)) == 2
+    assert (nearest_indices(palette, palette) == np.arange(16)).all()
+
+    with pytest.raises(ValueError):
+        Quantizer(colors=1)
+    with pytest.raises(ValueError):
+        Quantizer(dither="random")
+
+
+@pytest.mark.parametrize("dither", DITHER_MODES)
+def test_dithered_frames_use_only_palette_colors(dither):
+    """Every mode outputs palette colors; dithering keeps the average color."""
+    frames = gradient()
+    quantizer = Quantizer(colors=8, dither=dither)
+    result = quantizer.apply(frames)
+
+    assert result.shape == frames.shape
+    used = np.unique(result.reshape(-1, 3), axis=0)
+    assert len(used) <= 8
+    palette = quantizer.fit(frames)
+    assert set(map(tuple, used)) <= set(map(tuple, palette))
+    assert (quantizer.palette_of(quantizer.indices(frames, palette), palette) == result).all()
+    # Frames of a batch share the palette, so identical frames stay identical
+    assert (result[0] == result[1]).all()
+
+    if dither == FLOYD_STEINBERG:
+        drift = np.abs(result.mean(axis=(0, 1, 2)) - frames.mean(axis=(0, 1, 2)))
+        assert drift.max() < 2
+
+
+def test_rgb565_palette_round_trips():
+    """A 565-snapped palette survives RGB565 encoding unchanged."""
+    frames = gradient(1)
+    quantizer = Quantizer(colors=32, pixel_format=RGB565)
+    encoded = encode_frames(frames, RGB565, quantizer)
+    decoded = decode_frame(encoded[0], RGB565)
+    assert (decoded.pixels == quantizer.apply(frames)[0]).all()
+
+
+@pytest.mark.asyncio
+async def test_send_frames_with_quantizer():
+    """send_frames quantizes before encoding."""
+    emulator = TimesGateEmulator()
+    quantizer = Quantizer(colors=4, dither="ordered")
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        await device.send_frames(1, [Frame.from_array(frame) for frame in gradient(1)], quantizer=quantizer)
+
+    shown = decode_frame(emulator.state.panel(1).gif["Frames"][0])
+    assert len(np.unique(shown.pixels.reshape(-1, 3), axis=0)) <= 4
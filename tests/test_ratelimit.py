@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for adaptive per-device rate limiting.
+"""
+
+import json
+import time
+import pytest
+
+from divoom_timesgate import AiohttpTransport, TimesGateConnectionError
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.ratelimit import AdaptiveRateLimiter, RateStore
+
+
+def test_additive_increase_multiplicative_decrease():
+    """Flat latency ramps the rate up; a latency spike halves it."""
+    limiter = AdaptiveRateLimiter(rate=5.0, increase=1.0, decrease=0.5, backoff_interval=0)
+    for _ in range(5):
+        limiter.on_success(0.010)
+    assert limiter.rate == 10.0
+
+    limiter.on_success(0.100)
+    assert limiter.rate == 5.0
+
+    limiter.on_failure()
+    assert limiter.rate == 2.5
+
+
+def test_rate_bounds():
+    """The rate never leaves [min_rate, max_rate]."""
+    limiter = AdaptiveRateLimiter(rate=1.0, min_rate=1.0, max_rate=2.0, increase=5.0, backoff_interval=0)
+    limiter.on_success(0.01)
+    assert limiter.rate == 2.0
+    for _ in range(5):
+        limiter.on_failure()
+    assert limiter.rate == 1.0
+
+
+@pytest.mark.asyncio
+async def test_acquire_paces_commands():
+    """Slots are spaced 1/rate apart."""
+    limiter = AdaptiveRateLimiter(rate=50.0)
+    start = time.monotonic()
+    for _ in range(6):
+        await limiter.acquire()
+    assert time.monotonic() - start >= 0.09
+
+
+def test_rate_store_round_trip(tmp_path):
+    """Learned rates survive a save/load cycle; bad files load empty."""
+    store = RateStore(str(tmp_path / "rates.json"))
+    store.save({"http://10.0.0.2:80/post": 12.5})
+    assert store.load() == {"http://10.0.0.2:80/post": 12.5}
+
+    (tmp_path / "bad.json").write_text("not json")
+    assert RateStore(str(tmp_path / "bad.json")).load() == {}
+
+
+@pytest.mark.asyncio
+async def test_transport_learns_and_persists(tmp_path):
+    """The transport backs off on drops and persists the learned rate."""
+    path = str(tmp_path / "rates.json")
+    async with TimesGateEmulator() as emulator:
+        async with AiohttpTransport(adaptive_rate=True, rate_store_path=path,
+                                    rate_limiter_options={"rate": 20.0}) as transport:
+            async with emulator.create_device(transport=transport) as device:
+                await device.set_brightness(1)
+                emulator.configure(drop_rate=1.0)
+                with pytest.raises(TimesGateConnectionError):
+                    await device.set_brightness(2)
+                learned = transport.rate_stats[device.base_url]["rate"]
+
+        assert learned < 20.0
+        assert json.load(open(path))[device.base_url] == learned
+
+        async with AiohttpTransport(adaptive_rate=True, rate_store_path=path) as transport:
+            assert transport.limiter(device.base_url).rate == learned
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for retries and the circuit breaker.
+"""
+
+import asyncio
+import pytest
+
+from divoom_timesgate import (
+    RetryPolicy,
+    TimesGateCircuitOpenError,
+    TimesGateCommandError,
+    TimesGateConnectionError
+)
+from divoom_timesgate.emulator import TimesGateEmulator
+
+
+def fast_retry(attempts=3):
+    return RetryPolicy(attempts=attempts, base_delay=0.001, max_delay=0.01, seed=0)
+
+
+@pytest.mark.asyncio
+async def test_retry_recovers_from_drop():
+    """A dropped idempotent command succeeds on the next attempt."""
+    async with TimesGateEmulator(seed=1) as emulator:
+        emulator.configure(drop_rate=0.5)
+        async with emulator.create_device(retry=fast_retry()) as device:
+            assert await device.set_brightness(10) is True
+            assert device.retry_stats["retries"] == 1
+    assert emulator.stats.dropped == 1
+    assert emulator.state.brightness == 10
+
+
+@pytest.mark.asyncio
+async def test_retry_gives_up_after_attempts():
+    """The last error is raised once all attempts are used."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(drop_rate=1.0)
+        async with emulator.create_device(retry=fast_retry(attempts=3)) as device:
+            with pytest.raises(TimesGateConnectionError):
+                await device.set_brightness(10)
+    assert emulator.stats.dropped == 3
+
+
+@pytest.mark.asyncio
+async def test_non_idempotent_and_command_errors_not_retried():
+    """The buzzer and device error codes are never retried."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure("Device/PlayBuzzer", drop_rate=1.0)
+        emulator.configure("Channel/SetBrightness", error_rate=1.0)
+        async with emulator.create_device(retry=fast_retry()) as device:
+            with pytest.raises(TimesGateConnectionError):
+                await device.play_buzzer()
+            with pytest.raises(TimesGateCommandError):
+                await device.set_brightness(10)
+            assert device.retry_stats["retries"] == 0
+
+
+def test_backoff_is_jittered_and_bounded():
+    """Delays stay below an exponentially growing, capped ceiling."""
+    policy = RetryPolicy(base_delay=0.1, max_delay=0.3, seed=0)
+    for attempt, ceiling in [(1, 0.1), (2, 0.2), (3, 0.3), (6, 0.3)]:
+        delays = [policy.delay(attempt) for _ in range(50)]
+        assert all(0 <= delay <= ceiling for delay in delays)
+        assert len(set(delays)) > 1
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_fails_fast_then_probes():
+    """An open circuit rejects locally until a half-open probe succeeds."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(drop_rate=1.0)
+        async with emulator.create_device(breaker_threshold=2, breaker_reset_timeout=0.1) as device:
+            for _ in range(2):
+                with pytest.raises(TimesGateConnectionError):
+                    await device.set_brightness(10)
+
+            with pytest.raises(TimesGateCircuitOpenError):
+                await device.set_brightness(10)
+            assert emulator.stats.requests == 2
+            assert device.retry_stats["circuit"] == "open"
+
+            emulator.configure(drop_rate=0.0)
+            await asyncio.sleep(0.1)
+            assert await device.set_brightness(10) is True
+            assert device.retry_stats["circuit"] == "closed"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_circuit():
+    """Cancelling the half-open probe lets the next request probe again."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(drop_rate=1.0)
+        async with emulator.create_device(breaker_threshold=1, breaker_reset_timeout=0.05) as device:
+            with pytest.raises(TimesGateConnectionError):
+                await device.set_brightness(10)
+
+            emulator.configure(drop_rate=0.0, latency=(0.3, 0.3))
+            await asyncio.sleep(0.05)
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(device.set_brightness(20), 0.05)
+            await asyncio.sleep(0)
+
+            emulator.configure(latency=(0.0, 0.0))
+            assert await device.set_brightness(30) is True
+            assert device.retry_stats["circuit"] == "closed"
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for declarative scenes.
+"""
+
+import typing
+
+import pytest
+
+from divoom_timesgate import TextDisplayItem, TimesGateDevice
+from divoom_timesgate.codec import JSONCodec
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.loopback import LoopbackTransport
+from divoom_timesgate.scene import PanelScene, Scene, SceneCompiler
+
+
+class CountingCodec(JSONCodec):
+    """JSON codec counting how many commands it serializes."""
+
+    def __init__(self):
+        self.dumped = 0
+
+    def dumps(self, obj):
+        self.dumped += 1
+        return super().dumps(obj)
+
+
+def scoreboard_scene(score=0):
+    return Scene({
+        1: PanelScene([TextDisplayItem(1, "HOME", y=8), TextDisplayItem(2, "AWAY", y=40)]),
+        2: PanelScene(scoreboard=(score, 2)),
+        3: PanelScene(timer=(5, 0)),
+        5: PanelScene(dial=12),
+    }, brightness=80)
+
+
+def test_compiler_batches_and_memoizes():
+    """A scene becomes one CommandList; equal scenes share the compilation."""
+    compiler = SceneCompiler(max_commands=3)
+    compiled = compiler.compile(scoreboard_scene())
+    assert [len(request["CommandList"]) for request in compiled.requests] == [3, 2]
+    assert compiled.requests[0]["CommandList"][0]["Command"] == "Channel/SetBrightness"
+    assert compiled.size == sum(len(JSONCodec().dumps(request)) for request in compiled.requests)
+
+    assert compiler.compile(scoreboard_scene()) is compiled
+    assert compiler.compile(scoreboard_scene(score=1)) is not compiled
+    assert compiler.stats == {"hits": 1, "misses": 2, "entries": 2}
+
+    # A lone display list is sent as is, without a CommandList wrapper
+    single = compiler.compile(Scene({4: PanelScene([{"TextId": 1, "TextString": "x"}])}))
+    assert [request["Command"] for request in single.requests] == ["Draw/SendHttpItemList"]
+
+    with pytest.raises(ValueError):
+        Scene({6: PanelScene()})
+
+
+@pytest.mark.asyncio
+async def test_apply_scene_reuses_payloads():
+    """Re-applying a scene sends the same bodies without serializing again."""
+    emulator = TimesGateEmulator()
+    codec = CountingCodec()
+    scene = scoreboard_scene(score=7)
+    async with emulator.create_device(transport=LoopbackTransport(emulator), codec=codec) as device:
+        assert await device.apply_scene(scene) == 1
+        dumped = codec.dumped
+        assert await device.apply_scene(scene) == 1
+        assert codec.dumped == dumped
+
+    assert emulator.stats.requests == 2
+    assert emulator.state.brightness == 80
+    assert emulator.state.panel(1).item_list[1]["TextString"] == "AWAY"
+    assert emulator.state.panel(2).scoreboard == {"RedScore": 7, "BlueScore": 2}
+    assert emulator.state.panel(3).timer["Minute"] == 5
+    assert emulator.state.panel(5).clock_id == 12
+
+
+def test_apply_scene_annotations_resolve():
+    """The Scene annotation of apply_scene resolves at runtime."""
+    assert typing.get_type_hints(TimesGateDevice.apply_scene)["scene"] is Scene
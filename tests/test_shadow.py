@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for write-side no-op suppression.
+"""
+
+import pytest
+
+from divoom_timesgate import TimeFormat
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.shadow import ShadowState
+
+
+@pytest.mark.asyncio
+async def test_identical_writes_suppressed():
+    """Re-applying the same values skips the round trip."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(shadow=True) as device:
+            for _ in range(3):
+                await device.set_brightness(40)
+                await device.set_time_format(TimeFormat.HOUR_24)
+                await device.set_panel_scoreboard(2, 1, 0)
+            assert device.shadow_stats["suppressed"] == 6
+
+    assert emulator.stats.commands["Channel/SetBrightness"] == 1
+    assert emulator.stats.commands["Tools/SetScoreBoard"] == 1
+
+
+@pytest.mark.asyncio
+async def test_force_and_changed_values_are_sent():
+    """force=True and new values always reach the device."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(shadow=True) as device:
+            await device.set_brightness(40)
+            await device.set_brightness(40, force=True)
+            await device.set_brightness(41)
+    assert emulator.stats.commands["Channel/SetBrightness"] == 3
+
+
+@pytest.mark.asyncio
+async def test_panel_content_overridden():
+    """A timer on a panel invalidates that panel's scoreboard shadow only."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(shadow=True) as device:
+            await device.set_panel_scoreboard(1, 5, 5)
+            await device.set_panel_scoreboard(2, 5, 5)
+            await device.set_panel_timer(1, 0, 30)
+            await device.set_panel_scoreboard(1, 5, 5)
+            await device.set_panel_scoreboard(2, 5, 5)
+
+    assert emulator.stats.commands["Tools/SetScoreBoard"] == 3
+    assert emulator.state.panel(1).scoreboard == {"RedScore": 5, "BlueScore": 5}
+
+
+@pytest.mark.asyncio
+async def test_resync_catches_drift():
+    """Changes made behind the client's back are picked up on resync."""
+    async with TimesGateEmulator() as emulator:
+        async with emulator.create_device(shadow=True, shadow_resync_interval=0) as device:
+            await device.set_brightness(40)
+            emulator.state.brightness = 90
+            await device.set_brightness(40)
+            assert device.shadow_stats["drift"] == 1
+
+    assert emulator.state.brightness == 40
+
+
+@pytest.mark.asyncio
+async def test_failed_resync_does_not_fail_the_write():
+    """A setter is still sent when the periodic resync before it fails."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure("Channel/GetAllConf", error_rate=1.0)
+        async with emulator.create_device(shadow=True, shadow_resync_interval=0) as device:
+            assert await device.set_brightness(40) is True
+
+    assert emulator.stats.errors == 1
+    assert emulator.state.brightness == 40
+
+
+def test_in_flight_write_is_not_suppressed():
+    """A newer value in flight prevents suppression of an older one."""
+    shadow = ShadowState()
+    first = {"Command": "Channel/SetBrightness", "Brightness": 50}
+    shadow.begin(first)
+    shadow.acknowledge(first)
+
+    shadow.begin({"Command": "Channel/SetBrightness", "Brightness": 60})
+    assert not shadow.is_noop({"Command": "Channel/SetBrightness", "Brightness": 50})
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Tests for sprite and tile compositing.
+"""
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from divoom_timesgate.framebuffer import Canvas
+from divoom_timesgate.sprites import Compositor, Sprite, SpriteSheet
+
+
+def solid(color, size=8, alpha=255):
+    """A square RGBA sprite of one color."""
+    pixels = np.zeros((size, size, 4), dtype=np.uint8)
+    pixels[...] = (*color, alpha)
+    return pixels
+
+
+def test_sprite_blending():
+    """Opaque sprites copy through their mask; translucent ones blend."""
+    target = np.zeros((16, 16, 3), dtype=np.uint8)
+    target[...] = (0, 0, 200)
+
+    keyed = np.zeros((4, 4, 3), dtype=np.uint8)
+    keyed[1:3, 1:3] = (255, 0, 0)
+    sprite = Sprite(keyed, color_key="#000000")
+    assert sprite.opaque
+    sprite.draw(target, -1, -1)
+    assert (target[0, 0] == (255, 0, 0)).all()
+    assert (target[2, 2] == (0, 0, 200)).all()
+
+    glass = Sprite(solid((255, 255, 255), alpha=128))
+    assert not glass.opaque
+    glass.draw(target, 8, 8, clip=(0, 0, 12, 12))
+    assert (target[10, 10] == (128, 128, 228)).all()
+    assert (target[12, 12] == (0, 0, 200)).all()
+
+
+def test_compositor_redraws_only_dirty_rects():
+    """Moving a sprite redraws its old and new bounds in z order."""
+    compositor = Compositor(background="#000010")
+    red, green = Sprite(solid((255, 0, 0))), Sprite(solid((0, 255, 0)))
+    top = compositor.layer(z=1)
+    bottom = compositor.layer(z=0)
+    player = bottom.place(red, 10, 10)
+    top.place(green, 14, 10)
+
+    assert compositor.render() == [(0, 0, 64, 64)]
+    pixels = compositor.frame.pixels
+    assert (pixels[12, 12] == (255, 0, 0)).all()
+    assert (pixels[12, 15] == (0, 255, 0)).all()
+    assert compositor.render() == []
+
+    drawn = compositor.pixels_drawn
+    bottom.move(player, 30, 10)
+    assert compositor.render() == [(10, 10, 18, 18), (30, 10, 38, 18)]
+    assert compositor.pixels_drawn - drawn == 128
+    assert (pixels[12, 12] == (0, 0, 16)).all()
+    # The green sprite on the higher layer still covers the old spot
+    assert (pixels[12, 15] == (0, 255, 0)).all()
+    assert (pixels[12, 32] == (255, 0, 0)).all()
+
+    bottom.remove(player)
+    compositor.render()
+    assert (pixels[12, 32] == (0, 0, 16)).all()
+
+
+def test_tile_layer_on_canvas():
+    """Tile maps draw from a sheet and span panels of a canvas."""
+    sheet_pixels = np.concatenate([solid((255, 0, 0)), solid((0, 0, 255))], axis=1)
+    sheet = SpriteSheet(sheet_pixels, 8, 8)
+    assert len(sheet) == 2
+
+    canvas = Canvas()
+    compositor = Compositor(canvas)
+    tiles = compositor.tile_layer(sheet, [[0, 1, -1] * 14] * 2, y=48)
+    compositor.render()
+    assert (canvas.panel(1).pixels[50, 0] == (255, 0, 0)).all()
+    assert (canvas.pixels[50, 8] == (0, 0, 255)).all()
+    assert not canvas.pixels[50, 16].any()
+
+    tiles.set_tile(2, 0, 0)
+    assert compositor.render() == [(16, 48, 24, 56)]
+    assert (canvas.pixels[50, 16] == (255, 0, 0)).all()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for live frame streaming.
+"""
+
+import time
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from divoom_timesgate import TimesGateCommandError
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.framebuffer import Frame, decode_frame
+from divoom_timesgate.loopback import LoopbackTransport
+
+
+async def bars(count):
+    """Redraw the same frame buffer with a moving bar."""
+    frame = Frame()
+    for x in range(count):
+        yield frame.clear().rect(x, 0, 1, 64, "#00FF00")
+
+
+@pytest.mark.asyncio
+async def test_stream_paces_and_sends_every_frame():
+    """A fast device receives every frame, no faster than the requested fps."""
+    emulator = TimesGateEmulator()
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        start = time.monotonic()
+        stats = await device.stream(2, bars(6), fps=50)
+        elapsed = time.monotonic() - start
+
+    assert stats == {"frames_in": 6, "frames_sent": 6, "frames_dropped": 0, "chunks_sent": 6}
+    assert elapsed >= 5 / 50
+    gif = emulator.state.panel(2).gif
+    assert gif["PicSpeed"] == 20
+    assert decode_frame(gif["Frames"][0]) == Frame().rect(5, 0, 1, 64, "#00FF00")
+
+
+@pytest.mark.asyncio
+async def test_stream_drops_stale_frames():
+    """A slow device gets the newest frames; stale ones are dropped, not queued."""
+    emulator = TimesGateEmulator()
+    emulator.configure("Draw/SendHttpGif", latency=0.05)
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        stats = await device.stream([1, 3], bars(20), fps=200, chunk_size=2)
+
+    assert stats["frames_in"] == 20
+    assert stats["frames_dropped"] > 0
+    assert stats["frames_sent"] + stats["frames_dropped"] == 20
+    assert emulator.stats.commands["Draw/SendHttpGif"] == stats["frames_sent"]
+
+    # The final chunk always makes it to the device
+    gif = emulator.state.panel(3).gif
+    assert gif["PicNum"] == 2
+    assert decode_frame(gif["Frames"][1]) == Frame().rect(19, 0, 1, 64, "#00FF00")
+    assert emulator.state.panel(2).gif is None
+
+
+@pytest.mark.asyncio
+async def test_stream_surfaces_send_errors():
+    """An upload failure stops the stream with the error."""
+    emulator = TimesGateEmulator()
+    emulator.configure("Draw/SendHttpGif", error_rate=1.0)
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        with pytest.raises(TimesGateCommandError):
+            await device.stream(1, bars(50), fps=100)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Tests for client-side bitmap text.
+"""
+
+import time
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from divoom_timesgate import FontSize, TextAlignment
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.framebuffer import Frame, decode_frame
+from divoom_timesgate.loopback import LoopbackTransport
+from divoom_timesgate.text import font, render_text, text_size
+
+
+def test_font_tiers():
+    """Each FontSize tier renders at its line height with fixed advances."""
+    heights = [text_size("Hi", size)[1] for size in FontSize]
+    assert heights == [5, 8, 11, 14, 16]
+
+    small = font(FontSize.SMALL)
+    mask = small.mask("I")
+    assert mask.shape == (8, 5)
+    assert mask[:, 2].sum() == 7 and not mask[7].any()
+    assert small.mask("II").shape[1] == 2 * 5 + 1
+    assert not small.mask("   ").any()
+    # Unknown characters fall back to "?"
+    assert (small.mask("é") == small.mask("?")).all()
+    assert (font(FontSize.TINY).mask("a") == font(FontSize.TINY).mask("A")).all()
+
+
+def test_rendering_is_cached_and_clipped():
+    """Repeated strings hit the LRU; text is clipped at the frame edges."""
+    small = font(FontSize.SMALL)
+    assert small.mask("12:34") is small.mask("12:34")
+    with pytest.raises(ValueError):
+        small.mask("12:34")[0, 0] = True
+
+    frame = Frame().text("HELLO WORLD", -3, 60, "#FF0000")
+    assert frame.pixels[60:].any() and not frame.pixels[:60].any()
+
+    start = time.perf_counter()
+    for second in range(60):
+        render_text(f"12:{second:02d}")
+    assert (time.perf_counter() - start) / 60 < 0.001
+
+
+def test_alignment():
+    """Text is placed left, centered or right and vertically centered."""
+    width, height = text_size("AB")
+    for alignment, left in [
+        (TextAlignment.LEFT, 0),
+        (TextAlignment.CENTER, (64 - width) // 2),
+        (TextAlignment.RIGHT, 64 - width),
+    ]:
+        frame = render_text("AB", "#FFFFFF", "#000000", FontSize.SMALL, alignment)
+        columns = np.nonzero(frame.pixels.any(axis=(0, 2)))[0]
+        assert columns[0] == left
+        rows = np.nonzero(frame.pixels.any(axis=(1, 2)))[0]
+        assert rows[0] == (64 - height) // 2
+
+
+@pytest.mark.asyncio
+async def test_send_text_frame():
+    """Text is uploaded as a frame and skipped when unchanged."""
+    emulator = TimesGateEmulator()
+    async with emulator.create_device(transport=LoopbackTransport(emulator)) as device:
+        assert await device.send_text_frame(2, "GO!", color="#00FF00", font=FontSize.LARGE)
+        assert not await device.send_text_frame(2, "GO!", color="#00FF00", font=FontSize.LARGE)
+
+    shown = decode_frame(emulator.state.panel(2).gif["Frames"][0])
+    assert shown == render_text("GO!", "#00FF00", size=FontSize.LARGE)
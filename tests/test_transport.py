@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Tests for the transports.
+"""
+
+import asyncio
+import pytest
+
+from divoom_timesgate import RetryPolicy, TimesGateConnectionError
+from divoom_timesgate.emulator import TimesGateEmulator
+from divoom_timesgate.loopback import LoopbackTransport
+from divoom_timesgate.rawhttp import RawHttpTransport
+from divoom_timesgate.transport import AiohttpTransport
+
+
+@pytest.mark.asyncio
+async def test_connections_are_reused():
+    """Sequential commands to one device reuse a keep-alive connection."""
+    async with TimesGateEmulator() as emulator:
+        async with AiohttpTransport() as transport:
+            async with emulator.create_device(transport=transport) as device:
+                for level in range(10):
+                    await device.set_brightness(level)
+
+            assert transport.stats["requests"] == 10
+            assert transport.stats["connections_created"] == 1
+            assert transport.stats["connections_reused"] == 9
+
+
+@pytest.mark.asyncio
+async def test_shared_transport_outlives_devices():
+    """Closing a device does not close a transport it does not own."""
+    async with TimesGateEmulator() as first, TimesGateEmulator() as second:
+        async with AiohttpTransport() as transport:
+            async with first.create_device(transport=transport) as device:
+                await device.set_brightness(1)
+            async with second.create_device(transport=transport) as device:
+                await device.set_brightness(2)
+
+            assert transport.session is not None
+            assert transport.stats["connections_created"] == 2
+    assert (first.state.brightness, second.state.brightness) == (1, 2)
+
+
+@pytest.mark.asyncio
+async def test_prewarm_opens_connection():
+    """prewarm=True connects before the first command."""
+    async with TimesGateEmulator() as emulator:
+        async with AiohttpTransport(prewarm=True) as transport:
+            async with emulator.create_device(transport=transport) as device:
+                assert transport.stats["connections_created"] == 1
+                await device.set_brightness(5)
+            assert transport.stats["connections_reused"] == 1
+
+
+@pytest.mark.asyncio
+async def test_timeout_is_connection_error():
+    """Request timeouts surface as TimesGateConnectionError."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure(drop_rate=1.0, drop_mode="hang")
+        async with AiohttpTransport(timeout=0.2) as transport:
+            async with emulator.create_device(transport=transport) as device:
+                with pytest.raises(TimesGateConnectionError):
+                    await device.set_brightness(5)
+
+
+@pytest.mark.asyncio
+async def test_raw_http_keeps_one_connection():
+    """The raw client reuses one keep-alive connection for every command."""
+    async with TimesGateEmulator() as emulator:
+        async with RawHttpTransport() as transport:
+            async with emulator.create_device(transport=transport) as device:
+                for level in range(10):
+                    await device.set_brightness(level)
+                settings = await device.get_settings()
+
+            assert settings["Brightness"] == 9
+            assert transport.stats["connections_created"] == 1
+            assert transport.stats["connections_reused"] == 10
+
+
+@pytest.mark.asyncio
+async def test_raw_http_recovers_from_reset_and_timeout():
+    """A reset or timed-out connection is replaced by a fresh one."""
+    # Not serialized, so the hung request does not block the next one
+    async with TimesGateEmulator(serialize=False) as emulator:
+        async with RawHttpTransport(timeout=0.2) as transport:
+            async with emulator.create_device(transport=transport) as device:
+                await device.set_brightness(1)
+
+                emulator.configure(drop_rate=1.0)
+                with pytest.raises(TimesGateConnectionError):
+                    await device.set_brightness(2)
+
+                emulator.configure(drop_rate=1.0, drop_mode="hang")
+                with pytest.raises(TimesGateConnectionError):
+                    await device.set_brightness(3)
+
+                emulator.configure()
+                await device.set_brightness(4)
+
+            assert transport.stats["connections_created"] == 3
+    assert emulator.stats.dropped == 2
+    assert emulator.state.brightness == 4
+
+
+async def start_http_server(statuses):
+    """
+    Serve canned replies: each accepted connection answers the statuses of
+    ``statuses`` in turn and closes unanswered once it runs out.
+    """
+    async def handle(reader, writer):
+        for status in statuses:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = int(head.lower().split(b"content-length:")[1].split(b"\r\n")[0])
+            await reader.readexactly(length)
+            body = b'{"error_code": 0}'
+            writer.write(
+                b"HTTP/1.1 %d X\r\nContent-Length: %d\r\nConnection: keep-alive\r\n\r\n%s"
+                % (status, len(body), body)
+            )
+        await reader.readuntil(b"\r\n\r\n")
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/post"
+
+
+@pytest.mark.asyncio
+async def test_raw_http_replays_only_unsent_requests():
+    """Only a request that never reached the socket is replayed on a new connection."""
+    server, url = await start_http_server([200])
+    async with server:
+        async with RawHttpTransport(timeout=1.0) as transport:
+            assert await transport.post(url, b"{}") == b'{"error_code": 0}'
+            # Closing before the device noticed: the request cannot have been sent
+            transport._endpoints[url].protocol.transport.close()
+            assert await transport.post(url, b"{}") == b'{"error_code": 0}'
+            assert transport.stats["connections_created"] == 2
+
+            # The device closes after reading the request: it may have run it
+            with pytest.raises(TimesGateConnectionError):
+                await transport.post(url, b"{}")
+            assert transport.stats["connections_created"] == 2
+
+
+@pytest.mark.asyncio
+async def test_raw_http_error_status():
+    """Non-2xx replies are connection errors, not response bodies."""
+    server, url = await start_http_server([500, 200])
+    async with server:
+        async with RawHttpTransport(timeout=1.0) as transport:
+            with pytest.raises(TimesGateConnectionError):
+                await transport.post(url, b"{}")
+            # The connection itself stays usable
+            assert await transport.post(url, b"{}") == b'{"error_code": 0}'
+            assert transport.stats["connections_created"] == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport_class", [AiohttpTransport, RawHttpTransport, LoopbackTransport])
+async def test_http_error_status_is_connection_error(transport_class):
+    """Every transport turns an HTTP 500 into a retryable connection error."""
+    async with TimesGateEmulator() as emulator:
+        emulator.configure("Channel/SetBrightness", http_error_rate=1.0)
+        transport = transport_class(emulator) if transport_class is LoopbackTransport else transport_class()
+        retry = RetryPolicy(attempts=2, base_delay=0.001, seed=0)
+        async with transport:
+            async with emulator.create_device(transport=transport, retry=retry) as device:
+                with pytest.raises(TimesGateConnectionError):
+                    await device.set_brightness(10)
+                assert device.retry_stats["retries"] == 1
+                # The device stays usable for other commands
+                assert await device.set_screen_power(True) is True
+    assert emulator.stats.http_errors == 2
+
+
+@pytest.mark.asyncio
+async def test_raw_http_connection_refused():
+    """An unreachable device is a connection error, not a hang."""
+    async with TimesGateEmulator() as emulator:
+        port = emulator.port
+    async with RawHttpTransport(timeout=1.0) as transport:
+        with pytest.raises(TimesGateConnectionError):
+            await transport.post(f"http://127.0.0.1:{port}/post", b"{}")
+
+
+@pytest.mark.asyncio
+async def test_loopback_runs_without_sockets():
+    """The loopback transport drives an emulator that was never started."""
+    emulator = TimesGateEmulator(seed=0)
+    async with LoopbackTransport(emulator, timeout=0.1) as transport:
+        async with emulator.create_device(transport=transport) as device:
+            await device.set_brightness(33)
+            assert (await device.get_settings())["Brightness"] == 33
+
+            emulator.configure(drop_rate=1.0)
+            with pytest.raises(TimesGateConnectionError):
+                await device.set_brightness(34)
+
+            emulator.configure(drop_rate=1.0, drop_mode="hang")
+            with pytest.raises(TimesGateConnectionError):
+                await device.set_brightness(35)
+
+    assert transport.stats["requests"] == 4
+    assert emulator.state.brightness == 33